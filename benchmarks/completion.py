@@ -0,0 +1,53 @@
+"""Cost of completing one outgoing message through the layer chain.
+
+Each layer (Messenger, ProtocolMessenger, Transport, StreamingTransport)
+owns a completion chained to the one below it. Compares chains built from
+`concurrent.futures.Future` with chains built from `Completion`.
+
+    python -m benchmarks.completion
+"""
+import argparse
+import timeit
+from concurrent.futures import Future
+
+from server.completion import Completion
+
+LAYERS = 4
+
+
+def complete_chain(factory):
+    completions = [factory() for _ in range(LAYERS)]
+
+    for upper, lower in zip(completions, completions[1:]):
+        def done_cb(completion, upper=upper):
+            exception = completion.exception()
+            if not exception:
+                upper.set_result(completion.result())
+            else:
+                upper.set_exception(exception)
+
+        lower.add_done_callback(done_cb)
+
+    completions[-1].set_result(None)
+    assert completions[0].done()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--messages", type=int, default=100_000)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = {}
+    for name, factory in [("Future", Future), ("Completion", Completion)]:
+        timings = timeit.repeat(lambda: complete_chain(factory),
+                                number=args.messages, repeat=args.repeat)
+        results[name] = min(timings) / args.messages * 1e6
+        print(f"{name:>10}: {results[name]:.2f} us/message")
+
+    speedup = results["Future"] / results["Completion"]
+    print(f"{'speedup':>10}: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
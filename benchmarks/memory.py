@@ -0,0 +1,117 @@
+"""Memory held by in-flight messages of one session.
+
+Sends requests through Session, Messenger, ProtocolMessenger and Transport
+down to a transport that never completes its packets, and reports bytes
+allocated per in-flight message with `tracemalloc`.
+
+    python -m benchmarks.memory
+"""
+import argparse
+import gc
+import threading
+import tracemalloc
+from typing import List
+
+from server.comm.connection import AbstractConnection, ConnectionState
+from server.comm.presentation.messenger import Messenger
+from server.comm.presentation.protocol_messenger import ProtocolMessenger
+from server.comm.presentation.protocol_pb2 import GenericMessage, TestMessage
+from server.comm.session.session import ISessionClient, Session
+from server.comm.transport.transport import (
+    AbstractOutgoingPacket,
+    ITransport,
+    ITransportBuilder,
+    ITransportClient,
+    Transport,
+)
+
+
+class HoldingTransport(ITransport, AbstractConnection):
+    """Accepts packets and never completes them"""
+
+    def __init__(self, client: ITransportClient, sent: threading.Semaphore):
+        super().__init__(client)
+        self.outgoing: List[AbstractOutgoingPacket] = []
+        self._sent = sent
+
+    def send(self, packet: bytes):
+        outgoing = AbstractOutgoingPacket(packet)
+        self.outgoing.append(outgoing)
+        self._sent.release()
+        return outgoing
+
+    def reconnect(self):
+        self.state = ConnectionState.CONNECTING
+        self.state = ConnectionState.CONNECTED
+
+    def disconnect(self):
+        self.state = ConnectionState.DISCONNECTED
+
+    class Builder(ITransportBuilder):
+        def __init__(self, sent: threading.Semaphore):
+            super().__init__()
+            self._sent = sent
+
+        def construct(self, client, runner=None):
+            return HoldingTransport(client, self._sent)
+
+
+class Client(ISessionClient):
+    def on_request(self, request):
+        raise NotImplementedError
+
+    def on_state_changed(self, state):
+        pass
+
+
+def measure(messages: int) -> float:
+    sent = threading.Semaphore(0)
+    # Every message gets into the holding transport
+    window = messages + 1
+    session = Session.Builder(
+        messenger=Messenger.Builder(
+            messenger=ProtocolMessenger.Builder(
+                transport=Transport.Builder(
+                    transport=HoldingTransport.Builder(sent),
+                    window_size=window)
+            )
+        ),
+        session_id=1,
+    ).set_fused("Benchmark").build(Client())
+    session.reconnect()
+    # setSessionId request sent on connection
+    assert sent.acquire(timeout=5.0)
+
+    requests = [GenericMessage(test=TestMessage(value="x"))
+                for _ in range(messages)]
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+
+    futures = [session.request(request) for request in requests]
+    for _ in range(messages):
+        assert sent.acquire(timeout=5.0)
+
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(stat.size_diff
+                    for stat in after.compare_to(before, "filename"))
+    assert len(futures) == messages
+    return allocated / messages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--messages", type=int, default=2_000)
+    args = parser.parse_args()
+
+    per_message = measure(args.messages)
+    print(f"in-flight messages: {args.messages}")
+    print(f"bytes per message:  {per_message:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -21,7 +21,9 @@ from server.comm.app import RequestRouter
 from server.comm.connection import IConnectionClient
 from server.comm.listener.listener import IListenerClient
 from server.comm.listener.bt import BluetoothListener
+from server.comm.presentation.batching import BatchingMessenger
 from server.comm.presentation.messenger import Messenger
+from server.comm.presentation.multiplexing import MultiplexingMessenger
 from server.comm.presentation.protocol_messenger import ProtocolMessenger
 from server.comm.transport.transport import ITransportBuilder
 from server.comm.session.session import Session
@@ -143,11 +145,15 @@ class MobileClient(IConnectionClient):
 
         self._session = Session.Builder(
             messenger=Messenger.Builder(
-                messenger=ProtocolMessenger.Builder(
-                    transport=transport)
+                messenger=MultiplexingMessenger.Builder(
+                    messenger=BatchingMessenger.Builder(
+                        messenger=ProtocolMessenger.Builder(
+                            transport=transport)
+                    )
+                )
             ),
             session_id=session_id
-        ).build(self._router)
+        ).set_fused(f"Session {session_id}").build(self._router)
 
         self._session.reconnect()
 
@@ -1,4 +1,7 @@
 from . import tasker
+from . import instrumentation
+from . import tracing
+from . import event_loop
 from . import comm
 from . import target
 from . import ui
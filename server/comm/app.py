@@ -1,16 +1,49 @@
+import asyncio
 import logging
+import threading
 from abc import ABC, abstractmethod
 from concurrent.futures import Future
-from typing import Generic, TypeVar, Optional, Dict
-
+from queue import Queue
+from typing import (
+    AsyncIterator,
+    Callable,
+    Generic,
+    Iterator,
+    TypeVar,
+    Optional,
+    Dict,
+    Union,
+)
+
+from ..event_loop import EventLoopThread
+from ..tasker import Runner, WorkerPool
 from .connection import IConnectionClient
 from .presentation.protocol_pb2 import GenericMessage
-from .session.session import ISession, ISessionClient
+from .session.session import IResponseStream, ISession, ISessionClient
 
 
 Request = TypeVar("Request")
 Response = TypeVar("Response")
 
+# Partial responses a streamed request accepts ahead of consuming them
+STREAM_CREDITS = 8
+
+# Threads advancing blocking iterators of streamed responses, kept apart
+# from the shared pool so a slow iterator does not hold up runners
+STREAM_POOL_SIZE = 2
+
+_stream_pool: Optional[WorkerPool] = None
+_stream_pool_lock = threading.Lock()
+
+
+def _stream_worker_pool() -> WorkerPool:
+    global _stream_pool
+    with _stream_pool_lock:
+        if _stream_pool is None:
+            _stream_pool = WorkerPool(STREAM_POOL_SIZE,
+                                      name="Response stream")
+        return _stream_pool
+
 
 class IRequester(ABC, Generic[Response]):
 
@@ -36,7 +69,8 @@ class IRequester(ABC, Generic[Response]):
 
         return self.handle_response(response)
 
-    def request(self, session: ISession) -> Future[Response]:
+    def request(self, session: ISession,
+                timeout: Optional[float] = None) -> Future[Response]:
         future: Future[Response] = Future()
         message = self.prepare()
 
@@ -51,12 +85,95 @@ class IRequester(ABC, Generic[Response]):
                 future.set_result(self.handle_response(res.result()))
 
         assert message.WhichOneof("payload")
-        req: Future[GenericMessage] = session.request(message)
+        req: Future[GenericMessage] = session.request(message, timeout)
         req.add_done_callback(on_response_wrapper)
 
         return future
 
 
+class StreamedResponse(Generic[Response]):
+    """Partial responses of a streamed request, iterating blocks until the
+    next one arrives. Credits are returned to the responder as partial
+    responses are consumed."""
+
+    _END = object()
+
+    def __init__(self, session: ISession, requester: "IStreamingRequester",
+                 credits: int):
+        self._session = session
+        self._requester = requester
+        self._credits = credits
+        self._consumed = 0
+        self._queue: Queue = Queue()
+        self.request_id: Optional[int] = None
+        # Completes with the last response
+        self.future: Optional[Future[GenericMessage]] = None
+
+    def on_partial(self, partial: GenericMessage):
+        self._queue.put(partial)
+
+    def on_done(self, future: Future[GenericMessage]):
+        if future.cancelled():
+            self._queue.put(StreamedResponse._END)
+            return
+
+        exception = future.exception()
+        if exception is not None:
+            self._queue.put(exception)
+        else:
+            response = future.result()
+            payload = response.WhichOneof("payload")
+            if payload == "error":
+                self._queue.put(RuntimeError(response.error.description))
+            elif payload is not None:
+                # Only response of a responder that does not stream
+                self._queue.put(response)
+
+        self._queue.put(StreamedResponse._END)
+
+    def cancel(self):
+        assert self.request_id is not None
+        self._session.control_stream(self.request_id, cancel=True)
+
+    def __iter__(self) -> Iterator[Response]:
+        while True:
+            item = self._queue.get()
+            if item is StreamedResponse._END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+
+            yield self._requester.on_response(item)
+
+            if item.more:
+                self._consumed += 1
+                if self._consumed >= max(1, self._credits // 2):
+                    self._session.control_stream(self.request_id,
+                                                 credits=self._consumed)
+                    self._consumed = 0
+
+
+class IStreamingRequester(IRequester[Response], ABC):
+
+    def request_stream(self, session: ISession,
+                       credits: int = STREAM_CREDITS,
+                       timeout: Optional[float] = None
+                       ) -> StreamedResponse[Response]:
+        """`timeout` bounds the wait for each partial response"""
+        message = self.prepare()
+        assert message.WhichOneof("payload")
+
+        streamed: StreamedResponse[Response] = \
+            StreamedResponse(session, self, credits)
+        future = session.request_stream(message, streamed.on_partial,
+                                        credits, timeout)
+        streamed.request_id = message.request
+        future.add_done_callback(streamed.on_done)
+        streamed.future = future
+
+        return streamed
+
+
 class IResponder(ABC, Generic[Request, Response]):
 
     @property
@@ -96,6 +213,89 @@ class IResponder(ABC, Generic[Request, Response]):
         return future
 
 
+class ResponseStream(IResponseStream):
+    """Partial responses pulled from an iterator on a worker thread, or
+    from an async iterator on the event loop"""
+
+    def __init__(self, responses: Union[Iterator, AsyncIterator],
+                 prepare: Callable[..., GenericMessage]):
+        self._responses = responses
+        self._prepare = prepare
+        self._runner: Optional[Runner] = None
+        self._lock = threading.Lock()
+        self._pulling = False
+        self._closed = False
+
+    @property
+    def is_async(self) -> bool:
+        return hasattr(self._responses, "__anext__")
+
+    def pull(self) -> Future[GenericMessage]:
+        with self._lock:
+            assert not self._pulling and not self._closed
+            self._pulling = True
+
+        if self.is_async:
+            pulled = asyncio.run_coroutine_threadsafe(
+                self._anext(), EventLoopThread.default().loop)
+        else:
+            if self._runner is None:
+                self._runner = Runner(name="Response stream",
+                                      pool=_stream_worker_pool())
+            pulled = self._runner.run_on_executor(self._next,
+                                                  force_schedule=True)
+
+        pulled.add_done_callback(self._on_pulled)
+        return pulled
+
+    def _next(self) -> GenericMessage:
+        return self._prepare(next(self._responses))
+
+    async def _anext(self) -> GenericMessage:
+        return self._prepare(await self._responses.__anext__())
+
+    def _on_pulled(self, _: Future):
+        with self._lock:
+            self._pulling = False
+            close = self._closed
+
+        if close:
+            self._close()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            # Generators cannot be closed while running
+            close = not self._pulling
+
+        if close:
+            self._close()
+
+    def _close(self):
+        if self.is_async:
+            if hasattr(self._responses, "aclose"):
+                asyncio.run_coroutine_threadsafe(
+                    self._responses.aclose(), EventLoopThread.default().loop)
+        elif hasattr(self._responses, "close"):
+            self._responses.close()
+
+
+class IStreamingResponder(IResponder[Request, Response], ABC):
+    """Answers with partial responses, `on_request()` returns an iterator or
+    an async iterator of them"""
+
+    @abstractmethod
+    def on_request(
+        self, request: Request
+    ) -> Union[Iterator[Response], AsyncIterator[Response]]:
+        raise NotImplementedError
+
+    def handle(self, request: GenericMessage) -> IResponseStream:
+        assert request.WhichOneof("payload") == self.request_payload
+        req: Request = self.unpack_request(request)
+        return ResponseStream(self.on_request(req), self.prepare_response)
+
+
 class RequestRouter(ISessionClient):
 
     def __init__(self, *responders: IResponder,
@@ -106,7 +306,9 @@ class RequestRouter(ISessionClient):
         for responder in responders:
             self._responders[responder.request_payload] = responder
 
-    def on_request(self, request: GenericMessage) -> Future[GenericMessage]:
+    def on_request(
+        self, request: GenericMessage
+    ) -> Union[Future[GenericMessage], IResponseStream]:
         payload = request.WhichOneof("payload")
         if payload not in self._responders:
             logging.error(f"on_request(): Missing Responder for {payload}")
@@ -41,6 +41,12 @@ class IConnectionBuilder(ABC):
     def set_runner(self, runner):
         self.runner = runner
 
+    def set_fused(self, name=None):
+        """Builds this layer and every layer below it on one fused runner,
+        see `Runner`"""
+        self.runner = Runner(name=name, fused=True)
+        return self
+
 
 class IConnectionClient(ABC):
     @abstractmethod
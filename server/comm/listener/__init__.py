@@ -1,6 +1,7 @@
 from . import listener
 from . import net
 from . import net_blackhole
+from . import net_asyncio
 
 import os
 
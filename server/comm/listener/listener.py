@@ -3,7 +3,7 @@ import socket
 from abc import ABC, abstractmethod
 from typing import Optional
 
-from ...tasker import Tasker
+from ...tasker import Tasker, Runner
 from ..transport.transport import (
     Transport,
     SocketTransport,
@@ -35,7 +35,8 @@ class ProxyListenerClient(IListenerClient, Tasker):
 
 class SocketListener(IListener, Tasker, ABC):
     def __init__(self, client, wrap_transport=True):
-        super().__init__()
+        # `listen()` blocks in `accept()` for the lifetime of the listener
+        super().__init__(runner=Runner(name="Listener", dedicated=True))
         self._client: IListenerClient = client
         self._server: Optional[socket.socket] = None
         self._listening = True
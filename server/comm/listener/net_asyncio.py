@@ -0,0 +1,64 @@
+import asyncio
+import logging
+from concurrent.futures import Future
+from typing import Optional
+
+from ...event_loop import EventLoopThread
+from ..transport.asyncio_transport import AsyncioTransport, FrameProtocol
+from ..transport.transport import ITransportBuilder, Transport
+from .listener import IListener, IListenerClient
+
+
+class AsyncioNetworkListener(IListener):
+    """Counterpart of `NetworkListener` serving every connection from a
+    single asyncio event loop thread"""
+
+    def __init__(self, client, host="127.0.0.1", port=2137,
+                 wrap_transport=True,
+                 loop: Optional[EventLoopThread] = None):
+        self._client: IListenerClient = client
+        self._host = host
+        self._port = port
+        self._wrap_transport = wrap_transport
+        self._loop: EventLoopThread = loop or EventLoopThread.default()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def port(self) -> Optional[int]:
+        if self._server is None or not self._server.sockets:
+            return None
+        return self._server.sockets[0].getsockname()[1]
+
+    def _construct(self, protocol: FrameProtocol) -> ITransportBuilder:
+        asyncio_builder = AsyncioTransport.Builder(protocol=protocol)
+
+        if self._wrap_transport:
+            return Transport.Builder(transport=asyncio_builder)
+        else:
+            return asyncio_builder
+
+    def _on_connect(self, protocol: FrameProtocol):
+        assert protocol.transport is not None
+        addr = protocol.transport.get_extra_info("peername")
+        logging.info(f"_on_connect(): Pending connection with {addr}")
+        try:
+            self._client.on_connect(self._construct(protocol))
+        except Exception as exception:
+            logging.error("_on_connect(): ", exc_info=exception)
+            protocol.transport.close()
+
+    async def _serve(self):
+        logging.info("listen():")
+        loop = self._loop.loop
+        self._server = await loop.create_server(
+            lambda: FrameProtocol(self._loop, self._on_connect),
+            self._host, self._port)
+        logging.info(f"listen(): listening on {self.port}")
+
+    def listen(self) -> Future:
+        return asyncio.run_coroutine_threadsafe(self._serve(),
+                                                self._loop.loop)
+
+    def close(self):
+        if self._server is not None:
+            self._loop.call_soon(self._server.close)
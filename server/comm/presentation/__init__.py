@@ -1,3 +1,6 @@
+from . import batching
 from . import messenger
+from . import multiplexing
 from . import protocol_messenger
 from . import protocol_pb2
+from . import wire
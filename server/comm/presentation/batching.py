@@ -0,0 +1,203 @@
+import logging
+from typing import List, Optional
+
+from ...completion import Completion
+from ...tasker import Priority, Runner, Tasker
+from ..connection import ConnectionState
+from .messenger import (
+    AbstractOutgoingMessage,
+    IMessageClient,
+    IMessenger,
+    IMessengerBuilder,
+    IOutgoingMessage,
+    message_priority,
+)
+from .protocol_pb2 import Batch, Capabilities, GenericMessage
+from .wire import MessageHeader
+
+# Flush once pending messages reach either limit
+MAX_BATCH_BYTES = 4 * 1024
+MAX_BATCH_MESSAGES = 64
+# Longest time a message may wait for others to join its batch
+MAX_BATCH_DELAY = 0.005
+
+
+class BatchingMessenger(IMessenger, Tasker):
+    """Packs small outgoing messages into a single `Batch` message.
+
+    Both sides advertise `Capabilities` when connected, batches are only
+    sent once the peer has advertised `Capabilities.batch`. Until then, and
+    for messages above half of `max_bytes`, messages pass straight through.
+    Received batches are unpacked into one `on_message_received()` call per
+    inner message.
+    """
+
+    def __init__(self, messenger_builder: IMessengerBuilder,
+                 client: IMessageClient,
+                 runner: Optional[Runner] = None,
+                 max_bytes: int = MAX_BATCH_BYTES,
+                 max_messages: int = MAX_BATCH_MESSAGES,
+                 max_delay: float = MAX_BATCH_DELAY):
+        Tasker.__init__(self, runner=runner)
+        self.max_bytes = max_bytes
+        self.max_messages = max_messages
+        self.max_delay = max_delay
+        self.peer_batching = False
+        self._pending: List[BatchingMessenger.OutgoingMessage] = []
+        self._pending_bytes = 0
+
+        wrapped_client = BatchingMessenger.Client(self, client)
+        self._impl: IMessenger = messenger_builder.build(wrapped_client,
+                                                         runner)
+
+    @property
+    def state(self) -> ConnectionState:
+        return self._impl.state
+
+    def send(self, message: GenericMessage) -> IOutgoingMessage:
+        outgoing = BatchingMessenger.OutgoingMessage(message)
+        self._send(outgoing)
+        return outgoing
+
+    @Tasker.handler(
+        priority=lambda self, outgoing: message_priority(outgoing.message))
+    def _send(self, outgoing: "BatchingMessenger.OutgoingMessage"):
+        size = outgoing.message.ByteSize()
+        if not self.peer_batching or size > self.max_bytes // 2:
+            self._flush()
+            outgoing.set_outgoing_message(self._impl.send(outgoing.message))
+            return
+
+        self._pending.append(outgoing)
+        self._pending_bytes += size
+
+        if (
+            self._pending_bytes >= self.max_bytes
+            or len(self._pending) >= self.max_messages
+            or message_priority(outgoing.message) == Priority.HIGH
+        ):
+            self._flush()
+        else:
+            self.flush(timeout=self.max_delay)
+
+    @Tasker.handler(coalesce=0.0)
+    def flush(self):
+        self._flush()
+
+    @Tasker.assert_executor()
+    def _flush(self):
+        pending, self._pending = self._pending, []
+        self._pending_bytes = 0
+        if not pending:
+            return
+
+        if len(pending) == 1:
+            message = pending[0].message
+        else:
+            logging.debug(f"_flush(): Batching {len(pending)} messages")
+            message = GenericMessage(
+                sessionId=pending[0].message.sessionId,
+                batch=Batch(messages=[outgoing.message
+                                      for outgoing in pending]))
+
+        impl = self._impl.send(message)
+        for outgoing in pending:
+            outgoing.set_outgoing_message(impl)
+
+    @Tasker.handler()
+    def _on_connected(self):
+        self._impl.send(GenericMessage(capabilities=Capabilities(batch=True)))
+
+    @Tasker.handler()
+    def _on_disconnected(self):
+        # Whoever connects next has to advertise batching again
+        self.peer_batching = False
+        self._flush()
+
+    @Tasker.handler()
+    def _on_capabilities(self, capabilities: Capabilities):
+        logging.debug(f"_on_capabilities(): batch={capabilities.batch}")
+        self.peer_batching = capabilities.batch
+
+    def reconnect(self):
+        self._impl.reconnect()
+
+    def disconnect(self):
+        self._impl.disconnect()
+
+    class OutgoingMessage(AbstractOutgoingMessage):
+        __slots__ = ("_impl",)
+
+        def __init__(self, message: GenericMessage):
+            super().__init__(message, Completion())
+            self._impl: Optional[IOutgoingMessage] = None
+
+        def set_outgoing_message(self, impl: IOutgoingMessage):
+            self._impl = impl
+            impl.future.add_done_callback(self.on_impl_future_done)
+
+        def on_impl_future_done(self, future):
+            exception = future.exception()
+            if not exception:
+                self.future.set_result(future.result())
+            else:
+                self.future.set_exception(exception)
+
+    class Client(IMessageClient):
+        def __init__(self, messenger, client):
+            self._messenger: BatchingMessenger = messenger
+            self.client: IMessageClient = client
+
+        def on_message_received(self, message: GenericMessage):
+            payload = message.WhichOneof("payload")
+            if payload == "batch":
+                for inner in message.batch.messages:
+                    self.client.on_message_received(inner)
+            elif payload == "capabilities":
+                self._messenger._on_capabilities(message.capabilities)
+            else:
+                self.client.on_message_received(message)
+
+        def accepts_message(self, header: MessageHeader) -> bool:
+            if header.payload == "capabilities":
+                return True
+            return self.client.accepts_message(header)
+
+        def on_state_changed(self, state: ConnectionState):
+            if state == ConnectionState.CONNECTED:
+                self._messenger._on_connected()
+            elif state == ConnectionState.DISCONNECTED:
+                self._messenger._on_disconnected()
+
+            self.client.on_state_changed(state)
+
+        def on_error(self):
+            self.client.on_error()
+
+    class Builder(IMessengerBuilder):
+        def __init__(self, messenger=None, runner=None,
+                     max_bytes: int = MAX_BATCH_BYTES,
+                     max_messages: int = MAX_BATCH_MESSAGES,
+                     max_delay: float = MAX_BATCH_DELAY):
+            super().__init__(runner=runner)
+            self._messenger: IMessengerBuilder = messenger
+            self._max_bytes = max_bytes
+            self._max_messages = max_messages
+            self._max_delay = max_delay
+
+        def set_messenger(self, messenger: IMessengerBuilder):
+            self._messenger = messenger
+            return self
+
+        def set_limits(self, max_bytes: int, max_messages: int,
+                       max_delay: float):
+            self._max_bytes = max_bytes
+            self._max_messages = max_messages
+            self._max_delay = max_delay
+            return self
+
+        def construct(self, client: IMessageClient,
+                      runner: Optional[Runner] = None):
+            return BatchingMessenger(self._messenger, client, runner,
+                                     self._max_bytes, self._max_messages,
+                                     self._max_delay)
@@ -1,10 +1,11 @@
-import functools
 import logging
 from abc import ABC, abstractmethod
 from concurrent.futures import Future
 from typing import Optional
 
-from ...tasker import Tasker, Runner
+from ... import tracing
+from ...completion import Completion
+from ...tasker import Priority, Tasker, Runner
 from ..connection import (
     IConnection,
     IConnectionClient,
@@ -12,9 +13,28 @@ from ..connection import (
     IConnectionBuilder,
 )
 from .protocol_pb2 import GenericMessage
+from .wire import MessageHeader
+
+# Session keep-alive and setup traffic, including `ok` responses to it
+CONTROL_PAYLOADS = frozenset(["heartbeat", "setSessionId", "ok",
+                              "capabilities", "streamControl"])
+
+
+def message_priority(message: GenericMessage) -> Priority:
+    payload = message.WhichOneof("payload")
+    if payload in CONTROL_PAYLOADS:
+        return Priority.HIGH
+    elif payload == "batch":
+        return min((message_priority(inner)
+                    for inner in message.batch.messages),
+                   default=Priority.NORMAL)
+    return Priority.NORMAL
 
 
 class IOutgoingMessage(ABC):
+    # Created for every message, keep implementations slotted
+    __slots__ = ()
+
     @property
     @abstractmethod
     def message(self) -> GenericMessage:
@@ -27,6 +47,8 @@ class IOutgoingMessage(ABC):
 
 
 class AbstractOutgoingMessage(IOutgoingMessage, ABC):
+    __slots__ = ("_message", "_future")
+
     def __init__(self, message, future):
         self._message = message
         self._future = future
@@ -51,6 +73,12 @@ class IMessageClient(IConnectionClient, ABC):
     def on_message_received(self, message: GenericMessage):
         raise NotImplementedError
 
+    def accepts_message(self, header: MessageHeader) -> bool:
+        """Called with the header peeked from the wire before the message is
+        parsed, on the thread of the layer below. Rejected messages are
+        dropped without parsing."""
+        return True
+
 
 class IMessengerBuilder(IConnectionBuilder, ABC):
     @abstractmethod
@@ -67,10 +95,13 @@ class ProxyMessageClient(IMessageClient, Tasker):
             parent=parent, runner=runner)
         self._impl: IMessageClient = impl
 
-    @Tasker.handler()
+    @Tasker.handler(priority=lambda self, message: message_priority(message))
     def on_message_received(self, message: GenericMessage):
         self._impl.on_message_received(message)
 
+    def accepts_message(self, header: MessageHeader) -> bool:
+        return self._impl.accepts_message(header)
+
     @Tasker.handler()
     def on_state_changed(self, state: ConnectionState):
         self._impl.on_state_changed(state)
@@ -92,10 +123,13 @@ class Messenger(IMessenger, Tasker):
     def state(self):
         return self._impl.state
 
-    @Tasker.handler()
+    @Tasker.handler(
+        priority=lambda self, outgoing: message_priority(outgoing.message))
     def _send(self, outgoing: "Messenger.OutgoingMessage"):
-        impl = self._impl.send(outgoing.message)
-        outgoing.set_outgoing_message(impl)
+        with tracing.span("Messenger._send", "presentation",
+                          message=outgoing.message):
+            impl = self._impl.send(outgoing.message)
+            outgoing.set_outgoing_message(impl)
 
     def send(self, message: GenericMessage) -> IOutgoingMessage:
         outgoing = Messenger.OutgoingMessage(self, message)
@@ -111,32 +145,28 @@ class Messenger(IMessenger, Tasker):
         self._impl.disconnect()
 
     class OutgoingMessage(AbstractOutgoingMessage):
+        __slots__ = ("messenger", "impl")
+
         def __init__(self, messenger, message):
-            super().__init__(message, Future())
+            super().__init__(message, Completion())
             self.messenger: Messenger = messenger
             self.messenger.assert_executor()
             self.impl: Optional[IOutgoingMessage] = None
-            self.last_marker: Optional[object] = None
 
         def set_outgoing_message(self, outgoing: IOutgoingMessage):
             self.messenger.assert_executor()
             logging.debug("set_outgoing_message()")
 
-            self.last_marker = object()
             self.impl = outgoing
-            done_cb = functools.partial(
-                self.on_impl_future_done, self.last_marker)
-            self.impl.future.add_done_callback(done_cb)
+            self.impl.future.add_done_callback(self.on_impl_future_done)
 
-        def on_impl_future_done(self, marker: object, future: Future):
+        def on_impl_future_done(self, future: Future):
             self.messenger.assert_executor()
-            if self.last_marker is not marker:
+            if self.impl is None or self.impl.future is not future:
                 # Skip this done notification to avoid zombie execution
-                logging.debug("on_impl_future_done(): Stale marker")
+                logging.debug("on_impl_future_done(): Stale future")
                 return
 
-            assert self.impl is not None
-
             exception = self.impl.future.exception()
             if not exception:
                 self.future.set_result(self.impl.future.result())
@@ -149,10 +179,14 @@ class Messenger(IMessenger, Tasker):
             self.client: IMessageClient = client
             self.last_state: Optional[ConnectionState] = None
 
-        @Tasker.handler()
+        @Tasker.handler(
+            priority=lambda self, message: message_priority(message))
         def on_message_received(self, message: GenericMessage):
             self.client.on_message_received(message)
 
+        def accepts_message(self, header: MessageHeader) -> bool:
+            return self.client.accepts_message(header)
+
         @Tasker.handler()
         def on_state_changed(self, state: ConnectionState):
             if self.last_state == state:
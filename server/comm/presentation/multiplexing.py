@@ -0,0 +1,212 @@
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+from ...completion import Completion
+from ...tasker import Runner, Tasker
+from ..connection import ConnectionState
+from .messenger import (
+    CONTROL_PAYLOADS,
+    AbstractOutgoingMessage,
+    IMessageClient,
+    IMessenger,
+    IMessengerBuilder,
+    IOutgoingMessage,
+    message_priority,
+)
+from .protocol_pb2 import GenericMessage
+
+# Logical streams, 0 means not assigned
+STREAM_CONTROL = 1
+STREAM_INTERACTIVE = 2
+STREAM_DEFAULT = 3
+STREAM_BULK = 4
+
+INTERACTIVE_PAYLOADS = frozenset(["debuggerStart", "debuggerStarted",
+                                  "debuggerStop", "debuggerLine"])
+BULK_PAYLOADS = frozenset(["fileUpload", "putFirmwareRequest"])
+
+# Messages sent from a stream in one round, in round-robin order
+STREAM_WEIGHTS: Dict[int, int] = {
+    STREAM_CONTROL: 8,
+    STREAM_INTERACTIVE: 4,
+    STREAM_DEFAULT: 2,
+    STREAM_BULK: 1,
+}
+
+# Bytes handed to the layer below and not yet sent, the rest waits in the
+# stream queues where it can be overtaken
+MAX_IN_FLIGHT_BYTES = 16 * 1024
+
+
+def _check_weights(weights: Dict[int, int]):
+    for stream, weight in weights.items():
+        if weight < 1:
+            raise ValueError(f"Weight of stream {stream} must be at least 1, "
+                             f"got {weight}")
+
+
+def message_stream(message: GenericMessage) -> int:
+    if message.stream:
+        return message.stream
+
+    payload = message.WhichOneof("payload")
+    if payload in CONTROL_PAYLOADS:
+        return STREAM_CONTROL
+    elif payload in INTERACTIVE_PAYLOADS:
+        return STREAM_INTERACTIVE
+    elif payload in BULK_PAYLOADS:
+        return STREAM_BULK
+    return STREAM_DEFAULT
+
+
+class MultiplexingMessenger(IMessenger, Tasker):
+    """Shares the connection fairly between logical streams.
+
+    Outgoing messages are tagged with their stream and queued per stream.
+    Only `max_in_flight_bytes` are handed to the layer below at a time, the
+    next message is picked by weighted round-robin, so a large upload does
+    not hold back debugger traffic. Order is kept within a stream.
+    """
+
+    def __init__(self, messenger_builder: IMessengerBuilder,
+                 client: IMessageClient,
+                 runner: Optional[Runner] = None,
+                 weights: Optional[Dict[int, int]] = None,
+                 max_in_flight_bytes: int = MAX_IN_FLIGHT_BYTES):
+        Tasker.__init__(self, runner=runner)
+        self.weights: Dict[int, int] = dict(weights or STREAM_WEIGHTS)
+        # A stream without credits after a round reset would never be picked
+        _check_weights(self.weights)
+        self.max_in_flight_bytes = max_in_flight_bytes
+        self._queues: Dict[
+            int, Deque[MultiplexingMessenger.OutgoingMessage]] = {}
+        # Round-robin order and credits left in the current round
+        self._streams: List[int] = []
+        self._credits: Dict[int, int] = {}
+        self._cursor = 0
+        self._in_flight_bytes = 0
+
+        self._impl: IMessenger = messenger_builder.build(client, runner)
+
+    @property
+    def state(self) -> ConnectionState:
+        return self._impl.state
+
+    def send(self, message: GenericMessage) -> IOutgoingMessage:
+        outgoing = MultiplexingMessenger.OutgoingMessage(self, message)
+        self._send(outgoing)
+        return outgoing
+
+    @Tasker.handler(
+        priority=lambda self, outgoing: message_priority(outgoing.message))
+    def _send(self, outgoing: "MultiplexingMessenger.OutgoingMessage"):
+        stream = message_stream(outgoing.message)
+        outgoing.message.stream = stream
+
+        queue = self._queues.get(stream)
+        if queue is None:
+            queue = self._queues[stream] = deque()
+            self._streams.append(stream)
+            self._credits[stream] = self.weights.get(stream, 1)
+        queue.append(outgoing)
+
+        self._pump()
+
+    @Tasker.assert_executor()
+    def _pump(self):
+        while self._in_flight_bytes < self.max_in_flight_bytes:
+            stream = self._next_stream()
+            if stream is None:
+                return
+
+            outgoing = self._queues[stream].popleft()
+            self._credits[stream] -= 1
+            if self._credits[stream] <= 0:
+                # Next stream goes first in the next round
+                self._cursor += 1
+
+            outgoing.size = outgoing.message.ByteSize()
+            self._in_flight_bytes += outgoing.size
+            outgoing.set_outgoing_message(self._impl.send(outgoing.message))
+
+    @Tasker.assert_executor()
+    def _next_stream(self) -> Optional[int]:
+        active = [stream for stream in self._streams if self._queues[stream]]
+        if not active:
+            return None
+
+        if all(self._credits[stream] <= 0 for stream in active):
+            # Round finished
+            for stream in self._streams:
+                self._credits[stream] = self.weights.get(stream, 1)
+
+        # Stay on the current stream while it has credits left
+        for offset in range(len(self._streams)):
+            index = (self._cursor + offset) % len(self._streams)
+            stream = self._streams[index]
+            if self._queues[stream] and self._credits[stream] > 0:
+                self._cursor = index
+                return stream
+
+        assert False, "Round reset left no stream with credits"
+
+    # Scheduled, a send completing right away must not recurse into _pump()
+    @Tasker.handler(force_schedule=True)
+    def _on_sent(self, outgoing: "MultiplexingMessenger.OutgoingMessage"):
+        self._in_flight_bytes -= outgoing.size
+        self._pump()
+
+    def reconnect(self):
+        self._impl.reconnect()
+
+    def disconnect(self):
+        self._impl.disconnect()
+
+    class OutgoingMessage(AbstractOutgoingMessage):
+        __slots__ = ("_messenger", "_impl", "size")
+
+        def __init__(self, messenger, message: GenericMessage):
+            super().__init__(message, Completion())
+            self._messenger: MultiplexingMessenger = messenger
+            self._impl: Optional[IOutgoingMessage] = None
+            self.size = 0
+
+        def set_outgoing_message(self, impl: IOutgoingMessage):
+            self._impl = impl
+            impl.future.add_done_callback(self.on_impl_future_done)
+
+        def on_impl_future_done(self, future):
+            self._messenger._on_sent(self)
+
+            exception = future.exception()
+            if not exception:
+                self.future.set_result(future.result())
+            else:
+                self.future.set_exception(exception)
+
+    class Builder(IMessengerBuilder):
+        def __init__(self, messenger=None, runner=None,
+                     weights: Optional[Dict[int, int]] = None,
+                     max_in_flight_bytes: int = MAX_IN_FLIGHT_BYTES):
+            super().__init__(runner=runner)
+            if weights is not None:
+                _check_weights(weights)
+            self._messenger: IMessengerBuilder = messenger
+            self._weights = weights
+            self._max_in_flight_bytes = max_in_flight_bytes
+
+        def set_messenger(self, messenger: IMessengerBuilder):
+            self._messenger = messenger
+            return self
+
+        def set_weight(self, stream: int, weight: int):
+            _check_weights({stream: weight})
+            self._weights = dict(self._weights or STREAM_WEIGHTS)
+            self._weights[stream] = weight
+            return self
+
+        def construct(self, client: IMessageClient,
+                      runner: Optional[Runner] = None):
+            return MultiplexingMessenger(self._messenger, client, runner,
+                                         self._weights,
+                                         self._max_in_flight_bytes)
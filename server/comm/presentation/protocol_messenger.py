@@ -1,6 +1,7 @@
 import logging
-from concurrent.futures import Future
 
+from ... import tracing
+from ...completion import Completion
 from ...tasker import Runner
 from ..connection import ConnectionState
 from .messenger import (
@@ -11,6 +12,7 @@ from .messenger import (
     IMessengerBuilder,
 )
 from .protocol_pb2 import GenericMessage
+from .wire import HeaderError, peek_header
 from ..transport.transport import (
     ITransport,
     ITransportClient,
@@ -34,7 +36,16 @@ class ProtocolMessenger(IMessenger):
 
     def send(self, message: GenericMessage) -> IOutgoingMessage:
         logging.debug(f"send(): {message.WhichOneof('payload')}")
-        packet = self._transport.send(message.SerializeToString())
+        with tracing.span("ProtocolMessenger.send", "presentation",
+                          message=message) as span:
+            data = message.SerializeToString()
+            span.annotate(size=len(data))
+            # Lower layers store the flow with their outgoing packets, it
+            # links spans of this packet across runner threads
+            flow_id = tracing.new_flow()
+            tracing.flow("packet", "transport", flow_id, "s")
+            with tracing.in_flow(flow_id):
+                packet = self._transport.send(data)
         return ProtocolMessenger.OutgoingMessage(message, packet)
 
     def reconnect(self):
@@ -44,8 +55,10 @@ class ProtocolMessenger(IMessenger):
         self._transport.disconnect()
 
     class OutgoingMessage(AbstractOutgoingMessage):
+        __slots__ = ("_packet",)
+
         def __init__(self, message, packet: IOutgoingPacket):
-            super().__init__(message, Future())
+            super().__init__(message, Completion())
             self._packet = packet
             self._packet.future.add_done_callback(self.on_packet_future_done)
 
@@ -64,8 +77,26 @@ class ProtocolMessenger(IMessenger):
 
         def on_packet_received(self, packet: bytes):
             logging.debug(f"on_packet_received(): len = {len(packet)}")
+            try:
+                header = peek_header(packet)
+            except HeaderError as error:
+                logging.error("on_packet_received(): Malformed message",
+                              exc_info=error)
+                return
+
+            if not self.client.accepts_message(header):
+                logging.warning("on_packet_received(): Dropping "
+                                f"{header.payload} before parsing")
+                return
+
             message = GenericMessage()
-            message.ParseFromString(packet)
+            with tracing.span("ProtocolMessenger.on_packet_received",
+                              "presentation", size=len(packet)) as span:
+                tracing.flow("packet", "transport", tracing.current_flow(),
+                             "f")
+                message.ParseFromString(packet)
+                if tracing.enabled:
+                    span.annotate(**tracing.message_args(message))
             logging.debug("on_packet_received(): payload "
                           f"{message.WhichOneof('payload')}")
             self.client.on_message_received(message)
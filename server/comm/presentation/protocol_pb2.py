@@ -2,10 +2,9 @@
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
 # source: proto/protocol.proto
 """Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import descriptor_pool as _descriptor_pool
-from google.protobuf import message as _message
-from google.protobuf import reflection as _reflection
 from google.protobuf import symbol_database as _symbol_database
 # @@protoc_insertion_point(imports)
 
@@ -15,224 +14,10 @@ _sym_db = _symbol_database.Default()
 from google.protobuf import empty_pb2 as google_dot_protobuf_dot_empty__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x14proto/protocol.proto\x12\x0fprogramus.proto\x1a\x1bgoogle/protobuf/empty.proto\"\x1c\n\x0bTestMessage\x12\r\n\x05value\x18\x01 \x01(\t\"#\n\x0c\x45rrorMessage\x12\x13\n\x0b\x64\x65scription\x18\x01 \x01(\t\"!\n\x0cSetSessionId\x12\x11\n\tsessionId\x18\x01 \x01(\x04\"(\n\x05\x42oard\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x11\n\tfavourite\x18\x02 \x01(\x08\"\x12\n\x10GetBoardsRequest\"c\n\x11GetBoardsResponse\x12#\n\x03\x61ll\x18\x01 \x03(\x0b\x32\x16.programus.proto.Board\x12)\n\tfavorites\x18\x02 \x03(\x0b\x32\x16.programus.proto.Board\"b\n\x10PutBoardsRequest\x12#\n\x03\x61ll\x18\x01 \x03(\x0b\x32\x16.programus.proto.Board\x12)\n\tfavorites\x18\x02 \x03(\x0b\x32\x16.programus.proto.Board\"$\n\x11PutBoardsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"+\n\x08\x46irmware\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x11\n\tfavourite\x18\x02 \x01(\x08\"\x14\n\x12GetFirmwareRequest\"k\n\x13GetFirmwareResponse\x12&\n\x03\x61ll\x18\x01 \x03(\x0b\x32\x19.programus.proto.Firmware\x12,\n\tfavorites\x18\x02 \x03(\x0b\x32\x19.programus.proto.Firmware\"j\n\x12PutFirmwareRequest\x12&\n\x03\x61ll\x18\x01 \x03(\x0b\x32\x19.programus.proto.Firmware\x12,\n\tfavorites\x18\x02 \x03(\x0b\x32\x19.programus.proto.Firmware\"&\n\x13PutFirmwareResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"b\n\x0c\x46lashRequest\x12+\n\x08\x66irmware\x18\x01 \x01(\x0b\x32\x19.programus.proto.Firmware\x12%\n\x05\x62oard\x18\x02 \x01(\x0b\x32\x16.programus.proto.Board\"1\n\rFlashResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"\xb8\x01\n\x12\x44\x65viceUpdateStatus\x12:\n\x06status\x18\x01 \x01(\x0e\x32*.programus.proto.DeviceUpdateStatus.Status\x12\x18\n\x10\x66lashingProgress\x18\x02 \x01(\x02\x12\r\n\x05image\x18\x03 \x01(\t\"=\n\x06Status\x12\x0f\n\x0bUNREACHABLE\x10\x00\x12\t\n\x05READY\x10\x01\x12\x0c\n\x08\x46LASHING\x10\x02\x12\t\n\x05\x45RROR\x10\x03\"\x84\x04\n\nFileUpload\x12\x0b\n\x03uid\x18\x01 \x01(\x04\x12\x32\n\x05start\x18\x64 \x01(\x0b\x32!.programus.proto.FileUpload.StartH\x00\x12\x30\n\x04part\x18\x65 \x01(\x0b\x32 .programus.proto.FileUpload.PartH\x00\x12\x34\n\x06\x66inish\x18g \x01(\x0b\x32\".programus.proto.FileUpload.FinishH\x00\x12\x34\n\x06result\x18h \x01(\x0e\x32\".programus.proto.FileUpload.ResultH\x00\x1ag\n\x05Start\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0c\n\x04size\x18\x02 \x01(\x04\x12\x0e\n\x06\x63hunks\x18\x03 \x01(\r\x12\x32\n\x04type\x18\x04 \x01(\x0e\x32$.programus.proto.FileUpload.FileType\x1a%\n\x04Part\x12\x0e\n\x06partNo\x18\x01 \x01(\r\x12\r\n\x05\x63hunk\x18\n \x01(\x0c\x1a\x1a\n\x06\x46inish\x12\x10\n\x08\x63hecksum\x18\x01 \x01(\x0c\"\x18\n\x08\x46ileType\x12\x0c\n\x08\x46IRMWARE\x10\x00\"H\n\x06Result\x12\x06\n\x02OK\x10\x00\x12\x14\n\x10INVALID_CHECKSUM\x10\x01\x12\x0c\n\x08IO_ERROR\x10\x02\x12\x12\n\x0e\x41LREADY_EXISTS\x10\x03\x42\x07\n\x05\x65vent\"1\n\rDebuggerStart\x12\x0e\n\x06target\x18\x01 \x01(\t\x12\x10\n\x08\x66irmware\x18\x02 \x01(\t\"$\n\x0f\x44\x65\x62uggerStarted\x12\x11\n\tsessionId\x18\x01 \x01(\r\"\x0e\n\x0c\x44\x65\x62uggerStop\"-\n\x0c\x44\x65\x62uggerLine\x12\x0f\n\x07ordinal\x18\x02 \x01(\x04\x12\x0c\n\x04line\x18\x03 \x01(\t\"\x1a\n\nDeleteFile\x12\x0c\n\x04name\x18\x01 \x01(\t\"\xe3\n\n\x0eGenericMessage\x12\x11\n\tsessionId\x18\x01 \x01(\x04\x12\x11\n\x07request\x18\x02 \x01(\x04H\x00\x12\x12\n\x08response\x18\x03 \x01(\x04H\x00\x12\x35\n\x0csetSessionId\x18\x64 \x01(\x0b\x32\x1d.programus.proto.SetSessionIdH\x01\x12+\n\theartbeat\x18\x65 \x01(\x0b\x32\x16.google.protobuf.EmptyH\x01\x12$\n\x02ok\x18\x66 \x01(\x0b\x32\x16.google.protobuf.EmptyH\x01\x12>\n\x10getBoardsRequest\x18\xd2\x01 \x01(\x0b\x32!.programus.proto.GetBoardsRequestH\x01\x12@\n\x11getBoardsResponse\x18\xd3\x01 \x01(\x0b\x32\".programus.proto.GetBoardsResponseH\x01\x12>\n\x10putBoardsRequest\x18\xd4\x01 \x01(\x0b\x32!.programus.proto.PutBoardsRequestH\x01\x12@\n\x11putBoardsResponse\x18\xd5\x01 \x01(\x0b\x32\".programus.proto.PutBoardsResponseH\x01\x12\x42\n\x12getFirmwareRequest\x18\xdc\x01 \x01(\x0b\x32#.programus.proto.GetFirmwareRequestH\x01\x12\x44\n\x13getFirmwareResponse\x18\xdd\x01 \x01(\x0b\x32$.programus.proto.GetFirmwareResponseH\x01\x12\x42\n\x12putFirmwareRequest\x18\xde\x01 \x01(\x0b\x32#.programus.proto.PutFirmwareRequestH\x01\x12\x44\n\x13putFirmwareResponse\x18\xdf\x01 \x01(\x0b\x32$.programus.proto.PutFirmwareResponseH\x01\x12\x36\n\x0c\x66lashRequest\x18\xe6\x01 \x01(\x0b\x32\x1d.programus.proto.FlashRequestH\x01\x12\x38\n\rflashResponse\x18\xe7\x01 \x01(\x0b\x32\x1e.programus.proto.FlashResponseH\x01\x12\x42\n\x12\x64\x65viceUpdateStatus\x18\xca\x01 \x01(\x0b\x32#.programus.proto.DeviceUpdateStatusH\x01\x12\x32\n\nfileUpload\x18\xcb\x01 \x01(\x0b\x32\x1b.programus.proto.FileUploadH\x01\x12\x38\n\rdebuggerStart\x18\xcc\x01 \x01(\x0b\x32\x1e.programus.proto.DebuggerStartH\x01\x12<\n\x0f\x64\x65\x62uggerStarted\x18\xcd\x01 \x01(\x0b\x32 .programus.proto.DebuggerStartedH\x01\x12\x36\n\x0c\x64\x65\x62uggerStop\x18\xce\x01 \x01(\x0b\x32\x1d.programus.proto.DebuggerStopH\x01\x12\x36\n\x0c\x64\x65\x62uggerLine\x18\xcf\x01 \x01(\x0b\x32\x1d.programus.proto.DebuggerLineH\x01\x12\x32\n\ndeleteFile\x18\xd0\x01 \x01(\x0b\x32\x1b.programus.proto.DeleteFileH\x01\x12-\n\x04test\x18\xad\x02 \x01(\x0b\x32\x1c.programus.proto.TestMessageH\x01\x12/\n\x05\x65rror\x18\xae\x02 \x01(\x0b\x32\x1d.programus.proto.ErrorMessageH\x01\x42\x04\n\x02idB\t\n\x07payloadb\x06proto3')
-
-
-
-_TESTMESSAGE = DESCRIPTOR.message_types_by_name['TestMessage']
-_ERRORMESSAGE = DESCRIPTOR.message_types_by_name['ErrorMessage']
-_SETSESSIONID = DESCRIPTOR.message_types_by_name['SetSessionId']
-_BOARD = DESCRIPTOR.message_types_by_name['Board']
-_GETBOARDSREQUEST = DESCRIPTOR.message_types_by_name['GetBoardsRequest']
-_GETBOARDSRESPONSE = DESCRIPTOR.message_types_by_name['GetBoardsResponse']
-_PUTBOARDSREQUEST = DESCRIPTOR.message_types_by_name['PutBoardsRequest']
-_PUTBOARDSRESPONSE = DESCRIPTOR.message_types_by_name['PutBoardsResponse']
-_FIRMWARE = DESCRIPTOR.message_types_by_name['Firmware']
-_GETFIRMWAREREQUEST = DESCRIPTOR.message_types_by_name['GetFirmwareRequest']
-_GETFIRMWARERESPONSE = DESCRIPTOR.message_types_by_name['GetFirmwareResponse']
-_PUTFIRMWAREREQUEST = DESCRIPTOR.message_types_by_name['PutFirmwareRequest']
-_PUTFIRMWARERESPONSE = DESCRIPTOR.message_types_by_name['PutFirmwareResponse']
-_FLASHREQUEST = DESCRIPTOR.message_types_by_name['FlashRequest']
-_FLASHRESPONSE = DESCRIPTOR.message_types_by_name['FlashResponse']
-_DEVICEUPDATESTATUS = DESCRIPTOR.message_types_by_name['DeviceUpdateStatus']
-_FILEUPLOAD = DESCRIPTOR.message_types_by_name['FileUpload']
-_FILEUPLOAD_START = _FILEUPLOAD.nested_types_by_name['Start']
-_FILEUPLOAD_PART = _FILEUPLOAD.nested_types_by_name['Part']
-_FILEUPLOAD_FINISH = _FILEUPLOAD.nested_types_by_name['Finish']
-_DEBUGGERSTART = DESCRIPTOR.message_types_by_name['DebuggerStart']
-_DEBUGGERSTARTED = DESCRIPTOR.message_types_by_name['DebuggerStarted']
-_DEBUGGERSTOP = DESCRIPTOR.message_types_by_name['DebuggerStop']
-_DEBUGGERLINE = DESCRIPTOR.message_types_by_name['DebuggerLine']
-_DELETEFILE = DESCRIPTOR.message_types_by_name['DeleteFile']
-_GENERICMESSAGE = DESCRIPTOR.message_types_by_name['GenericMessage']
-_DEVICEUPDATESTATUS_STATUS = _DEVICEUPDATESTATUS.enum_types_by_name['Status']
-_FILEUPLOAD_FILETYPE = _FILEUPLOAD.enum_types_by_name['FileType']
-_FILEUPLOAD_RESULT = _FILEUPLOAD.enum_types_by_name['Result']
-TestMessage = _reflection.GeneratedProtocolMessageType('TestMessage', (_message.Message,), {
-  'DESCRIPTOR' : _TESTMESSAGE,
-  '__module__' : 'proto.protocol_pb2'
-  # @@protoc_insertion_point(class_scope:programus.proto.TestMessage)
-  })
-_sym_db.RegisterMessage(TestMessage)
-
-ErrorMessage = _reflection.GeneratedProtocolMessageType('ErrorMessage', (_message.Message,), {
-  'DESCRIPTOR' : _ERRORMESSAGE,
-  '__module__' : 'proto.protocol_pb2'
-  # @@protoc_insertion_point(class_scope:programus.proto.ErrorMessage)
-  })
-_sym_db.RegisterMessage(ErrorMessage)
-
-SetSessionId = _reflection.GeneratedProtocolMessageType('SetSessionId', (_message.Message,), {
-  'DESCRIPTOR' : _SETSESSIONID,
-  '__module__' : 'proto.protocol_pb2'
-  # @@protoc_insertion_point(class_scope:programus.proto.SetSessionId)
-  })
-_sym_db.RegisterMessage(SetSessionId)
-
-Board = _reflection.GeneratedProtocolMessageType('Board', (_message.Message,), {
-  'DESCRIPTOR' : _BOARD,
-  '__module__' : 'proto.protocol_pb2'
-  # @@protoc_insertion_point(class_scope:programus.proto.Board)
-  })
-_sym_db.RegisterMessage(Board)
-
-GetBoardsRequest = _reflection.GeneratedProtocolMessageType('GetBoardsRequest', (_message.Message,), {
-  'DESCRIPTOR' : _GETBOARDSREQUEST,
-  '__module__' : 'proto.protocol_pb2'
-  # @@protoc_insertion_point(class_scope:programus.proto.GetBoardsRequest)
-  })
-_sym_db.RegisterMessage(GetBoardsRequest)
-
-GetBoardsResponse = _reflection.GeneratedProtocolMessageType('GetBoardsResponse', (_message.Message,), {
-  'DESCRIPTOR' : _GETBOARDSRESPONSE,
-  '__module__' : 'proto.protocol_pb2'
-  # @@protoc_insertion_point(class_scope:programus.proto.GetBoardsResponse)
-  })
-_sym_db.RegisterMessage(GetBoardsResponse)
-
-PutBoardsRequest = _reflection.GeneratedProtocolMessageType('PutBoardsRequest', (_message.Message,), {
-  'DESCRIPTOR' : _PUTBOARDSREQUEST,
-  '__module__' : 'proto.protocol_pb2'
-  # @@protoc_insertion_point(class_scope:programus.proto.PutBoardsRequest)
-  })
-_sym_db.RegisterMessage(PutBoardsRequest)
-
-PutBoardsResponse = _reflection.GeneratedProtocolMessageType('PutBoardsResponse', (_message.Message,), {
-  'DESCRIPTOR' : _PUTBOARDSRESPONSE,
-  '__module__' : 'proto.protocol_pb2'
-  # @@protoc_insertion_point(class_scope:programus.proto.PutBoardsResponse)
-  })
-_sym_db.RegisterMessage(PutBoardsResponse)
-
-Firmware = _reflection.GeneratedProtocolMessageType('Firmware', (_message.Message,), {
-  'DESCRIPTOR' : _FIRMWARE,
-  '__module__' : 'proto.protocol_pb2'
-  # @@protoc_insertion_point(class_scope:programus.proto.Firmware)
-  })
-_sym_db.RegisterMessage(Firmware)
-
-GetFirmwareRequest = _reflection.GeneratedProtocolMessageType('GetFirmwareRequest', (_message.Message,), {
-  'DESCRIPTOR' : _GETFIRMWAREREQUEST,
-  '__module__' : 'proto.protocol_pb2'
-  # @@protoc_insertion_point(class_scope:programus.proto.GetFirmwareRequest)
-  })
-_sym_db.RegisterMessage(GetFirmwareRequest)
-
-GetFirmwareResponse = _reflection.GeneratedProtocolMessageType('GetFirmwareResponse', (_message.Message,), {
-  'DESCRIPTOR' : _GETFIRMWARERESPONSE,
-  '__module__' : 'proto.protocol_pb2'
-  # @@protoc_insertion_point(class_scope:programus.proto.GetFirmwareResponse)
-  })
-_sym_db.RegisterMessage(GetFirmwareResponse)
-
-PutFirmwareRequest = _reflection.GeneratedProtocolMessageType('PutFirmwareRequest', (_message.Message,), {
-  'DESCRIPTOR' : _PUTFIRMWAREREQUEST,
-  '__module__' : 'proto.protocol_pb2'
-  # @@protoc_insertion_point(class_scope:programus.proto.PutFirmwareRequest)
-  })
-_sym_db.RegisterMessage(PutFirmwareRequest)
-
-PutFirmwareResponse = _reflection.GeneratedProtocolMessageType('PutFirmwareResponse', (_message.Message,), {
-  'DESCRIPTOR' : _PUTFIRMWARERESPONSE,
-  '__module__' : 'proto.protocol_pb2'
-  # @@protoc_insertion_point(class_scope:programus.proto.PutFirmwareResponse)
-  })
-_sym_db.RegisterMessage(PutFirmwareResponse)
-
-FlashRequest = _reflection.GeneratedProtocolMessageType('FlashRequest', (_message.Message,), {
-  'DESCRIPTOR' : _FLASHREQUEST,
-  '__module__' : 'proto.protocol_pb2'
-  # @@protoc_insertion_point(class_scope:programus.proto.FlashRequest)
-  })
-_sym_db.RegisterMessage(FlashRequest)
-
-FlashResponse = _reflection.GeneratedProtocolMessageType('FlashResponse', (_message.Message,), {
-  'DESCRIPTOR' : _FLASHRESPONSE,
-  '__module__' : 'proto.protocol_pb2'
-  # @@protoc_insertion_point(class_scope:programus.proto.FlashResponse)
-  })
-_sym_db.RegisterMessage(FlashResponse)
-
-DeviceUpdateStatus = _reflection.GeneratedProtocolMessageType('DeviceUpdateStatus', (_message.Message,), {
-  'DESCRIPTOR' : _DEVICEUPDATESTATUS,
-  '__module__' : 'proto.protocol_pb2'
-  # @@protoc_insertion_point(class_scope:programus.proto.DeviceUpdateStatus)
-  })
-_sym_db.RegisterMessage(DeviceUpdateStatus)
-
-FileUpload = _reflection.GeneratedProtocolMessageType('FileUpload', (_message.Message,), {
-
-  'Start' : _reflection.GeneratedProtocolMessageType('Start', (_message.Message,), {
-    'DESCRIPTOR' : _FILEUPLOAD_START,
-    '__module__' : 'proto.protocol_pb2'
-    # @@protoc_insertion_point(class_scope:programus.proto.FileUpload.Start)
-    })
-  ,
-
-  'Part' : _reflection.GeneratedProtocolMessageType('Part', (_message.Message,), {
-    'DESCRIPTOR' : _FILEUPLOAD_PART,
-    '__module__' : 'proto.protocol_pb2'
-    # @@protoc_insertion_point(class_scope:programus.proto.FileUpload.Part)
-    })
-  ,
-
-  'Finish' : _reflection.GeneratedProtocolMessageType('Finish', (_message.Message,), {
-    'DESCRIPTOR' : _FILEUPLOAD_FINISH,
-    '__module__' : 'proto.protocol_pb2'
-    # @@protoc_insertion_point(class_scope:programus.proto.FileUpload.Finish)
-    })
-  ,
-  'DESCRIPTOR' : _FILEUPLOAD,
-  '__module__' : 'proto.protocol_pb2'
-  # @@protoc_insertion_point(class_scope:programus.proto.FileUpload)
-  })
-_sym_db.RegisterMessage(FileUpload)
-_sym_db.RegisterMessage(FileUpload.Start)
-_sym_db.RegisterMessage(FileUpload.Part)
-_sym_db.RegisterMessage(FileUpload.Finish)
-
-DebuggerStart = _reflection.GeneratedProtocolMessageType('DebuggerStart', (_message.Message,), {
-  'DESCRIPTOR' : _DEBUGGERSTART,
-  '__module__' : 'proto.protocol_pb2'
-  # @@protoc_insertion_point(class_scope:programus.proto.DebuggerStart)
-  })
-_sym_db.RegisterMessage(DebuggerStart)
-
-DebuggerStarted = _reflection.GeneratedProtocolMessageType('DebuggerStarted', (_message.Message,), {
-  'DESCRIPTOR' : _DEBUGGERSTARTED,
-  '__module__' : 'proto.protocol_pb2'
-  # @@protoc_insertion_point(class_scope:programus.proto.DebuggerStarted)
-  })
-_sym_db.RegisterMessage(DebuggerStarted)
-
-DebuggerStop = _reflection.GeneratedProtocolMessageType('DebuggerStop', (_message.Message,), {
-  'DESCRIPTOR' : _DEBUGGERSTOP,
-  '__module__' : 'proto.protocol_pb2'
-  # @@protoc_insertion_point(class_scope:programus.proto.DebuggerStop)
-  })
-_sym_db.RegisterMessage(DebuggerStop)
-
-DebuggerLine = _reflection.GeneratedProtocolMessageType('DebuggerLine', (_message.Message,), {
-  'DESCRIPTOR' : _DEBUGGERLINE,
-  '__module__' : 'proto.protocol_pb2'
-  # @@protoc_insertion_point(class_scope:programus.proto.DebuggerLine)
-  })
-_sym_db.RegisterMessage(DebuggerLine)
-
-DeleteFile = _reflection.GeneratedProtocolMessageType('DeleteFile', (_message.Message,), {
-  'DESCRIPTOR' : _DELETEFILE,
-  '__module__' : 'proto.protocol_pb2'
-  # @@protoc_insertion_point(class_scope:programus.proto.DeleteFile)
-  })
-_sym_db.RegisterMessage(DeleteFile)
-
-GenericMessage = _reflection.GeneratedProtocolMessageType('GenericMessage', (_message.Message,), {
-  'DESCRIPTOR' : _GENERICMESSAGE,
-  '__module__' : 'proto.protocol_pb2'
-  # @@protoc_insertion_point(class_scope:programus.proto.GenericMessage)
-  })
-_sym_db.RegisterMessage(GenericMessage)
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x14proto/protocol.proto\x12\x0fprogramus.proto\x1a\x1bgoogle/protobuf/empty.proto\"\x1c\n\x0bTestMessage\x12\r\n\x05value\x18\x01 \x01(\t\"#\n\x0c\x45rrorMessage\x12\x13\n\x0b\x64\x65scription\x18\x01 \x01(\t\"!\n\x0cSetSessionId\x12\x11\n\tsessionId\x18\x01 \x01(\x04\"\x1d\n\x0c\x43\x61pabilities\x12\r\n\x05\x62\x61tch\x18\x01 \x01(\x08\":\n\x05\x42\x61tch\x12\x31\n\x08messages\x18\x01 \x03(\x0b\x32\x1f.programus.proto.GenericMessage\"A\n\rStreamControl\x12\x0f\n\x07request\x18\x01 \x01(\x04\x12\x0f\n\x07\x63redits\x18\x02 \x01(\r\x12\x0e\n\x06\x63\x61ncel\x18\x03 \x01(\x08\"(\n\x05\x42oard\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x11\n\tfavourite\x18\x02 \x01(\x08\"\x12\n\x10GetBoardsRequest\"c\n\x11GetBoardsResponse\x12#\n\x03\x61ll\x18\x01 \x03(\x0b\x32\x16.programus.proto.Board\x12)\n\tfavorites\x18\x02 \x03(\x0b\x32\x16.programus.proto.Board\"b\n\x10PutBoardsRequest\x12#\n\x03\x61ll\x18\x01 \x03(\x0b\x32\x16.programus.proto.Board\x12)\n\tfavorites\x18\x02 \x03(\x0b\x32\x16.programus.proto.Board\"$\n\x11PutBoardsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"+\n\x08\x46irmware\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x11\n\tfavourite\x18\x02 \x01(\x08\"\x14\n\x12GetFirmwareRequest\"k\n\x13GetFirmwareResponse\x12&\n\x03\x61ll\x18\x01 \x03(\x0b\x32\x19.programus.proto.Firmware\x12,\n\tfavorites\x18\x02 \x03(\x0b\x32\x19.programus.proto.Firmware\"j\n\x12PutFirmwareRequest\x12&\n\x03\x61ll\x18\x01 \x03(\x0b\x32\x19.programus.proto.Firmware\x12,\n\tfavorites\x18\x02 \x03(\x0b\x32\x19.programus.proto.Firmware\"&\n\x13PutFirmwareResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"b\n\x0c\x46lashRequest\x12+\n\x08\x66irmware\x18\x01 \x01(\x0b\x32\x19.programus.proto.Firmware\x12%\n\x05\x62oard\x18\x02 \x01(\x0b\x32\x16.programus.proto.Board\"1\n\rFlashResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"\xb8\x01\n\x12\x44\x65viceUpdateStatus\x12:\n\x06status\x18\x01 \x01(\x0e\x32*.programus.proto.DeviceUpdateStatus.Status\x12\x18\n\x10\x66lashingProgress\x18\x02 \x01(\x02\x12\r\n\x05image\x18\x03 \x01(\t\"=\n\x06Status\x12\x0f\n\x0bUNREACHABLE\x10\x00\x12\t\n\x05READY\x10\x01\x12\x0c\n\x08\x46LASHING\x10\x02\x12\t\n\x05\x45RROR\x10\x03\"\x84\x04\n\nFileUpload\x12\x0b\n\x03uid\x18\x01 \x01(\x04\x12\x32\n\x05start\x18\x64 \x01(\x0b\x32!.programus.proto.FileUpload.StartH\x00\x12\x30\n\x04part\x18\x65 \x01(\x0b\x32 .programus.proto.FileUpload.PartH\x00\x12\x34\n\x06\x66inish\x18g \x01(\x0b\x32\".programus.proto.FileUpload.FinishH\x00\x12\x34\n\x06result\x18h \x01(\x0e\x32\".programus.proto.FileUpload.ResultH\x00\x1ag\n\x05Start\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0c\n\x04size\x18\x02 \x01(\x04\x12\x0e\n\x06\x63hunks\x18\x03 \x01(\r\x12\x32\n\x04type\x18\x04 \x01(\x0e\x32$.programus.proto.FileUpload.FileType\x1a%\n\x04Part\x12\x0e\n\x06partNo\x18\x01 \x01(\r\x12\r\n\x05\x63hunk\x18\n \x01(\x0c\x1a\x1a\n\x06\x46inish\x12\x10\n\x08\x63hecksum\x18\x01 \x01(\x0c\"\x18\n\x08\x46ileType\x12\x0c\n\x08\x46IRMWARE\x10\x00\"H\n\x06Result\x12\x06\n\x02OK\x10\x00\x12\x14\n\x10INVALID_CHECKSUM\x10\x01\x12\x0c\n\x08IO_ERROR\x10\x02\x12\x12\n\x0e\x41LREADY_EXISTS\x10\x03\x42\x07\n\x05\x65vent\"1\n\rDebuggerStart\x12\x0e\n\x06target\x18\x01 \x01(\t\x12\x10\n\x08\x66irmware\x18\x02 \x01(\t\"$\n\x0f\x44\x65\x62uggerStarted\x12\x11\n\tsessionId\x18\x01 \x01(\r\"\x0e\n\x0c\x44\x65\x62uggerStop\"-\n\x0c\x44\x65\x62uggerLine\x12\x0f\n\x07ordinal\x18\x02 \x01(\x04\x12\x0c\n\x04line\x18\x03 \x01(\t\"\x1a\n\nDeleteFile\x12\x0c\n\x04name\x18\x01 \x01(\t\"\xab\x0c\n\x0eGenericMessage\x12\x11\n\tsessionId\x18\x01 \x01(\x04\x12\x11\n\x07request\x18\x02 \x01(\x04H\x00\x12\x12\n\x08response\x18\x03 \x01(\x04H\x00\x12\x0e\n\x06stream\x18\x04 \x01(\r\x12\x0c\n\x04more\x18\x05 \x01(\x08\x12\x0f\n\x07\x63redits\x18\x06 \x01(\r\x12\x35\n\x0csetSessionId\x18\x64 \x01(\x0b\x32\x1d.programus.proto.SetSessionIdH\x01\x12+\n\theartbeat\x18\x65 \x01(\x0b\x32\x16.google.protobuf.EmptyH\x01\x12$\n\x02ok\x18\x66 \x01(\x0b\x32\x16.google.protobuf.EmptyH\x01\x12\x35\n\x0c\x63\x61pabilities\x18g \x01(\x0b\x32\x1d.programus.proto.CapabilitiesH\x01\x12\'\n\x05\x62\x61tch\x18h \x01(\x0b\x32\x16.programus.proto.BatchH\x01\x12\x37\n\rstreamControl\x18i \x01(\x0b\x32\x1e.programus.proto.StreamControlH\x01\x12>\n\x10getBoardsRequest\x18\xd2\x01 \x01(\x0b\x32!.programus.proto.GetBoardsRequestH\x01\x12@\n\x11getBoardsResponse\x18\xd3\x01 \x01(\x0b\x32\".programus.proto.GetBoardsResponseH\x01\x12>\n\x10putBoardsRequest\x18\xd4\x01 \x01(\x0b\x32!.programus.proto.PutBoardsRequestH\x01\x12@\n\x11putBoardsResponse\x18\xd5\x01 \x01(\x0b\x32\".programus.proto.PutBoardsResponseH\x01\x12\x42\n\x12getFirmwareRequest\x18\xdc\x01 \x01(\x0b\x32#.programus.proto.GetFirmwareRequestH\x01\x12\x44\n\x13getFirmwareResponse\x18\xdd\x01 \x01(\x0b\x32$.programus.proto.GetFirmwareResponseH\x01\x12\x42\n\x12putFirmwareRequest\x18\xde\x01 \x01(\x0b\x32#.programus.proto.PutFirmwareRequestH\x01\x12\x44\n\x13putFirmwareResponse\x18\xdf\x01 \x01(\x0b\x32$.programus.proto.PutFirmwareResponseH\x01\x12\x36\n\x0c\x66lashRequest\x18\xe6\x01 \x01(\x0b\x32\x1d.programus.proto.FlashRequestH\x01\x12\x38\n\rflashResponse\x18\xe7\x01 \x01(\x0b\x32\x1e.programus.proto.FlashResponseH\x01\x12\x42\n\x12\x64\x65viceUpdateStatus\x18\xca\x01 \x01(\x0b\x32#.programus.proto.DeviceUpdateStatusH\x01\x12\x32\n\nfileUpload\x18\xcb\x01 \x01(\x0b\x32\x1b.programus.proto.FileUploadH\x01\x12\x38\n\rdebuggerStart\x18\xcc\x01 \x01(\x0b\x32\x1e.programus.proto.DebuggerStartH\x01\x12<\n\x0f\x64\x65\x62uggerStarted\x18\xcd\x01 \x01(\x0b\x32 .programus.proto.DebuggerStartedH\x01\x12\x36\n\x0c\x64\x65\x62uggerStop\x18\xce\x01 \x01(\x0b\x32\x1d.programus.proto.DebuggerStopH\x01\x12\x36\n\x0c\x64\x65\x62uggerLine\x18\xcf\x01 \x01(\x0b\x32\x1d.programus.proto.DebuggerLineH\x01\x12\x32\n\ndeleteFile\x18\xd0\x01 \x01(\x0b\x32\x1b.programus.proto.DeleteFileH\x01\x12-\n\x04test\x18\xad\x02 \x01(\x0b\x32\x1c.programus.proto.TestMessageH\x01\x12/\n\x05\x65rror\x18\xae\x02 \x01(\x0b\x32\x1d.programus.proto.ErrorMessageH\x01\x42\x04\n\x02idB\t\n\x07payloadb\x06proto3')
 
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'proto.protocol_pb2', globals())
 if _descriptor._USE_C_DESCRIPTORS == False:
 
   DESCRIPTOR._options = None
@@ -242,56 +27,62 @@ if _descriptor._USE_C_DESCRIPTORS == False:
   _ERRORMESSAGE._serialized_end=135
   _SETSESSIONID._serialized_start=137
   _SETSESSIONID._serialized_end=170
-  _BOARD._serialized_start=172
-  _BOARD._serialized_end=212
-  _GETBOARDSREQUEST._serialized_start=214
-  _GETBOARDSREQUEST._serialized_end=232
-  _GETBOARDSRESPONSE._serialized_start=234
-  _GETBOARDSRESPONSE._serialized_end=333
-  _PUTBOARDSREQUEST._serialized_start=335
-  _PUTBOARDSREQUEST._serialized_end=433
-  _PUTBOARDSRESPONSE._serialized_start=435
-  _PUTBOARDSRESPONSE._serialized_end=471
-  _FIRMWARE._serialized_start=473
-  _FIRMWARE._serialized_end=516
-  _GETFIRMWAREREQUEST._serialized_start=518
-  _GETFIRMWAREREQUEST._serialized_end=538
-  _GETFIRMWARERESPONSE._serialized_start=540
-  _GETFIRMWARERESPONSE._serialized_end=647
-  _PUTFIRMWAREREQUEST._serialized_start=649
-  _PUTFIRMWAREREQUEST._serialized_end=755
-  _PUTFIRMWARERESPONSE._serialized_start=757
-  _PUTFIRMWARERESPONSE._serialized_end=795
-  _FLASHREQUEST._serialized_start=797
-  _FLASHREQUEST._serialized_end=895
-  _FLASHRESPONSE._serialized_start=897
-  _FLASHRESPONSE._serialized_end=946
-  _DEVICEUPDATESTATUS._serialized_start=949
-  _DEVICEUPDATESTATUS._serialized_end=1133
-  _DEVICEUPDATESTATUS_STATUS._serialized_start=1072
-  _DEVICEUPDATESTATUS_STATUS._serialized_end=1133
-  _FILEUPLOAD._serialized_start=1136
-  _FILEUPLOAD._serialized_end=1652
-  _FILEUPLOAD_START._serialized_start=1373
-  _FILEUPLOAD_START._serialized_end=1476
-  _FILEUPLOAD_PART._serialized_start=1478
-  _FILEUPLOAD_PART._serialized_end=1515
-  _FILEUPLOAD_FINISH._serialized_start=1517
-  _FILEUPLOAD_FINISH._serialized_end=1543
-  _FILEUPLOAD_FILETYPE._serialized_start=1545
-  _FILEUPLOAD_FILETYPE._serialized_end=1569
-  _FILEUPLOAD_RESULT._serialized_start=1571
-  _FILEUPLOAD_RESULT._serialized_end=1643
-  _DEBUGGERSTART._serialized_start=1654
-  _DEBUGGERSTART._serialized_end=1703
-  _DEBUGGERSTARTED._serialized_start=1705
-  _DEBUGGERSTARTED._serialized_end=1741
-  _DEBUGGERSTOP._serialized_start=1743
-  _DEBUGGERSTOP._serialized_end=1757
-  _DEBUGGERLINE._serialized_start=1759
-  _DEBUGGERLINE._serialized_end=1804
-  _DELETEFILE._serialized_start=1806
-  _DELETEFILE._serialized_end=1832
-  _GENERICMESSAGE._serialized_start=1835
-  _GENERICMESSAGE._serialized_end=3214
+  _CAPABILITIES._serialized_start=172
+  _CAPABILITIES._serialized_end=201
+  _BATCH._serialized_start=203
+  _BATCH._serialized_end=261
+  _STREAMCONTROL._serialized_start=263
+  _STREAMCONTROL._serialized_end=328
+  _BOARD._serialized_start=330
+  _BOARD._serialized_end=370
+  _GETBOARDSREQUEST._serialized_start=372
+  _GETBOARDSREQUEST._serialized_end=390
+  _GETBOARDSRESPONSE._serialized_start=392
+  _GETBOARDSRESPONSE._serialized_end=491
+  _PUTBOARDSREQUEST._serialized_start=493
+  _PUTBOARDSREQUEST._serialized_end=591
+  _PUTBOARDSRESPONSE._serialized_start=593
+  _PUTBOARDSRESPONSE._serialized_end=629
+  _FIRMWARE._serialized_start=631
+  _FIRMWARE._serialized_end=674
+  _GETFIRMWAREREQUEST._serialized_start=676
+  _GETFIRMWAREREQUEST._serialized_end=696
+  _GETFIRMWARERESPONSE._serialized_start=698
+  _GETFIRMWARERESPONSE._serialized_end=805
+  _PUTFIRMWAREREQUEST._serialized_start=807
+  _PUTFIRMWAREREQUEST._serialized_end=913
+  _PUTFIRMWARERESPONSE._serialized_start=915
+  _PUTFIRMWARERESPONSE._serialized_end=953
+  _FLASHREQUEST._serialized_start=955
+  _FLASHREQUEST._serialized_end=1053
+  _FLASHRESPONSE._serialized_start=1055
+  _FLASHRESPONSE._serialized_end=1104
+  _DEVICEUPDATESTATUS._serialized_start=1107
+  _DEVICEUPDATESTATUS._serialized_end=1291
+  _DEVICEUPDATESTATUS_STATUS._serialized_start=1230
+  _DEVICEUPDATESTATUS_STATUS._serialized_end=1291
+  _FILEUPLOAD._serialized_start=1294
+  _FILEUPLOAD._serialized_end=1810
+  _FILEUPLOAD_START._serialized_start=1531
+  _FILEUPLOAD_START._serialized_end=1634
+  _FILEUPLOAD_PART._serialized_start=1636
+  _FILEUPLOAD_PART._serialized_end=1673
+  _FILEUPLOAD_FINISH._serialized_start=1675
+  _FILEUPLOAD_FINISH._serialized_end=1701
+  _FILEUPLOAD_FILETYPE._serialized_start=1703
+  _FILEUPLOAD_FILETYPE._serialized_end=1727
+  _FILEUPLOAD_RESULT._serialized_start=1729
+  _FILEUPLOAD_RESULT._serialized_end=1801
+  _DEBUGGERSTART._serialized_start=1812
+  _DEBUGGERSTART._serialized_end=1861
+  _DEBUGGERSTARTED._serialized_start=1863
+  _DEBUGGERSTARTED._serialized_end=1899
+  _DEBUGGERSTOP._serialized_start=1901
+  _DEBUGGERSTOP._serialized_end=1915
+  _DEBUGGERLINE._serialized_start=1917
+  _DEBUGGERLINE._serialized_end=1962
+  _DELETEFILE._serialized_start=1964
+  _DELETEFILE._serialized_end=1990
+  _GENERICMESSAGE._serialized_start=1993
+  _GENERICMESSAGE._serialized_end=3572
 # @@protoc_insertion_point(module_scope)
@@ -21,8 +21,6 @@ DESCRIPTOR: google.protobuf.descriptor.FileDescriptor
 
 @typing_extensions.final
 class TestMessage(google.protobuf.message.Message):
-    """TODO(bgrzesik): delete me"""
-
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
 
     VALUE_FIELD_NUMBER: builtins.int
@@ -66,6 +64,69 @@ class SetSessionId(google.protobuf.message.Message):
 
 global___SetSessionId = SetSessionId
 
+@typing_extensions.final
+class Capabilities(google.protobuf.message.Message):
+    """Sent without request id when connected, peers that do not know it
+    ignore it
+    """
+
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    BATCH_FIELD_NUMBER: builtins.int
+    batch: builtins.bool
+    def __init__(
+        self,
+        *,
+        batch: builtins.bool = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["batch", b"batch"]) -> None: ...
+
+global___Capabilities = Capabilities
+
+@typing_extensions.final
+class Batch(google.protobuf.message.Message):
+    """Only sent to peers that advertised Capabilities.batch"""
+
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    MESSAGES_FIELD_NUMBER: builtins.int
+    @property
+    def messages(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___GenericMessage]: ...
+    def __init__(
+        self,
+        *,
+        messages: collections.abc.Iterable[global___GenericMessage] | None = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["messages", b"messages"]) -> None: ...
+
+global___Batch = Batch
+
+@typing_extensions.final
+class StreamControl(google.protobuf.message.Message):
+    """Sent without request id by the receiver of a streamed response"""
+
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    REQUEST_FIELD_NUMBER: builtins.int
+    CREDITS_FIELD_NUMBER: builtins.int
+    CANCEL_FIELD_NUMBER: builtins.int
+    request: builtins.int
+    """Id of the request being answered"""
+    credits: builtins.int
+    """Further partial responses the receiver accepts"""
+    cancel: builtins.bool
+    """Stops the stream, no further responses are sent"""
+    def __init__(
+        self,
+        *,
+        request: builtins.int = ...,
+        credits: builtins.int = ...,
+        cancel: builtins.bool = ...,
+    ) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["cancel", b"cancel", "credits", b"credits", "request", b"request"]) -> None: ...
+
+global___StreamControl = StreamControl
+
 @typing_extensions.final
 class Board(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
@@ -503,9 +564,15 @@ class GenericMessage(google.protobuf.message.Message):
     SESSIONID_FIELD_NUMBER: builtins.int
     REQUEST_FIELD_NUMBER: builtins.int
     RESPONSE_FIELD_NUMBER: builtins.int
+    STREAM_FIELD_NUMBER: builtins.int
+    MORE_FIELD_NUMBER: builtins.int
+    CREDITS_FIELD_NUMBER: builtins.int
     SETSESSIONID_FIELD_NUMBER: builtins.int
     HEARTBEAT_FIELD_NUMBER: builtins.int
     OK_FIELD_NUMBER: builtins.int
+    CAPABILITIES_FIELD_NUMBER: builtins.int
+    BATCH_FIELD_NUMBER: builtins.int
+    STREAMCONTROL_FIELD_NUMBER: builtins.int
     GETBOARDSREQUEST_FIELD_NUMBER: builtins.int
     GETBOARDSRESPONSE_FIELD_NUMBER: builtins.int
     PUTBOARDSREQUEST_FIELD_NUMBER: builtins.int
@@ -528,6 +595,16 @@ class GenericMessage(google.protobuf.message.Message):
     sessionId: builtins.int
     request: builtins.int
     response: builtins.int
+    stream: builtins.int
+    """Logical stream, ordered independently of other streams, responses
+    travel on the stream of their request. 0 when not assigned
+    """
+    more: builtins.bool
+    """Set on partial responses, the last response of a stream has it unset"""
+    credits: builtins.int
+    """On requests, partial responses accepted before the first
+    StreamControl. 0 when only a single response is accepted
+    """
     @property
     def setSessionId(self) -> global___SetSessionId: ...
     @property
@@ -535,6 +612,12 @@ class GenericMessage(google.protobuf.message.Message):
     @property
     def ok(self) -> google.protobuf.empty_pb2.Empty: ...
     @property
+    def capabilities(self) -> global___Capabilities: ...
+    @property
+    def batch(self) -> global___Batch: ...
+    @property
+    def streamControl(self) -> global___StreamControl: ...
+    @property
     def getBoardsRequest(self) -> global___GetBoardsRequest: ...
     @property
     def getBoardsResponse(self) -> global___GetBoardsResponse: ...
@@ -555,8 +638,7 @@ class GenericMessage(google.protobuf.message.Message):
     @property
     def flashResponse(self) -> global___FlashResponse: ...
     @property
-    def deviceUpdateStatus(self) -> global___DeviceUpdateStatus:
-        """Response: Ok(102)"""
+    def deviceUpdateStatus(self) -> global___DeviceUpdateStatus: ...
     @property
     def fileUpload(self) -> global___FileUpload: ...
     @property
@@ -570,7 +652,8 @@ class GenericMessage(google.protobuf.message.Message):
     def debuggerLine(self) -> global___DebuggerLine:
         """Response: Ok(102)"""
     @property
-    def deleteFile(self) -> global___DeleteFile: ...
+    def deleteFile(self) -> global___DeleteFile:
+        """Response: Ok(102)"""
     @property
     def test(self) -> global___TestMessage: ...
     @property
@@ -581,9 +664,15 @@ class GenericMessage(google.protobuf.message.Message):
         sessionId: builtins.int = ...,
         request: builtins.int = ...,
         response: builtins.int = ...,
+        stream: builtins.int = ...,
+        more: builtins.bool = ...,
+        credits: builtins.int = ...,
         setSessionId: global___SetSessionId | None = ...,
         heartbeat: google.protobuf.empty_pb2.Empty | None = ...,
         ok: google.protobuf.empty_pb2.Empty | None = ...,
+        capabilities: global___Capabilities | None = ...,
+        batch: global___Batch | None = ...,
+        streamControl: global___StreamControl | None = ...,
         getBoardsRequest: global___GetBoardsRequest | None = ...,
         getBoardsResponse: global___GetBoardsResponse | None = ...,
         putBoardsRequest: global___PutBoardsRequest | None = ...,
@@ -604,11 +693,11 @@ class GenericMessage(google.protobuf.message.Message):
         test: global___TestMessage | None = ...,
         error: global___ErrorMessage | None = ...,
     ) -> None: ...
-    def HasField(self, field_name: typing_extensions.Literal["debuggerLine", b"debuggerLine", "debuggerStart", b"debuggerStart", "debuggerStarted", b"debuggerStarted", "debuggerStop", b"debuggerStop", "deleteFile", b"deleteFile", "deviceUpdateStatus", b"deviceUpdateStatus", "error", b"error", "fileUpload", b"fileUpload", "flashRequest", b"flashRequest", "flashResponse", b"flashResponse", "getBoardsRequest", b"getBoardsRequest", "getBoardsResponse", b"getBoardsResponse", "getFirmwareRequest", b"getFirmwareRequest", "getFirmwareResponse", b"getFirmwareResponse", "heartbeat", b"heartbeat", "id", b"id", "ok", b"ok", "payload", b"payload", "putBoardsRequest", b"putBoardsRequest", "putBoardsResponse", b"putBoardsResponse", "putFirmwareRequest", b"putFirmwareRequest", "putFirmwareResponse", b"putFirmwareResponse", "request", b"request", "response", b"response", "setSessionId", b"setSessionId", "test", b"test"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing_extensions.Literal["debuggerLine", b"debuggerLine", "debuggerStart", b"debuggerStart", "debuggerStarted", b"debuggerStarted", "debuggerStop", b"debuggerStop", "deleteFile", b"deleteFile", "deviceUpdateStatus", b"deviceUpdateStatus", "error", b"error", "fileUpload", b"fileUpload", "flashRequest", b"flashRequest", "flashResponse", b"flashResponse", "getBoardsRequest", b"getBoardsRequest", "getBoardsResponse", b"getBoardsResponse", "getFirmwareRequest", b"getFirmwareRequest", "getFirmwareResponse", b"getFirmwareResponse", "heartbeat", b"heartbeat", "id", b"id", "ok", b"ok", "payload", b"payload", "putBoardsRequest", b"putBoardsRequest", "putBoardsResponse", b"putBoardsResponse", "putFirmwareRequest", b"putFirmwareRequest", "putFirmwareResponse", b"putFirmwareResponse", "request", b"request", "response", b"response", "sessionId", b"sessionId", "setSessionId", b"setSessionId", "test", b"test"]) -> None: ...
+    def HasField(self, field_name: typing_extensions.Literal["batch", b"batch", "capabilities", b"capabilities", "debuggerLine", b"debuggerLine", "debuggerStart", b"debuggerStart", "debuggerStarted", b"debuggerStarted", "debuggerStop", b"debuggerStop", "deleteFile", b"deleteFile", "deviceUpdateStatus", b"deviceUpdateStatus", "error", b"error", "fileUpload", b"fileUpload", "flashRequest", b"flashRequest", "flashResponse", b"flashResponse", "getBoardsRequest", b"getBoardsRequest", "getBoardsResponse", b"getBoardsResponse", "getFirmwareRequest", b"getFirmwareRequest", "getFirmwareResponse", b"getFirmwareResponse", "heartbeat", b"heartbeat", "id", b"id", "ok", b"ok", "payload", b"payload", "putBoardsRequest", b"putBoardsRequest", "putBoardsResponse", b"putBoardsResponse", "putFirmwareRequest", b"putFirmwareRequest", "putFirmwareResponse", b"putFirmwareResponse", "request", b"request", "response", b"response", "setSessionId", b"setSessionId", "streamControl", b"streamControl", "test", b"test"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing_extensions.Literal["batch", b"batch", "capabilities", b"capabilities", "credits", b"credits", "debuggerLine", b"debuggerLine", "debuggerStart", b"debuggerStart", "debuggerStarted", b"debuggerStarted", "debuggerStop", b"debuggerStop", "deleteFile", b"deleteFile", "deviceUpdateStatus", b"deviceUpdateStatus", "error", b"error", "fileUpload", b"fileUpload", "flashRequest", b"flashRequest", "flashResponse", b"flashResponse", "getBoardsRequest", b"getBoardsRequest", "getBoardsResponse", b"getBoardsResponse", "getFirmwareRequest", b"getFirmwareRequest", "getFirmwareResponse", b"getFirmwareResponse", "heartbeat", b"heartbeat", "id", b"id", "more", b"more", "ok", b"ok", "payload", b"payload", "putBoardsRequest", b"putBoardsRequest", "putBoardsResponse", b"putBoardsResponse", "putFirmwareRequest", b"putFirmwareRequest", "putFirmwareResponse", b"putFirmwareResponse", "request", b"request", "response", b"response", "sessionId", b"sessionId", "setSessionId", b"setSessionId", "stream", b"stream", "streamControl", b"streamControl", "test", b"test"]) -> None: ...
     @typing.overload
     def WhichOneof(self, oneof_group: typing_extensions.Literal["id", b"id"]) -> typing_extensions.Literal["request", "response"] | None: ...
     @typing.overload
-    def WhichOneof(self, oneof_group: typing_extensions.Literal["payload", b"payload"]) -> typing_extensions.Literal["setSessionId", "heartbeat", "ok", "getBoardsRequest", "getBoardsResponse", "putBoardsRequest", "putBoardsResponse", "getFirmwareRequest", "getFirmwareResponse", "putFirmwareRequest", "putFirmwareResponse", "flashRequest", "flashResponse", "deviceUpdateStatus", "fileUpload", "debuggerStart", "debuggerStarted", "debuggerStop", "debuggerLine", "deleteFile", "test", "error"] | None: ...
+    def WhichOneof(self, oneof_group: typing_extensions.Literal["payload", b"payload"]) -> typing_extensions.Literal["setSessionId", "heartbeat", "ok", "capabilities", "batch", "streamControl", "getBoardsRequest", "getBoardsResponse", "putBoardsRequest", "putBoardsResponse", "getFirmwareRequest", "getFirmwareResponse", "putFirmwareRequest", "putFirmwareResponse", "flashRequest", "flashResponse", "deviceUpdateStatus", "fileUpload", "debuggerStart", "debuggerStarted", "debuggerStop", "debuggerLine", "deleteFile", "test", "error"] | None: ...
 
 global___GenericMessage = GenericMessage
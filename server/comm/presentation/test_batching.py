@@ -0,0 +1,95 @@
+import time
+import unittest
+from queue import Queue
+
+from .batching import BatchingMessenger
+from .messenger import IMessageClient
+from .protocol_messenger import ProtocolMessenger
+from .protocol_pb2 import GenericMessage, TestMessage
+from .wire import MessageHeader
+from ..connection import ConnectionState
+from ..transport.test_transport import LoopbackTransport
+from ..transport.transport import Transport
+
+
+class Client(IMessageClient):
+    def __init__(self):
+        self.queue: Queue[GenericMessage] = Queue()
+        self.frames = 0
+
+    def on_message_received(self, message: GenericMessage):
+        self.queue.put(message)
+
+    def accepts_message(self, header: MessageHeader) -> bool:
+        self.frames += 1
+        return True
+
+    def on_state_changed(self, state: ConnectionState):
+        pass
+
+
+class BatchingTests(unittest.TestCase):
+    @staticmethod
+    def loopback(client: Client, **limits) -> BatchingMessenger:
+        return BatchingMessenger.Builder(
+            messenger=ProtocolMessenger.Builder(
+                transport=Transport.Builder(
+                    transport=LoopbackTransport.Builder())),
+            **limits
+        ).build(client)
+
+    def wait_negotiated(self, messenger: BatchingMessenger):
+        deadline = time.monotonic() + 5.0
+        while not messenger.peer_batching:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_batch(self):
+        client = Client()
+        messenger = self.loopback(client, max_delay=0.05)
+        messenger.reconnect()
+        self.wait_negotiated(messenger)
+
+        sent = [messenger.send(GenericMessage(
+                    test=TestMessage(value=f"message {i}")))
+                for i in range(20)]
+
+        for i in range(20):
+            received = client.queue.get(timeout=5.0)
+            self.assertEqual(f"message {i}", received.test.value)
+
+        for outgoing in sent:
+            outgoing.future.result(timeout=5.0)
+
+        self.assertLess(client.frames, 20)
+
+    def test_limits(self):
+        client = Client()
+        messenger = self.loopback(client, max_bytes=64, max_delay=10.0)
+        messenger.reconnect()
+        self.wait_negotiated(messenger)
+
+        # Above half of max_bytes, sent on its own
+        large = GenericMessage(test=TestMessage(value="x" * 64))
+        messenger.send(large).future.result(timeout=5.0)
+        self.assertEqual(large, client.queue.get(timeout=5.0))
+
+        # Flushed by size long before max_delay
+        small = [GenericMessage(test=TestMessage(value=f"{i}" * 20))
+                 for i in range(4)]
+        for message in small:
+            messenger.send(message)
+        self.assertEqual(small[0], client.queue.get(timeout=5.0))
+
+    def test_not_negotiated(self):
+        client = Client()
+        messenger = self.loopback(client)
+
+        # Capabilities are only exchanged after connecting
+        message = GenericMessage(test=TestMessage(value="value"))
+        messenger.send(message)
+        self.assertEqual(message, client.queue.get(timeout=5.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,7 @@ import unittest
 from queue import Empty, Queue
 from typing import List
 
-from .messenger import IMessageClient, IOutgoingMessage
+from .messenger import IMessageClient, IOutgoingMessage, Messenger
 from .protocol_messenger import ProtocolMessenger
 from .protocol_pb2 import GenericMessage, TestMessage
 from ..transport.test_transport import LoopbackTransport
@@ -19,6 +19,24 @@ class MessageLoopbackTest(unittest.TestCase):
         logging.basicConfig(stream=sys.stdout, level=logging.DEBUG)
 
     def test_loopback_send_received(self):
+        self.loopback_send_received(
+            ProtocolMessenger.Builder(
+                transport=Transport.Builder(
+                    transport=LoopbackTransport.Builder())
+            )
+        )
+
+    def test_fused_loopback_send_received(self):
+        self.loopback_send_received(
+            Messenger.Builder(
+                messenger=ProtocolMessenger.Builder(
+                    transport=Transport.Builder(
+                        transport=LoopbackTransport.Builder())
+                )
+            ).set_fused("Fused")
+        )
+
+    def loopback_send_received(self, builder):
         test_self = self
         queue: Queue[GenericMessage] = Queue()
 
@@ -35,9 +53,7 @@ class MessageLoopbackTest(unittest.TestCase):
                 test_self.fail("on_error():")
 
         client = Client()
-        messenger = ProtocolMessenger.Builder(
-            transport=Transport.Builder(transport=LoopbackTransport.Builder())
-        ).build(client)
+        messenger = builder.build(client)
         messages: List[IOutgoingMessage] = []
 
         for i in range(10):
@@ -54,6 +70,8 @@ class MessageLoopbackTest(unittest.TestCase):
             self.assertIsNotNone(received)
             logging.info(f"test: Dequeued {received}")
             self.assertEqual(received, message.message)
+            # Kept for every in-flight message, must stay slotted
+            self.assertFalse(hasattr(message, "__dict__"))
 
         try:
             queue.get(timeout=1.0)
@@ -0,0 +1,133 @@
+import threading
+import time
+import unittest
+from queue import Queue
+from typing import List, Optional
+
+from .messenger import IMessageClient
+from .multiplexing import (
+    STREAM_BULK,
+    STREAM_INTERACTIVE,
+    MultiplexingMessenger,
+)
+from .protocol_messenger import ProtocolMessenger
+from .protocol_pb2 import DebuggerLine, FileUpload, GenericMessage
+from ..connection import ConnectionState
+from ..transport.test_transport import LoopbackTransport
+from ..transport.transport import ITransportBuilder, Runner, Transport
+
+
+class GatedTransport(LoopbackTransport):
+    """Loops packets back once opened"""
+
+    def __init__(self, client):
+        super().__init__(client)
+        self._lock = threading.RLock()
+        self.opened = False
+
+    def pump_pending_messages(self):
+        with self._lock:
+            if self.opened:
+                super().pump_pending_messages()
+
+    def open(self):
+        with self._lock:
+            self.opened = True
+            super().pump_pending_messages()
+
+    class Builder(ITransportBuilder):
+        def __init__(self):
+            super().__init__()
+            self.transport: Optional[GatedTransport] = None
+
+        def construct(self, client, runner: Optional[Runner] = None):
+            self.transport = GatedTransport(client)
+            self.transport.reconnect()
+            return self.transport
+
+
+class Client(IMessageClient):
+    def __init__(self):
+        self.queue: Queue[GenericMessage] = Queue()
+
+    def on_message_received(self, message: GenericMessage):
+        self.queue.put(message)
+
+    def on_state_changed(self, state: ConnectionState):
+        pass
+
+
+class MultiplexingTests(unittest.TestCase):
+    @staticmethod
+    def upload(part: int) -> GenericMessage:
+        return GenericMessage(fileUpload=FileUpload(
+            part=FileUpload.Part(partNo=part, chunk=b"x" * 1024)))
+
+    @staticmethod
+    def line(value: str) -> GenericMessage:
+        return GenericMessage(debuggerLine=DebuggerLine(line=value))
+
+    def receive(self, client: Client, count: int) -> List[GenericMessage]:
+        return [client.queue.get(timeout=5.0) for _ in range(count)]
+
+    def test_interleaved(self):
+        client = Client()
+        gate = GatedTransport.Builder()
+        messenger = MultiplexingMessenger.Builder(
+            messenger=ProtocolMessenger.Builder(
+                transport=Transport.Builder(transport=gate)),
+            # One message at a time
+            max_in_flight_bytes=1,
+        ).build(client)
+
+        sent = [messenger.send(self.upload(part)) for part in range(4)]
+        sent += [messenger.send(self.line(f"{i}")) for i in range(5)]
+        # Let all of them reach the stream queues
+        time.sleep(0.2)
+        gate.transport.open()
+
+        received = self.receive(client, 9)
+        for outgoing in sent:
+            outgoing.future.result(timeout=5.0)
+
+        order = [(message.stream, message.WhichOneof("payload"))
+                 for message in received]
+        upload = (STREAM_BULK, "fileUpload")
+        line = (STREAM_INTERACTIVE, "debuggerLine")
+        # First part was in flight, then 4 lines to 1 part
+        self.assertEqual([upload] + [line] * 4 + [upload] + [line]
+                         + [upload] * 2, order)
+
+        # Ordered within a stream
+        self.assertEqual([0, 1, 2, 3], [message.fileUpload.part.partNo
+                                        for message in received
+                                        if message.stream == STREAM_BULK])
+        self.assertEqual(["0", "1", "2", "3", "4"],
+                         [message.debuggerLine.line for message in received
+                          if message.stream == STREAM_INTERACTIVE])
+
+    def test_stream_kept(self):
+        client = Client()
+        messenger = MultiplexingMessenger.Builder(
+            messenger=ProtocolMessenger.Builder(
+                transport=Transport.Builder(
+                    transport=LoopbackTransport.Builder()))
+        ).build(client)
+
+        # Responses travel on the stream of their request
+        message = GenericMessage(response=1, stream=STREAM_INTERACTIVE)
+        message.ok.SetInParent()
+        messenger.send(message)
+
+        self.assertEqual(STREAM_INTERACTIVE,
+                         self.receive(client, 1)[0].stream)
+
+    def test_weight_checked(self):
+        with self.assertRaises(ValueError):
+            MultiplexingMessenger.Builder().set_weight(STREAM_BULK, 0)
+        with self.assertRaises(ValueError):
+            MultiplexingMessenger.Builder(weights={STREAM_BULK: -1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from queue import Empty, Queue
+
+from google.protobuf.empty_pb2 import Empty as EmptyProto
+
+from .messenger import IMessageClient
+from .protocol_messenger import ProtocolMessenger
+from .protocol_pb2 import FileUpload, GenericMessage, TestMessage
+from .wire import HeaderError, MessageHeader, peek_header
+from ..connection import ConnectionState
+from ..transport.test_transport import LoopbackTransport
+from ..transport.transport import Transport
+
+
+class PeekHeaderTests(unittest.TestCase):
+    def assertHeader(self, message: GenericMessage):
+        header = peek_header(message.SerializeToString())
+
+        self.assertEqual(message.sessionId, header.session_id)
+        kind = message.WhichOneof("id")
+        self.assertEqual(message.request if kind == "request" else None,
+                         header.request)
+        self.assertEqual(message.response if kind == "response" else None,
+                         header.response)
+        self.assertEqual(message.WhichOneof("payload"), header.payload)
+
+    def test_messages(self):
+        self.assertHeader(GenericMessage())
+        self.assertHeader(GenericMessage(heartbeat=EmptyProto()))
+        self.assertHeader(GenericMessage(sessionId=7, request=300,
+                                         ok=EmptyProto()))
+        self.assertHeader(GenericMessage(sessionId=2 ** 40, response=1,
+                                         test=TestMessage(value="value")))
+
+    def test_large_payload(self):
+        chunk = bytes(range(256)) * 1024
+        message = GenericMessage(
+            sessionId=3, request=5,
+            fileUpload=FileUpload(part=FileUpload.Part(partNo=1,
+                                                        chunk=chunk)))
+
+        self.assertHeader(message)
+        self.assertEqual(MessageHeader(3, 5, None, 203),
+                         peek_header(memoryview(message.SerializeToString())))
+
+    def test_malformed(self):
+        data = GenericMessage(
+            sessionId=1, test=TestMessage(value="value")).SerializeToString()
+
+        with self.assertRaises(HeaderError):
+            peek_header(data[:-1])
+        with self.assertRaises(HeaderError):
+            peek_header(b"\xff")
+
+
+class AcceptsMessageTests(unittest.TestCase):
+    def test_drop_before_parse(self):
+        queue: Queue[GenericMessage] = Queue()
+
+        class Client(IMessageClient):
+            def on_message_received(self, message: GenericMessage):
+                queue.put(message)
+
+            def accepts_message(self, header: MessageHeader) -> bool:
+                return header.session_id == 1
+
+            def on_state_changed(self, state: ConnectionState):
+                pass
+
+        messenger = ProtocolMessenger.Builder(
+            transport=Transport.Builder(transport=LoopbackTransport.Builder())
+        ).build(Client())
+
+        messenger.send(GenericMessage(sessionId=2, ok=EmptyProto()))
+        messenger.send(GenericMessage(sessionId=1, ok=EmptyProto()))
+
+        self.assertEqual(1, queue.get(timeout=5.0).sessionId)
+        with self.assertRaises(Empty):
+            queue.get(timeout=0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from .protocol_pb2 import GenericMessage
+
+_SESSION_ID_FIELD = GenericMessage.DESCRIPTOR.fields_by_name["sessionId"].number
+_REQUEST_FIELD = GenericMessage.DESCRIPTOR.fields_by_name["request"].number
+_RESPONSE_FIELD = GenericMessage.DESCRIPTOR.fields_by_name["response"].number
+
+# Payload field number to the name returned by `WhichOneof("payload")`
+PAYLOAD_FIELDS: Dict[int, str] = {
+    field.number: field.name
+    for field in GenericMessage.DESCRIPTOR.oneofs_by_name["payload"].fields
+}
+
+_VARINT = 0
+_FIXED64 = 1
+_LENGTH_DELIMITED = 2
+_FIXED32 = 5
+
+
+class HeaderError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class MessageHeader(object):
+    """Envelope fields of a serialized `GenericMessage`"""
+    session_id: int = 0
+    request: Optional[int] = None
+    response: Optional[int] = None
+    payload_field: Optional[int] = None
+
+    @property
+    def payload(self) -> Optional[str]:
+        if self.payload_field is None:
+            return None
+        return PAYLOAD_FIELDS.get(self.payload_field)
+
+
+def _read_varint(data, pos: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise HeaderError("Truncated varint")
+
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+
+        shift += 7
+        if shift >= 64:
+            raise HeaderError("Varint too long")
+
+
+def peek_header(data) -> MessageHeader:
+    """Reads `MessageHeader` straight from the wire without parsing the
+    payload, which is skipped over by its length"""
+    session_id = 0
+    request = None
+    response = None
+    payload_field = None
+
+    pos = 0
+    while pos < len(data):
+        tag, pos = _read_varint(data, pos)
+        field, wire_type = tag >> 3, tag & 0x7
+
+        if wire_type == _VARINT:
+            value, pos = _read_varint(data, pos)
+            if field == _SESSION_ID_FIELD:
+                session_id = value
+            elif field == _REQUEST_FIELD:
+                request, response = value, None
+            elif field == _RESPONSE_FIELD:
+                request, response = None, value
+
+        elif wire_type == _LENGTH_DELIMITED:
+            size, pos = _read_varint(data, pos)
+            pos += size
+            if field in PAYLOAD_FIELDS:
+                payload_field = field
+
+        elif wire_type == _FIXED64:
+            pos += 8
+        elif wire_type == _FIXED32:
+            pos += 4
+        else:
+            raise HeaderError(f"Unsupported wire type {wire_type}")
+
+    if pos != len(data):
+        raise HeaderError("Truncated field")
+
+    return MessageHeader(session_id, request, response, payload_field)
@@ -1,14 +1,17 @@
 import functools
+import heapq
 import itertools
 import logging
 import time
 from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict
 from concurrent.futures import Future
-from typing import Optional, List, Dict
+from typing import Callable, Optional, List, Dict, Set, Tuple, Union
 
 from google.protobuf.empty_pb2 import Empty as EmptyProto
 
-from ...tasker import Tasker, Runner
+from ... import tracing
+from ...tasker import Priority, Tasker, Runner
 from ..connection import (
     IConnection,
     IConnectionClient,
@@ -20,23 +23,64 @@ from ..presentation.messenger import (
     IMessageClient,
     IOutgoingMessage,
     IMessengerBuilder,
+    message_priority,
 )
+from ..presentation.wire import MessageHeader
 from ..presentation.protocol_pb2 import (
     GenericMessage,
     ErrorMessage,
-    SetSessionId
+    SetSessionId,
+    StreamControl,
 )
 
 
+class RequestTimeoutError(TimeoutError):
+    """Response to a request did not arrive before its deadline"""
+
+
+class IResponseStream(ABC):
+    """Returned from `ISessionClient.on_request()` in place of a future to
+    answer with partial responses"""
+
+    @abstractmethod
+    def pull(self) -> Future[GenericMessage]:
+        """Next partial response, fails with `StopIteration` or
+        `StopAsyncIteration` once there are no more"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def close(self):
+        raise NotImplementedError
+
+
 class ISession(IConnection, ABC):
     @abstractmethod
-    def request(self, request: GenericMessage) -> Future[GenericMessage]:
+    def request(self, request: GenericMessage,
+                timeout: Optional[float] = None) -> Future[GenericMessage]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def request_stream(self, request: GenericMessage,
+                       on_partial: Callable[[GenericMessage], None],
+                       credits: int,
+                       timeout: Optional[float] = None
+                       ) -> Future[GenericMessage]:
+        """Like `request()`, partial responses are passed to `on_partial`
+        and the future completes with the last one. `timeout` bounds the
+        wait for each of them."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def control_stream(self, request_id: int, credits: int = 0,
+                       cancel: bool = False):
         raise NotImplementedError
 
 
 class ISessionClient(IConnectionClient, ABC):
     @abstractmethod
-    def on_request(self, request: GenericMessage) -> Future[GenericMessage]:
+    def on_request(
+        self, request: GenericMessage
+    ) -> Union[Future[GenericMessage], IResponseStream]:
         raise NotImplementedError
 
 
@@ -53,17 +97,54 @@ class ISessionBuilder(IConnectionBuilder, ABC):
 
 class Session(ISession, Tasker):
     HEARTBEAT_S = 0.5
+    # Idle time before a heartbeat doubles up to this while the link is
+    # quiet
+    MAX_HEARTBEAT_S = 4.0
     TIMEOUT_S = 32 * HEARTBEAT_S
+    # Weight of a new sample in the smoothed round trip time
+    RTT_GAIN = 1 / 8
+    # Transfers within this window update the timestamp only once
+    TRANSFER_COALESCE_S = HEARTBEAT_S / 10
+    # Default time to wait for a response, None waits until answered
+    REQUEST_TIMEOUT_S: Optional[float] = None
+    # Responses kept for answering retried requests
+    RESPONSE_CACHE_SIZE = 64
+    RESPONSE_CACHE_TTL_S = 4 * TIMEOUT_S
 
     def __init__(self, messenger_builder: IMessengerBuilder,
                  session_id: int,
                  client: ISessionClient,
-                 runner: Optional[Runner] = None):
+                 runner: Optional[Runner] = None,
+                 request_timeout: Optional[float] = None):
         Tasker.__init__(self, runner=runner)
         self.session_id: Optional[int] = session_id
+        self.request_timeout: Optional[float] = \
+            request_timeout or Session.REQUEST_TIMEOUT_S
         self._posted_heartbeat: Optional[Future[GenericMessage]] = None
         self._last_transfer = time.monotonic()
+        self.heartbeat_interval = Session.HEARTBEAT_S
+        self._keepalive_at: Optional[float] = None
+        # Smoothed round trip time of heartbeats, None until measured
+        self.rtt: Optional[float] = None
         self.waiting_for_response: Dict[int, Session.PendingMessage] = {}
+        # (deadline, request id), one entry per request with a deadline.
+        # Entries of answered requests are dropped once they reach the top,
+        # extended ones are pushed back with their new deadline.
+        self._deadlines: List[Tuple[float, int]] = []
+        self._next_expiry: Optional[float] = None
+        # Requests that timed out, by payload
+        self.expired_requests: Counter[str] = Counter()
+        # Request id to (expiry, response), least recently used first
+        self._responses: OrderedDict[int, Tuple[float, GenericMessage]] = \
+            OrderedDict()
+        # Requests handed to the client and not answered yet
+        self._executing: Set[int] = set()
+        self.response_cache_size = Session.RESPONSE_CACHE_SIZE
+        self.response_cache_ttl = Session.RESPONSE_CACHE_TTL_S
+        # Retried requests answered from the cache, by payload
+        self.cached_responses: Counter[str] = Counter()
+        # Streamed responses being sent, by request id
+        self._streams: Dict[int, Session.ResponseStream] = {}
         self._next_request_id = itertools.count()
         self._queue: List[Session.PendingMessage] = []
 
@@ -75,7 +156,8 @@ class Session(ISession, Tasker):
     def state(self) -> ConnectionState:
         return self._messenger.state
 
-    def request(self, request: GenericMessage) -> Future[GenericMessage]:
+    def request(self, request: GenericMessage,
+                timeout: Optional[float] = None) -> Future[GenericMessage]:
         logging.debug("request():")
 
         header = GenericMessage(request=next(self._next_request_id))
@@ -85,11 +167,55 @@ class Session(ISession, Tasker):
         request.MergeFrom(header)
 
         pending = Session.PendingMessage(self, True, request)
-        self._queue.append(pending)
-        self._pump_messages()
+        pending.set_timeout(timeout or self.request_timeout)
+        self._enqueue(pending)
+
+        return pending.future
+
+    def request_stream(self, request: GenericMessage,
+                       on_partial: Callable[[GenericMessage], None],
+                       credits: int,
+                       timeout: Optional[float] = None
+                       ) -> Future[GenericMessage]:
+        assert credits > 0
+        logging.debug("request_stream():")
+
+        header = GenericMessage(request=next(self._next_request_id),
+                                credits=credits)
+        if self.session_id is not None:
+            header.sessionId = self.session_id
+
+        request.MergeFrom(header)
+
+        pending = Session.PendingMessage(self, True, request)
+        pending.on_partial = on_partial
+        pending.set_timeout(timeout or self.request_timeout)
+        self._enqueue(pending)
 
         return pending.future
 
+    def control_stream(self, request_id: int, credits: int = 0,
+                       cancel: bool = False):
+        message = GenericMessage(streamControl=StreamControl(
+            request=request_id, credits=credits, cancel=cancel))
+        if self.session_id is not None:
+            message.sessionId = self.session_id
+
+        if cancel:
+            self._cancel_request(request_id)
+        self._enqueue(Session.PendingMessage(self, False, message))
+
+    @Tasker.handler()
+    def _cancel_request(self, request_id: int):
+        pending = self.waiting_for_response.pop(request_id, None)
+        if pending is not None:
+            pending.future.cancel()
+
+    def _enqueue(self, pending: "Session.PendingMessage"):
+        priority = message_priority(pending.message)
+        self._queue.append(pending)
+        self._pump_messages(priority=priority)
+
     @Tasker.handler()
     def reconnect(self):
         self._messenger.reconnect()
@@ -116,78 +242,333 @@ class Session(ISession, Tasker):
         while self._queue:
             pending = self._queue.pop(0)
 
-            if pending.is_request:
-                assert pending.id not in self.waiting_for_response
-                self.waiting_for_response[pending.id] = pending
+            with tracing.span("Session._pump_messages", "session",
+                              message=pending.message):
+                if pending.is_request:
+                    assert pending.id not in self.waiting_for_response
+                    self.waiting_for_response[pending.id] = pending
+                    if pending.deadline is not None:
+                        self._track_deadline(pending)
+
+                outgoing = self._messenger.send(pending.message)
+                pending.set_outgoing_message(outgoing)
+
+    @Tasker.assert_executor()
+    def _track_deadline(self, pending: "Session.PendingMessage"):
+        assert pending.deadline is not None
+        heapq.heappush(self._deadlines, (pending.deadline, pending.id))
+        self._schedule_expiry()
+
+    @Tasker.assert_executor()
+    def _schedule_expiry(self):
+        if not self._deadlines:
+            return
+
+        deadline = self._deadlines[0][0]
+        if self._next_expiry is not None and self._next_expiry <= deadline:
+            # Already going to wake up in time
+            return
+
+        self._next_expiry = deadline
+        self._expire_requests(
+            timeout=max(0.0, deadline - time.monotonic()),
+            force_schedule=True)
+
+    @Tasker.handler(priority=Priority.HIGH)
+    def _expire_requests(self):
+        now = time.monotonic()
+        if self._next_expiry is not None and self._next_expiry <= now:
+            self._next_expiry = None
+
+        while self._deadlines and self._deadlines[0][0] <= now:
+            _, request_id = heapq.heappop(self._deadlines)
+            pending = self.waiting_for_response.get(request_id)
+            if pending is None:
+                # Answered in time
+                continue
+            if pending.deadline > now:
+                # Extended by a partial response
+                heapq.heappush(self._deadlines,
+                               (pending.deadline, request_id))
+                continue
+
+            del self.waiting_for_response[request_id]
+            payload = pending.message.WhichOneof("payload")
+            logging.warning(f"_expire_requests(): Request id={request_id} "
+                            f"payload={payload} timed out")
+            self.expired_requests[payload] += 1
+            pending.future.set_exception(RequestTimeoutError(
+                f"No response to {payload} request id={request_id}"))
+
+        self._schedule_expiry()
+
+    @Tasker.assert_executor()
+    def _schedule_keepalive(self, at: float):
+        if self._keepalive_at is not None and self._keepalive_at <= at:
+            # Already going to wake up in time
+            return
 
-            outgoing = self._messenger.send(pending.message)
-            pending.set_outgoing_message(outgoing)
+        self._keepalive_at = at
+        self.timeout_session(timeout=max(0.0, at - time.monotonic()))
 
-    @Tasker.handler(force_schedule=True, guarded=True)
+    @Tasker.handler(force_schedule=True, priority=Priority.HIGH)
     def timeout_session(self):
+        now = time.monotonic()
+        if self._keepalive_at is not None and self._keepalive_at <= now:
+            self._keepalive_at = None
+
         if self.state != ConnectionState.CONNECTED:
             return
 
-        duration = time.monotonic() - self._last_transfer
+        duration = now - self._last_transfer
         logging.debug(
             f"timeout_session(): state={self.state} duration={duration}")
 
-        if duration > Session.TIMEOUT_S:
+        if duration >= Session.TIMEOUT_S:
             logging.error("timeout_session(): Session timeout")
             self.reconnect()
             return
 
-        self.timeout_session(timeout=Session.TIMEOUT_S)
+        heartbeat_pending = (
+            self._posted_heartbeat is not None
+            and not self._posted_heartbeat.done()
+        )
+        if duration >= self.heartbeat_interval and not heartbeat_pending:
+            self._send_heartbeat()
+            heartbeat_pending = True
+
+        if heartbeat_pending:
+            # Answer re-arms, otherwise wake up to time out
+            self._schedule_keepalive(self._last_transfer + Session.TIMEOUT_S)
+        else:
+            self._schedule_keepalive(
+                self._last_transfer + self.heartbeat_interval)
 
-        if (
-            duration < Session.HEARTBEAT_S
-            or self._posted_heartbeat is None
-            or not self._posted_heartbeat.done()
-        ):
+    @Tasker.assert_executor()
+    def _send_heartbeat(self):
+        logging.debug("_send_heartbeat(): "
+                      f"interval={self.heartbeat_interval}")
+        self._posted_heartbeat = self.request(
+            GenericMessage(heartbeat=EmptyProto()), timeout=Session.TIMEOUT_S)
+        self._posted_heartbeat.add_done_callback(
+            functools.partial(self._on_heartbeat_done, time.monotonic()))
+
+    @Tasker.handler(priority=Priority.HIGH)
+    def _on_heartbeat_done(self, sent: float,
+                           response: Future[GenericMessage]):
+        if response.cancelled() or response.exception() is not None:
+            # Left for timeout_session() to time out
             return
 
-        self._posted_heartbeat = self.request(
-            GenericMessage(heartbeat=EmptyProto()))
+        sample = time.monotonic() - sent
+        if self.rtt is None:
+            self.rtt = sample
+        else:
+            self.rtt += Session.RTT_GAIN * (sample - self.rtt)
 
-    @Tasker.handler()
+        # Link is quiet, wait longer for the next one
+        self.heartbeat_interval = min(2 * self.heartbeat_interval,
+                                      Session.MAX_HEARTBEAT_S)
+        self._schedule_keepalive(time.monotonic() + self.heartbeat_interval)
+
+    @Tasker.assert_executor()
+    def _on_activity(self):
+        """Traffic other than heartbeats, keeps the next heartbeat close"""
+        if self.heartbeat_interval == Session.HEARTBEAT_S:
+            return
+
+        self.heartbeat_interval = Session.HEARTBEAT_S
+        self._schedule_keepalive(time.monotonic() + self.heartbeat_interval)
+
+    @Tasker.handler(priority=Priority.HIGH, coalesce=TRANSFER_COALESCE_S)
     def update_last_transfer(self):
+        """Any frame received from the peer proves the link is alive"""
         logging.debug(f"update_last_transfer(): state={self.state}")
         self._last_transfer = time.monotonic()
-        self.timeout_session(timeout=Session.HEARTBEAT_S)
+        if self._keepalive_at is None:
+            self._schedule_keepalive(
+                self._last_transfer + self.heartbeat_interval)
 
     @Tasker.handler()
     def on_request_done(self, request_id: int,
-                        response: Future[GenericMessage]):
+                        response: Future[GenericMessage],
+                        stream: int = 0):
         logging.debug(f"on_request_done(): request_id={request_id}")
 
         exception = response.exception()
         if exception is not None:
             logging.error("on_request_done() exception", exc_info=exception)
-            message = GenericMessage()
-            if self.session_id is not None:
-                message.sessionId = self.session_id
-            message.response = request_id
-            message.error.CopyFrom(ErrorMessage(description=str(exception)))
+            message = GenericMessage(
+                error=ErrorMessage(description=str(exception)))
         else:
             message = GenericMessage()
             message.CopyFrom(response.result())
-            if self.session_id is not None:
-                message.sessionId = self.session_id
-            message.response = request_id
-            message.ClearField("request")
 
-        logging.debug(f"on_request_done(): request_id={request_id} "
-                      f"response={message.WhichOneof('payload')}")
-        self._queue.append(Session.PendingMessage(self, False, message))
-        self._pump_messages()
+        self._respond(request_id, message, stream)
+
+    @Tasker.assert_executor()
+    def _respond(self, request_id: int, message: GenericMessage,
+                 stream: int = 0, more: bool = False):
+        if self.session_id is not None:
+            message.sessionId = self.session_id
+        message.response = request_id
+        if stream:
+            message.stream = stream
+        message.more = more
+
+        logging.debug(f"_respond(): request_id={request_id} "
+                      f"response={message.WhichOneof('payload')} more={more}")
+        if not more and request_id in self._executing:
+            self._executing.discard(request_id)
+            self._cache_response(message)
+
+        self._enqueue(Session.PendingMessage(self, False, message))
+
+    @Tasker.assert_executor()
+    def _start_stream(self, request: GenericMessage,
+                      responses: IResponseStream):
+        stream = Session.ResponseStream(request, responses)
+        self._streams[stream.request_id] = stream
+        self._pull_stream(stream)
+
+    @Tasker.assert_executor()
+    def _pull_stream(self, stream: "Session.ResponseStream"):
+        if stream.pulling or stream.credits == 0:
+            return
+
+        stream.pulling = True
+        stream.responses.pull().add_done_callback(
+            functools.partial(self._on_stream_pulled, stream))
+
+    @Tasker.handler()
+    def _on_stream_pulled(self, stream: "Session.ResponseStream",
+                          pulled: Future[GenericMessage]):
+        stream.pulling = False
+        if self._streams.get(stream.request_id) is not stream:
+            # Cancelled meanwhile
+            stream.responses.close()
+            return
+
+        exception = pulled.exception()
+        if isinstance(exception, (StopIteration, StopAsyncIteration)):
+            del self._streams[stream.request_id]
+            if stream.credits is None:
+                # Requester does not accept partial responses, answer with
+                # the last one
+                last = stream.last or GenericMessage(ok=EmptyProto())
+            else:
+                # End of stream, no payload
+                last = GenericMessage()
+            self._respond(stream.request_id, last, stream.stream)
+            return
+
+        if exception is not None:
+            del self._streams[stream.request_id]
+            future: Future[GenericMessage] = Future()
+            future.set_exception(exception)
+            self.on_request_done(stream.request_id, future, stream.stream)
+            return
+
+        if stream.credits is None:
+            stream.last = pulled.result()
+        else:
+            stream.credits -= 1
+            self._respond(stream.request_id, pulled.result(), stream.stream,
+                          more=True)
+
+        self._pull_stream(stream)
+
+    @Tasker.handler(priority=Priority.HIGH)
+    def _on_stream_control(self, control: StreamControl):
+        stream = self._streams.get(control.request)
+        if stream is None:
+            logging.debug("_on_stream_control(): No stream for "
+                          f"id={control.request}")
+            return
+
+        if control.cancel:
+            logging.debug(f"_on_stream_control(): id={control.request} "
+                          "cancelled")
+            del self._streams[control.request]
+            self._executing.discard(control.request)
+            if not stream.pulling:
+                stream.responses.close()
+            return
+
+        if stream.credits is not None:
+            stream.credits += control.credits
+        self._pull_stream(stream)
+
+    @Tasker.assert_executor()
+    def _cache_response(self, response: GenericMessage):
+        expiry = time.monotonic() + self.response_cache_ttl
+        # Layers below stamp the sent message, keep a pristine copy
+        cached = GenericMessage()
+        cached.CopyFrom(response)
+        self._responses[response.response] = (expiry, cached)
+        while len(self._responses) > self.response_cache_size:
+            self._responses.popitem(last=False)
+
+    @Tasker.assert_executor()
+    def _retry_request(self, request: GenericMessage) -> bool:
+        """Answers a request seen before without running it again"""
+        request_id = request.request
+        if request_id in self._executing:
+            logging.debug(f"_retry_request(): id={request_id} still running")
+            return True
+
+        entry = self._responses.get(request_id)
+        if entry is None:
+            return False
+
+        expiry, cached = entry
+        if expiry <= time.monotonic():
+            del self._responses[request_id]
+            return False
+
+        self._responses.move_to_end(request_id)
+        logging.debug(f"_retry_request(): id={request_id} answered from cache")
+        self.cached_responses[request.WhichOneof("payload")] += 1
+
+        response = GenericMessage()
+        response.CopyFrom(cached)
+        self._enqueue(Session.PendingMessage(self, False, response))
+        return True
+
+    class ResponseStream(object):
+        __slots__ = ("request_id", "stream", "responses", "credits",
+                     "pulling", "last")
+
+        def __init__(self, request: GenericMessage,
+                     responses: IResponseStream):
+            self.request_id: int = request.request
+            self.stream: int = request.stream
+            self.responses: IResponseStream = responses
+            # None when only a single response is accepted
+            self.credits: Optional[int] = request.credits or None
+            self.pulling = False
+            self.last: Optional[GenericMessage] = None
 
     class PendingMessage(object):
+        __slots__ = ("_session", "is_request", "message", "_outgoing",
+                     "future", "deadline", "timeout", "on_partial")
+
         def __init__(self, session, is_request, message):
             self._session: Session = session
             self.is_request: bool = is_request
             self.message: GenericMessage = message
             self._outgoing: Optional[IOutgoingMessage] = None
             self.future: Future[GenericMessage] = Future()
+            # Both None for requests waiting until answered
+            self.deadline: Optional[float] = None
+            self.timeout: Optional[float] = None
+            self.on_partial: Optional[
+                Callable[[GenericMessage], None]] = None
+
+        def set_timeout(self, timeout: Optional[float]):
+            self.timeout = timeout
+            if timeout is not None:
+                self.deadline = time.monotonic() + timeout
 
         @property
         def id(self) -> int:
@@ -201,13 +582,6 @@ class Session(ISession, Tasker):
             logging.debug("set_outgoing_message():")
             assert self._outgoing is None
             self._outgoing = outgoing
-            outgoing.future.add_done_callback(self._on_response)
-
-        def _on_response(self, future: Future):
-            logging.debug("_on_response():")
-            assert self._outgoing and self._outgoing.future == future
-            if future.exception() is None:
-                self._session.update_last_transfer()
 
     class Client(IMessageClient, Tasker):
         def __init__(self, session, client):
@@ -221,16 +595,41 @@ class Session(ISession, Tasker):
             assert self._session.is_tasker_thread()
             logging.debug(f"_on_response(): id={response.response}")
 
-            pending = self._session.waiting_for_response.pop(response.response)
+            if response.more:
+                self._on_partial_response(response)
+                return
+
+            pending = self._session.waiting_for_response.pop(
+                response.response, None)
             if pending is None:
                 logging.warning("_on_response(): Received a response for "
-                                f"non existing request id={response.response}")
+                                "non existing or expired request "
+                                f"id={response.response}")
                 return
 
+            if pending.message.WhichOneof("payload") != "heartbeat":
+                self._session._on_activity()
+
             logging.debug(
                 f"_on_response(): Completing request id={response.response}")
             pending.future.set_result(response)
 
+        @Tasker.assert_executor()
+        def _on_partial_response(self, response: GenericMessage):
+            pending = self._session.waiting_for_response.get(
+                response.response)
+            if pending is None or pending.on_partial is None:
+                logging.warning("_on_partial_response(): Received a partial "
+                                "response for non streamed request "
+                                f"id={response.response}")
+                return
+
+            if pending.timeout is not None:
+                # Its heap entry is moved once the old deadline is reached
+                pending.deadline = time.monotonic() + pending.timeout
+            self._session._on_activity()
+            pending.on_partial(response)
+
         @Tasker.assert_executor()
         def _on_request(self, request: GenericMessage):
             assert self._session.is_tasker_thread()
@@ -243,19 +642,43 @@ class Session(ISession, Tasker):
                     f"_on_request(): Received request id={request.request}")
                 future: Future[GenericMessage] = Future()
                 future.set_result(response)
-                self._session.on_request_done(request.request, future)
+                self._session.on_request_done(request.request, future,
+                                              request.stream)
+                return
+
+            self._session._on_activity()
+            if self._session._retry_request(request):
                 return
 
             logging.debug("_on_request(): Deferring request to client")
 
+            self._session._executing.add(request.request)
             future = self._client.on_request(request)
+            if isinstance(future, IResponseStream):
+                self._session._start_stream(request, future)
+                return
+
             future.add_done_callback(
                 functools.partial(
-                    self._session.on_request_done, request.request)
+                    self._session.on_request_done, request.request,
+                    stream=request.stream)
             )
 
-        @Tasker.handler()
+        def accepts_message(self, header: MessageHeader) -> bool:
+            # session_id is fixed once constructed, safe to read from the
+            # thread of the layer below
+            session_id = self._session.session_id
+            return session_id is None or header.session_id == session_id
+
+        @Tasker.handler(
+            priority=lambda self, message: message_priority(message))
         def on_message_received(self, message: GenericMessage):
+            with tracing.span("Session.on_message_received", "session",
+                              message=message):
+                self._on_message_received(message)
+
+        @Tasker.assert_executor()
+        def _on_message_received(self, message: GenericMessage):
             logging.debug("on_message_received(): "
                           f"message={message.WhichOneof('payload')}")
 
@@ -287,6 +710,8 @@ class Session(ISession, Tasker):
                     logging.warning(
                         "on_message_received(): Received a response")
                     self._on_response(message)
+                elif message.WhichOneof("payload") == "streamControl":
+                    self._session._on_stream_control(message.streamControl)
                 else:
                     logging.warning("on_message_received(): Received a "
                                     "message that is not a request "
@@ -316,14 +741,21 @@ class Session(ISession, Tasker):
             self._client.on_error()
 
     class Builder(ISessionBuilder):
-        def __init__(self, messenger=None, session_id=None, runner=None):
+        def __init__(self, messenger=None, session_id=None, runner=None,
+                     request_timeout: Optional[float] = None):
             super().__init__(runner=runner)
             self._messenger: IMessengerBuilder = messenger
             self._session_id: int = session_id
+            self._request_timeout = request_timeout
 
         def set_messenger(self, messenger: IMessengerBuilder):
             self._messenger = messenger
 
+        def set_request_timeout(self, timeout: Optional[float]):
+            self._request_timeout = timeout
+            return self
+
         def construct(self, client: ISessionClient,
                       runner: Optional[Runner] = None):
-            return Session(self._messenger, self._session_id, client, runner)
+            return Session(self._messenger, self._session_id, client, runner,
+                           self._request_timeout)
@@ -0,0 +1,198 @@
+import time
+import unittest
+from concurrent.futures import Future
+from typing import List
+
+from google.protobuf.empty_pb2 import Empty as EmptyProto
+
+from .session import ISessionClient, RequestTimeoutError, Session
+from ..connection import ConnectionState
+from ..presentation.messenger import Messenger
+from ..presentation.protocol_messenger import ProtocolMessenger
+from ..presentation.protocol_pb2 import GenericMessage, TestMessage
+from ..transport.test_transport import LoopbackTransport
+from ..transport.transport import Transport
+
+
+class Client(ISessionClient):
+    """Answers own requests sent over loopback, holds back `test` ones"""
+
+    def __init__(self):
+        self.held: List[Future[GenericMessage]] = []
+
+    def on_request(self, request: GenericMessage) -> Future[GenericMessage]:
+        future: Future[GenericMessage] = Future()
+        if request.WhichOneof("payload") == "test":
+            self.held.append(future)
+        else:
+            future.set_result(GenericMessage(ok=EmptyProto()))
+        return future
+
+    def on_state_changed(self, state: ConnectionState):
+        pass
+
+
+def loopback(client: Client, **kwargs) -> Session:
+    return Session.Builder(
+        messenger=Messenger.Builder(
+            messenger=ProtocolMessenger.Builder(
+                transport=Transport.Builder(
+                    transport=LoopbackTransport.Builder()))),
+        session_id=1,
+        **kwargs
+    ).build(client)
+
+
+class RequestDeadlineTests(unittest.TestCase):
+    def test_expired(self):
+        client = Client()
+        session = loopback(client)
+        session.reconnect()
+
+        started = time.monotonic()
+        future = session.request(
+            GenericMessage(test=TestMessage(value="value")), timeout=0.2)
+
+        with self.assertRaises(RequestTimeoutError):
+            future.result(timeout=5.0)
+        self.assertGreaterEqual(time.monotonic() - started, 0.2)
+        self.assertEqual(1, session.expired_requests["test"])
+
+        # Response arriving after the deadline is dropped
+        client.held[0].set_result(GenericMessage(ok=EmptyProto()))
+        time.sleep(0.1)
+        self.assertEqual({}, session.waiting_for_response)
+
+    def test_answered_in_time(self):
+        client = Client()
+        session = loopback(client, request_timeout=0.2)
+        session.reconnect()
+
+        answered = session.request(GenericMessage(ok=EmptyProto()))
+        self.assertEqual("ok", answered.result(timeout=5.0)
+                         .WhichOneof("payload"))
+
+        # Earlier deadline of a later request is not missed
+        late = session.request(
+            GenericMessage(test=TestMessage(value="late")), timeout=5.0)
+        early = session.request(
+            GenericMessage(test=TestMessage(value="early")))
+
+        with self.assertRaises(RequestTimeoutError):
+            early.result(timeout=1.0)
+        self.assertFalse(late.done())
+        self.assertEqual(1, session.expired_requests["test"])
+        self.assertNotIn("ok", session.expired_requests)
+
+    def test_no_deadline(self):
+        client = Client()
+        session = loopback(client)
+        session.reconnect()
+
+        # Waits for as long as it takes by default
+        future = session.request(
+            GenericMessage(test=TestMessage(value="value")))
+        self.assertRaises(TimeoutError, future.result, timeout=0.3)
+        pending = next(pending for pending
+                       in session.waiting_for_response.values()
+                       if pending.future is future)
+        self.assertIsNone(pending.deadline)
+
+        client.held[0].set_result(GenericMessage(ok=EmptyProto()))
+        self.assertEqual("ok", future.result(timeout=5.0)
+                         .WhichOneof("payload"))
+
+
+class ResponseCacheTests(unittest.TestCase):
+    @staticmethod
+    def retry(session: Session, request_id: int, payload: str):
+        # Resent under the same request id, as a client does after reconnect
+        session._messenger.send(GenericMessage(
+            sessionId=1, request=request_id, test=TestMessage(value=payload)))
+
+    def wait_for(self, condition):
+        deadline = time.monotonic() + 5.0
+        while not condition():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def run_request(self, session: Session, client: Client,
+                    request_id: int, executed: int):
+        self.retry(session, request_id, "value")
+        self.wait_for(lambda: len(client.held) == executed)
+        client.held[-1].set_result(GenericMessage(ok=EmptyProto()))
+        self.wait_for(lambda: request_id in session._responses)
+
+    def test_retried(self):
+        client = Client()
+        session = loopback(client)
+        session.reconnect()
+
+        self.retry(session, 1000, "value")
+        self.wait_for(lambda: client.held)
+
+        # Still running, answered once done
+        self.retry(session, 1000, "value")
+        client.held[0].set_result(GenericMessage(ok=EmptyProto()))
+        self.wait_for(lambda: 1000 in session._responses)
+
+        self.retry(session, 1000, "value")
+        self.wait_for(lambda: session.cached_responses["test"] == 1)
+        self.assertEqual(1, len(client.held))
+
+    def test_evicted(self):
+        client = Client()
+        session = loopback(client)
+        session.response_cache_size = 1
+        session.reconnect()
+
+        self.run_request(session, client, 1000, executed=1)
+        self.run_request(session, client, 1001, executed=2)
+        # Evicted by 1001, run again
+        self.run_request(session, client, 1000, executed=3)
+        self.assertEqual(0, session.cached_responses["test"])
+
+    def test_expired(self):
+        client = Client()
+        session = loopback(client)
+        session.response_cache_ttl = 0.0
+        session.reconnect()
+
+        self.run_request(session, client, 1000, executed=1)
+        self.run_request(session, client, 1000, executed=2)
+        self.assertEqual(0, session.cached_responses["test"])
+
+
+class KeepaliveTests(unittest.TestCase):
+    def test_suppressed_by_traffic(self):
+        session = loopback(Client())
+        session.reconnect()
+
+        started = time.monotonic()
+        while time.monotonic() - started < 4 * Session.HEARTBEAT_S:
+            session.request(GenericMessage(ok=EmptyProto())) \
+                .result(timeout=5.0)
+            time.sleep(Session.HEARTBEAT_S / 5)
+
+        # No heartbeat was answered
+        self.assertIsNone(session.rtt)
+
+    def test_widened_when_idle(self):
+        session = loopback(Client())
+        session.reconnect()
+
+        deadline = time.monotonic() + 5.0
+        while session.heartbeat_interval < 4 * Session.HEARTBEAT_S:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.05)
+
+        self.assertIsNotNone(session.rtt)
+        self.assertLess(session.rtt, Session.HEARTBEAT_S)
+
+        # Traffic brings heartbeats back to the shortest interval
+        session.request(GenericMessage(ok=EmptyProto())).result(timeout=5.0)
+        self.assertEqual(Session.HEARTBEAT_S, session.heartbeat_interval)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+import itertools
+import threading
+import time
+import unittest
+from typing import AsyncIterator, Iterator, List
+
+from .app import (
+    STREAM_POOL_SIZE,
+    IStreamingRequester,
+    IStreamingResponder,
+    RequestRouter,
+)
+from .presentation.messenger import Messenger
+from .presentation.protocol_messenger import ProtocolMessenger
+from .presentation.protocol_pb2 import GenericMessage, TestMessage
+from .session.session import Session
+from .transport.test_transport import LoopbackTransport
+from .transport.transport import Transport
+
+
+class Count(IStreamingRequester[str]):
+    def __init__(self, value: str):
+        self._value = value
+
+    def prepare(self) -> GenericMessage:
+        return GenericMessage(test=TestMessage(value=self._value))
+
+    @property
+    def response_payload(self) -> str:
+        return "test"
+
+    def handle_response(self, response: GenericMessage) -> str:
+        return response.test.value
+
+
+class OnCount(IStreamingResponder[str, str]):
+    """Counts up to the requested number, forever for `inf`, asynchronously
+    for numbers prefixed with `async`"""
+
+    def __init__(self):
+        self.produced = 0
+        self.closed = threading.Event()
+
+    @property
+    def request_payload(self) -> str:
+        return "test"
+
+    def unpack_request(self, request: GenericMessage) -> str:
+        return request.test.value
+
+    def on_request(self, request: str):
+        if request.startswith("async "):
+            return self._count_async(int(request[len("async "):]))
+        return self._count(request)
+
+    def _count(self, request: str) -> Iterator[str]:
+        numbers = itertools.count() if request == "inf" \
+            else range(int(request))
+        try:
+            for i in numbers:
+                self.produced += 1
+                yield str(i)
+        finally:
+            self.closed.set()
+
+    async def _count_async(self, count: int) -> AsyncIterator[str]:
+        for i in range(count):
+            self.produced += 1
+            yield str(i)
+
+    def prepare_response(self, response: str) -> GenericMessage:
+        return GenericMessage(test=TestMessage(value=response))
+
+
+class StreamingTests(unittest.TestCase):
+    def setUp(self):
+        self.responder = OnCount()
+        self.session = Session.Builder(
+            messenger=Messenger.Builder(
+                messenger=ProtocolMessenger.Builder(
+                    transport=Transport.Builder(
+                        transport=LoopbackTransport.Builder()))),
+            session_id=1,
+        ).build(RequestRouter(self.responder))
+        self.session.reconnect()
+
+    def values(self, count: int) -> List[str]:
+        return [str(i) for i in range(count)]
+
+    def test_stream(self):
+        streamed = Count("20").request_stream(self.session, credits=4,
+                                              timeout=5.0)
+        self.assertEqual(self.values(20), list(streamed))
+        # End of stream carries no payload
+        self.assertIsNone(
+            streamed.future.result(timeout=5.0).WhichOneof("payload"))
+
+    def test_deadline_extended(self):
+        streamed = Count("20").request_stream(self.session, credits=4,
+                                              timeout=5.0)
+        self.assertEqual(self.values(20), list(streamed))
+
+        # Partial responses move the deadline without adding heap entries
+        entries = [request_id for _, request_id in self.session._deadlines
+                   if request_id == streamed.request_id]
+        self.assertEqual(1, len(entries))
+
+    def test_async_stream(self):
+        streamed = Count("async 5").request_stream(self.session,
+                                                   timeout=5.0)
+        self.assertEqual(self.values(5), list(streamed))
+
+    def test_credits(self):
+        streamed = Count("20").request_stream(self.session, credits=2,
+                                              timeout=5.0)
+
+        # Nothing consumed, the responder waits for credits
+        time.sleep(0.3)
+        self.assertEqual(2, self.responder.produced)
+
+        self.assertEqual(self.values(20), list(streamed))
+
+    def test_cancel(self):
+        streamed = Count("inf").request_stream(self.session, credits=2,
+                                               timeout=5.0)
+
+        received = []
+        for value in streamed:
+            received.append(value)
+            if len(received) == 5:
+                streamed.cancel()
+
+        self.assertTrue(streamed.future.cancelled())
+        self.assertTrue(self.responder.closed.wait(timeout=5.0))
+        self.assertEqual(self.values(len(received)), received)
+
+    def test_bounded_threads(self):
+        streams = [Count("20").request_stream(self.session, credits=2,
+                                              timeout=5.0)
+                   for _ in range(4 * STREAM_POOL_SIZE)]
+        for streamed in streams:
+            self.assertEqual(self.values(20), list(streamed))
+
+        names = [thread.name for thread in threading.enumerate()
+                 if thread.name.startswith("Response stream")]
+        self.assertLessEqual(len(names), STREAM_POOL_SIZE)
+
+    def test_not_streamed(self):
+        # Requesters not accepting partial responses get the last one
+        self.assertEqual("9", Count("10").request(self.session)
+                         .result(timeout=5.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+import asyncio
+import logging
+from typing import Callable, List, Optional
+
+from ... import tracing
+from ...completion import Completion
+from ...event_loop import EventLoopThread
+from ...tasker import Runner
+from ..connection import AbstractConnection, ConnectionState
+from .frame_coding import FrameDecoder, FrameEncoder
+from .transport import (
+    AbstractOutgoingPacket,
+    IOutgoingPacket,
+    ITransport,
+    ITransportBuilder,
+    ITransportClient,
+)
+
+
+class FrameProtocol(asyncio.Protocol):
+    """Decodes frames of a single asyncio connection.
+
+    Frames received before any `AsyncioTransport` is attached are kept, so
+    nothing is lost while the layer chain above is being built.
+    """
+
+    def __init__(self, loop: EventLoopThread,
+                 on_connect: Callable[["FrameProtocol"], None]):
+        self.loop = loop
+        self.transport: Optional[asyncio.Transport] = None
+        self.closed = False
+        self.paused = False
+        self._on_connect = on_connect
+        self._decoder = FrameDecoder()
+        self._handler: Optional[AsyncioTransport] = None
+        self._backlog: List[bytes] = []
+
+    def attach(self, handler: "AsyncioTransport"):
+        self._handler = handler
+        backlog, self._backlog = self._backlog, []
+        for frame in backlog:
+            handler.on_frame(frame)
+
+        if self.closed:
+            handler.on_connection_lost()
+
+    def connection_made(self, transport: asyncio.BaseTransport):
+        logging.debug("connection_made():")
+        assert isinstance(transport, asyncio.Transport)
+        self.transport = transport
+        self._on_connect(self)
+
+    def data_received(self, data: bytes):
+        for frame in self._decoder.feed(data):
+            logging.debug(f"data_received(): Decoded frame size={len(frame)}")
+            if self._handler is not None:
+                self._handler.on_frame(frame)
+            else:
+                self._backlog.append(frame)
+
+    def pause_writing(self):
+        self.paused = True
+
+    def resume_writing(self):
+        self.paused = False
+        if self._handler is not None:
+            self._handler.on_resume_writing()
+
+    def connection_lost(self, exc: Optional[Exception]):
+        logging.debug("connection_lost():", exc_info=exc)
+        self.closed = True
+        if self._handler is not None:
+            self._handler.on_connection_lost()
+
+
+class AsyncioTransport(ITransport, AbstractConnection):
+    """ITransport over an asyncio connection.
+
+    All IO happens on the event loop thread, `send()` may be called from any
+    thread. Packet's future completes once the frame has been handed to
+    asyncio and the write buffer is below its high-water mark.
+    """
+
+    def __init__(self, protocol: FrameProtocol, client: ITransportClient):
+        super().__init__(client)
+        self._protocol = protocol
+        self._loop: EventLoopThread = protocol.loop
+        self._client: ITransportClient = client
+        self._attached = False
+        # Written packets waiting for asyncio to resume writing
+        self._unacknowledged: List[AsyncioTransport.OutgoingPacket] = []
+
+    def send(self, packet: bytes) -> IOutgoingPacket:
+        logging.debug("send():")
+        outgoing = AsyncioTransport.OutgoingPacket(packet)
+        self._loop.call_soon(self._write, outgoing)
+        return outgoing
+
+    def _write(self, outgoing: "AsyncioTransport.OutgoingPacket"):
+        transport = self._protocol.transport
+        if self._protocol.closed or transport is None:
+            outgoing.future.set_exception(
+                ConnectionError("Connection is closed"))
+            return
+
+        transport.write(FrameEncoder.encode(outgoing.packet))
+        if self._protocol.paused:
+            self._unacknowledged.append(outgoing)
+        else:
+            outgoing.future.set_result(outgoing)
+
+    def reconnect(self):
+        logging.debug("reconnect():")
+        if self._protocol.closed:
+            logging.warning("reconnect(): Connection has been closed")
+            self.state = ConnectionState.DISCONNECTED
+            return
+
+        self.state = ConnectionState.CONNECTING
+        self.state = ConnectionState.CONNECTED
+
+        if not self._attached:
+            self._attached = True
+            self._loop.call_soon(self._protocol.attach, self)
+
+    def disconnect(self):
+        logging.debug("disconnect():")
+        if self.state == ConnectionState.DISCONNECTED:
+            return
+
+        self.state = ConnectionState.DISCONNECTING
+        if self._protocol.transport is not None:
+            self._loop.call_soon(self._protocol.transport.close)
+
+    def on_frame(self, frame: bytes):
+        with tracing.span("AsyncioTransport.on_frame", "transport",
+                          size=len(frame)):
+            flow_id = tracing.new_flow()
+            tracing.flow("packet", "transport", flow_id, "s")
+            with tracing.in_flow(flow_id):
+                self._client.on_packet_received(frame)
+
+    def on_resume_writing(self):
+        unacknowledged, self._unacknowledged = self._unacknowledged, []
+        for outgoing in unacknowledged:
+            outgoing.future.set_result(outgoing)
+
+    def on_connection_lost(self):
+        unacknowledged, self._unacknowledged = self._unacknowledged, []
+        for outgoing in unacknowledged:
+            outgoing.future.set_exception(
+                ConnectionError("Connection has been lost"))
+
+        self.state = ConnectionState.DISCONNECTED
+
+    class OutgoingPacket(AbstractOutgoingPacket):
+        __slots__ = ()
+
+        def __init__(self, packet):
+            super().__init__(packet, Completion())
+
+    class Builder(ITransportBuilder):
+        def __init__(self, protocol=None, runner=None):
+            super().__init__(runner=runner)
+            self._protocol: FrameProtocol = protocol
+
+        def set_protocol(self, protocol: FrameProtocol):
+            self._protocol = protocol
+            return self
+
+        def construct(self, client: ITransportClient,
+                      runner: Optional[Runner] = None):
+            return AsyncioTransport(self._protocol, client)
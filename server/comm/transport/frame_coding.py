@@ -1,4 +1,11 @@
-from typing import List, Optional
+import re
+from typing import Iterator, List, Optional, Union
+
+DELIMITER = b"\x00"
+MAX_SLICE_SIZE = 0x7FFF
+
+# Searches buffers in place, unlike `find()` it accepts a memoryview
+_DELIMITER_PATTERN = re.compile(re.escape(DELIMITER))
 
 
 class FrameEncoder(object):
@@ -6,6 +13,63 @@ class FrameEncoder(object):
         self._consumer = consumer
         self._buffer = []
 
+    @staticmethod
+    def slice_header(size: int) -> bytes:
+        assert size <= MAX_SLICE_SIZE
+        return bytes((0x80 | (size & 0x7F), 0x80 | ((size >> 7) & 0x7F)))
+
+    @staticmethod
+    def encode(packet: bytes) -> bytes:
+        """Encodes whole packet into a single frame, including both
+        delimiters. Equivalent of `start_frame()`, `write_byte()` for every
+        byte and `finish_frame()`."""
+        slices = packet.split(DELIMITER)
+        last = slices.pop()
+        header = FrameEncoder.slice_header
+
+        parts: List[bytes] = [DELIMITER]
+        for data in slices:
+            parts.append(header(len(data)))
+            parts.append(data)
+
+        if last:
+            parts.append(header(len(last) + 1))
+            parts.append(last)
+
+        parts.append(DELIMITER)
+        return b"".join(parts)
+
+    @staticmethod
+    def encode_view(packet: Union[bytes, bytearray, memoryview]) \
+            -> List[Union[bytes, memoryview]]:
+        """Encodes packet into a list of buffers without copying the payload,
+        slices are views into `packet`. Joined buffers are equal to
+        `encode(packet)`."""
+        view = memoryview(packet).cast("B")
+        if isinstance(packet, (bytes, bytearray)):
+            find = packet.find
+        else:
+            def find(sub: bytes, start: int = 0) -> int:
+                match = _DELIMITER_PATTERN.search(view, start)
+                return -1 if match is None else match.start()
+
+        header = FrameEncoder.slice_header
+        parts: List[Union[bytes, memoryview]] = [DELIMITER]
+        start = 0
+        end = find(DELIMITER)
+        while end != -1:
+            parts.append(header(end - start))
+            parts.append(view[start:end])
+            start = end + 1
+            end = find(DELIMITER, start)
+
+        if start < len(view):
+            parts.append(header(len(view) - start + 1))
+            parts.append(view[start:])
+
+        parts.append(DELIMITER)
+        return parts
+
     def write_byte(self, byte: int):
         if byte != 0:
             self._buffer.append(byte)
@@ -13,13 +77,7 @@ class FrameEncoder(object):
             self._write_slice(False)
 
     def write_slice_size(self, size: int):
-        assert size <= 0x7FFF
-
-        lo = 0x80 | (size & 0x7F)
-        size = size >> 7
-        hi = 0x80 | (size & 0x7F)
-
-        self._consumer([lo, hi])
+        self._consumer(list(FrameEncoder.slice_header(size)))
 
     def start_frame(self):
         self._reset()
@@ -42,11 +100,93 @@ class FrameEncoder(object):
 
 
 class FrameDecoder(object):
-    def __init__(self, producer):
+    # States of the incremental decoder used by `feed()`
+    _SYNC = 0  # Skipping partial frame, waiting for a delimiter
+    _IDLE = 1  # After delimiter, waiting for the first slice header byte
+    _HEADER = 2  # Waiting for the second slice header byte
+    _SLICE = 3  # Reading slice data
+    _SLICE_END = 4  # After full slice, waiting for a header or a delimiter
+
+    def __init__(self, producer=None):
         self._producer = producer
         self._eof = False
         self._buffer: List[int] = []
 
+        self._state = FrameDecoder._SYNC
+        self._frame = bytearray()
+        self._slice_lo = 0
+        self._remaining = 0
+
+    def feed(self, data: Union[bytes, bytearray],
+             size: Optional[int] = None) -> Iterator[bytes]:
+        """Decodes next chunk of the stream and yields every frame completed
+        in it. Only first `size` bytes of `data` are used if specified, which
+        allows decoding straight from a reusable receive buffer. Partial
+        frame is kept until the following call, so the returned iterator has
+        to be exhausted before feeding more data."""
+        if isinstance(data, memoryview):
+            data = data[:size].tobytes()
+
+        view = memoryview(data)
+        pos = 0
+        end = len(data) if size is None else size
+
+        while pos < end:
+            state = self._state
+
+            if state == FrameDecoder._SLICE:
+                stop = min(pos + self._remaining, end)
+                zero = data.find(DELIMITER, pos, stop)
+                if zero != -1:
+                    # Last slice of the frame
+                    self._frame += view[pos:zero]
+                    pos = zero + 1
+                    self._state = FrameDecoder._IDLE
+                    yield self._take_frame()
+                    continue
+
+                self._frame += view[pos:stop]
+                self._remaining -= stop - pos
+                pos = stop
+
+                if self._remaining == 0:
+                    self._frame.append(0x00)
+                    self._state = FrameDecoder._SLICE_END
+
+            elif state == FrameDecoder._SYNC:
+                zero = data.find(DELIMITER, pos)
+                if zero == -1:
+                    break
+
+                pos = zero + 1
+                self._state = FrameDecoder._IDLE
+
+            else:
+                byte = data[pos]
+                pos += 1
+
+                if state == FrameDecoder._HEADER:
+                    if byte == 0:
+                        # Error while parsing stream, drop the frame
+                        self._frame = bytearray()
+                        self._state = FrameDecoder._IDLE
+                    else:
+                        self._remaining = self._slice_lo | ((byte & 0x7F) << 7)
+                        self._state = FrameDecoder._SLICE
+
+                elif byte != 0:
+                    self._slice_lo = byte & 0x7F
+                    self._state = FrameDecoder._HEADER
+
+                elif state == FrameDecoder._SLICE_END:
+                    self._state = FrameDecoder._IDLE
+                    yield self._take_frame()
+
+    def _take_frame(self) -> bytes:
+        frame = bytes(self._frame)
+        self._frame = bytearray()
+        return frame
+
     def read_frame(self) -> Optional[List[int]]:
         self._buffer = []
 
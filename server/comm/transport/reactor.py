@@ -0,0 +1,201 @@
+import logging
+import os
+import select
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Callable, Deque, Dict, Optional
+
+
+class IReactorHandler(ABC):
+    @abstractmethod
+    def on_ready(self, read: bool, write: bool, hup: bool):
+        raise NotImplementedError
+
+
+class Reactor(object):
+    """Single IO thread multiplexing readiness of many connections.
+
+    Handlers are always called on the reactor thread. Registration changes
+    requested from other threads are forwarded to the reactor thread, so the
+    poller is only ever touched by one thread.
+    """
+
+    _default: Optional["Reactor"] = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, name="IO reactor"):
+        self.name: str = name
+        # Used directly instead of `selectors`, which reports hang-ups and
+        # errors as plain readiness
+        if hasattr(select, "epoll"):
+            self._poller = select.epoll()
+            self._read_mask = select.EPOLLIN
+            self._write_mask = select.EPOLLOUT
+            self._hup_mask = select.EPOLLHUP | select.EPOLLERR
+        else:
+            self._poller = select.poll()
+            self._read_mask = select.POLLIN
+            self._write_mask = select.POLLOUT
+            self._hup_mask = select.POLLHUP | select.POLLERR | select.POLLNVAL
+
+        self._event, self._notify = os.pipe()
+        os.set_blocking(self._event, False)
+        os.set_blocking(self._notify, False)
+        self._poller.register(self._event, self._read_mask)
+
+        self._handlers: Dict[int, IReactorHandler] = {}
+        self._masks: Dict[int, int] = {}
+        self._calls: Deque[Callable[[], None]] = deque()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    @staticmethod
+    def default() -> "Reactor":
+        with Reactor._default_lock:
+            if Reactor._default is None:
+                Reactor._default = Reactor()
+            return Reactor._default
+
+    def is_reactor_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def call_soon(self, func: Callable[[], None]):
+        if self.is_reactor_thread():
+            func()
+            return
+
+        self._calls.append(func)
+        self._ensure_running()
+        self.wakeup()
+
+    def call_and_wait(self, func: Callable[[], None], timeout=1.0):
+        """Runs `func` on the reactor thread. Raises `TimeoutError` if it
+        has not started within `timeout`, `func` is not run at all then."""
+        if self.is_reactor_thread() or not self._running:
+            func()
+            return
+
+        done = threading.Event()
+        lock = threading.Lock()
+        started = False
+        abandoned = False
+
+        def wrapper():
+            nonlocal started
+            with lock:
+                if abandoned:
+                    return
+                started = True
+
+            try:
+                func()
+            finally:
+                done.set()
+
+        self.call_soon(wrapper)
+        if done.wait(timeout):
+            return
+
+        with lock:
+            if not started:
+                abandoned = True
+                raise TimeoutError(f"{self.name} did not respond")
+
+        # Already running, let it finish
+        done.wait()
+
+    def wakeup(self):
+        try:
+            os.write(self._notify, b"\0")
+        except BlockingIOError:
+            # Pipe is full, reactor is going to wake up anyway
+            pass
+
+    def register(self, fileobj, handler: IReactorHandler, write=False):
+        def do_register():
+            fd = fileobj.fileno()
+            logging.debug(f"register(): fd={fd}")
+            mask = self._mask(write)
+            self._poller.register(fd, mask)
+            self._handlers[fd] = handler
+            self._masks[fd] = mask
+
+        self._ensure_running()
+        self.call_and_wait(do_register)
+
+    def set_writing(self, fileobj, write: bool):
+        def do_modify():
+            fd = fileobj.fileno()
+            if fd not in self._handlers:
+                return
+
+            mask = self._mask(write)
+            if self._masks[fd] != mask:
+                self._poller.modify(fd, mask)
+                self._masks[fd] = mask
+
+        self.call_soon(do_modify)
+
+    def unregister(self, fileobj):
+        def do_unregister():
+            fd = fileobj.fileno()
+            logging.debug(f"unregister(): fd={fd}")
+            if self._handlers.pop(fd, None) is not None:
+                del self._masks[fd]
+                self._poller.unregister(fd)
+
+        self.call_and_wait(do_unregister)
+
+    def _mask(self, write: bool) -> int:
+        if write:
+            return self._read_mask | self._write_mask
+        return self._read_mask
+
+    def _ensure_running(self):
+        with self._lock:
+            if self._running:
+                return
+
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name=self.name)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _run_calls(self):
+        while self._calls:
+            func = self._calls.popleft()
+            try:
+                func()
+            except Exception as exc:
+                logging.error("_run_calls(): ", exc_info=exc)
+
+    def _run(self):
+        logging.debug(f"_run(): thread={threading.current_thread()}")
+        while self._running:
+            self._run_calls()
+
+            for fd, events in self._poller.poll():
+                if fd == self._event:
+                    try:
+                        while len(os.read(self._event, 4096)) > 0:
+                            pass
+                    except BlockingIOError:
+                        pass
+                    continue
+
+                handler = self._handlers.get(fd)
+                if handler is None:
+                    # Unregistered by a handler earlier in this batch
+                    continue
+
+                read = (events & self._read_mask) != 0
+                write = (events & self._write_mask) != 0
+                hup = (events & self._hup_mask) != 0
+                try:
+                    handler.on_ready(read, write, hup)
+                except Exception as exc:
+                    logging.error("_run(): ", exc_info=exc)
+
+        logging.debug("_run(): Exited")
@@ -0,0 +1,94 @@
+import logging
+import socket
+import unittest
+from queue import Queue
+from typing import List
+
+from ..listener.listener import IListenerClient
+from ..listener.net_asyncio import AsyncioNetworkListener
+from .transport import (
+    ConnectionState,
+    ITransport,
+    ITransportBuilder,
+    ITransportClient,
+    SocketTransport,
+    Transport,
+)
+
+
+class AsyncioTransportTest(unittest.TestCase):
+    @staticmethod
+    def setUpClass(**kwargs) -> None:
+        import sys
+
+        logging.basicConfig(stream=sys.stdout, level=logging.DEBUG,
+                            format="%(asctime)s,%(msecs)d %(levelname)-8s "
+                            "[%(filename)s:%(lineno)d] %(message)s")
+
+    def test_echo(self):
+        class EchoClient(ITransportClient):
+            def __init__(self):
+                self.transport: ITransport = None
+
+            def on_packet_received(self, packet: bytes):
+                self.transport.send(packet)
+
+            def on_state_changed(self, state: ConnectionState):
+                pass
+
+        class ListenerClient(IListenerClient):
+            def __init__(self):
+                self.transports: List[ITransport] = []
+
+            def on_connect(self, transport_builder: ITransportBuilder):
+                client = EchoClient()
+                client.transport = transport_builder.build(client)
+                client.transport.reconnect()
+                self.transports.append(client.transport)
+
+        class Client(ITransportClient):
+            def __init__(self, queue: Queue[bytes]):
+                self._queue = queue
+
+            def on_packet_received(self, packet: bytes):
+                self._queue.put(packet)
+
+            def on_state_changed(self, state: ConnectionState):
+                pass
+
+        listener_client = ListenerClient()
+        listener = AsyncioNetworkListener(listener_client, port=0)
+        listener.listen().result(timeout=5.0)
+
+        queues = []
+        transports = []
+        for _ in range(4):
+            sock = socket.create_connection(("127.0.0.1", listener.port))
+            queue: Queue[bytes] = Queue()
+            transport = Transport.Builder(
+                transport=SocketTransport.Builder(socket=sock, addr=None)
+            ).build(Client(queue))
+            transport.reconnect()
+            queues.append(queue)
+            transports.append(transport)
+
+        for i, transport in enumerate(transports):
+            for j in range(10):
+                transport.send(f"Test {i} {j}".encode())
+
+        for i, queue in enumerate(queues):
+            for j in range(10):
+                self.assertEqual(f"Test {i} {j}".encode(),
+                                 queue.get(timeout=5.0))
+
+        for transport in transports:
+            transport.disconnect()
+
+        listener.close()
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(stream=sys.stdout, level=logging.DEBUG)
+    unittest.main()
@@ -30,6 +30,13 @@ class FrameEncoderTest(unittest.TestCase):
         encoder.finish_frame()
         self.assertListEqual(expected, arr)
 
+        framed = bytes([0x00, *expected])
+        self.assertEqual(framed, FrameEncoder.encode(bytes(data)))
+        self.assertEqual(framed,
+                         b"".join(FrameEncoder.encode_view(bytes(data))))
+        self.assertEqual(framed, b"".join(
+            FrameEncoder.encode_view(memoryview(bytearray(data)))))
+
     def test_write_without_zeros(self):
         self._test_encoding(
             [0x1, 0x2, 0x3, 0x4],
@@ -53,6 +60,40 @@ class FrameEncoderTest(unittest.TestCase):
             [0x1, 0x0, 0x1, 0x0], [0x81, 0x80, 0x1, 0x81, 0x80, 0x1, 0x0]
         )
 
+    def test_encode_empty(self):
+        self.assertEqual(b"\x00\x00", FrameEncoder.encode(b""))
+        self.assertEqual(b"\x00\x00",
+                         b"".join(FrameEncoder.encode_view(b"")))
+
+    def test_encode_view_is_zero_copy(self):
+        data = bytearray([0x1, 0x2, 0x0, 0x3])
+        parts = FrameEncoder.encode_view(data)
+        data[0] = 0x7
+        self.assertEqual(bytes([0x0, 0x82, 0x80, 0x7, 0x2,
+                                0x82, 0x80, 0x3, 0x0]), b"".join(parts))
+
+    def test_encode_view_slice(self):
+        data = bytearray([0x5, 0x1, 0x0, 0x2, 0x0])
+        # Offsets are relative to the view, not to the underlying buffer
+        view = memoryview(data)[1:4]
+        self.assertEqual(FrameEncoder.encode(bytes(view)),
+                         b"".join(FrameEncoder.encode_view(view)))
+
+    def test_encode_randomized(self):
+        random = Random(2137)
+        for size in [20, 100, 512, 1020, 2048]:
+            data = random.randbytes(size)
+            arr: List[int] = []
+            encoder = FrameEncoder(arr.extend)
+            encoder.start_frame()
+            for byte in data:
+                encoder.write_byte(byte)
+            encoder.finish_frame()
+
+            self.assertEqual(bytes(arr), FrameEncoder.encode(data))
+            self.assertEqual(bytes(arr),
+                             b"".join(FrameEncoder.encode_view(data)))
+
 
 class FrameDecoderTest(unittest.TestCase):
     @staticmethod
@@ -68,11 +109,24 @@ class FrameDecoderTest(unittest.TestCase):
         decoder = FrameDecoder(produce)
         return decoder.read_frame()
 
+    @staticmethod
+    def feed_frames(stream: bytes, chunk_size: int) -> List[bytes]:
+        decoder = FrameDecoder()
+        frames: List[bytes] = []
+        for i in range(0, len(stream), chunk_size):
+            frames.extend(decoder.feed(stream[i:i + chunk_size]))
+        return frames
+
     def _test_single_frame(self, plain, byte_stream):
         decoded = self.decode_single_frame(byte_stream)
         self.assertIsNotNone(decoded)
         self.assertListEqual(plain, decoded)
 
+        for chunk_size in [1, 2, 3, len(byte_stream)]:
+            self.assertListEqual([bytes(plain)],
+                                 self.feed_frames(bytes(byte_stream),
+                                                  chunk_size))
+
     def test_rubbish_data(self):
         self.assertIsNone(self.decode_single_frame([0xFF, 0xF1, 0x2F, 0x3F]))
 
@@ -82,6 +136,16 @@ class FrameDecoderTest(unittest.TestCase):
     def test_null_stream(self):
         self.assertIsNone(self.decode_single_frame([0x00, 0x00]))
 
+    def test_feed_rubbish_data(self):
+        self.assertListEqual(
+            [], self.feed_frames(bytes([0xFF, 0xF1, 0x2F, 0x3F]), 1))
+        self.assertListEqual([], self.feed_frames(bytes([0x00, 0x00]), 1))
+
+    def test_feed_skips_broken_frame(self):
+        stream = bytes([0x00, 0x82, 0x00, 0x82, 0x80, 0x1, 0x0])
+        self.assertListEqual([b"\x01"], self.feed_frames(stream, 1))
+        self.assertListEqual([b"\x01"], self.feed_frames(stream, 7))
+
     def test_stream_without_zeros(self):
         self._test_single_frame([0x1], [0x00, 0x82, 0x80, 0x1, 0x0])
         self._test_single_frame([0x1, 0x2], [0x00, 0x83, 0x80, 0x1, 0x2, 0x0])
@@ -139,6 +203,22 @@ class FrameEncoderDecoderTest(unittest.TestCase):
         self._test([0x0, 0x1, 0x0])
         self._test([0x00] * 256)
 
+    def test_feed_randomized_stream(self):
+        random = Random(2137)
+        packets = [random.randbytes(random.randint(1, 2048))
+                   for _ in range(32)]
+        stream = b"".join(FrameEncoder.encode(p) for p in packets)
+
+        decoder = FrameDecoder()
+        decoded: List[bytes] = []
+        pos = 0
+        while pos < len(stream):
+            size = random.randint(1, 512)
+            decoded.extend(decoder.feed(stream[pos:pos + size]))
+            pos += size
+
+        self.assertListEqual(packets, decoded)
+
     def test_randomized_messages(self):
         random = Random(2137)
         self._test(list(random.randbytes(20)))
@@ -1,13 +1,16 @@
+import errno
 import socket
 import logging
 import unittest
 import threading
 from abc import ABC, abstractmethod
 from queue import Empty, Queue
+from random import Random
 from typing import Optional, List
 from concurrent.futures import Future
 
 from .transport import (
+    MAX_ERROR_COUNT,
     Runner,
     Transport,
     ITransport,
@@ -19,6 +22,8 @@ from .transport import (
     AbstractOutgoingPacket,
     SocketTransport,
 )
+from .frame_coding import FrameEncoder
+from .reactor import IReactorHandler, Reactor
 
 
 class IMockTransportEndpoint(ABC):
@@ -106,6 +111,19 @@ class LoopbackTransport(MockTransport):
             return LoopbackTransport(client)
 
 
+class QueueClient(ITransportClient):
+    """Puts received packets into `queue`"""
+
+    def __init__(self, queue: Optional[Queue[bytes]] = None):
+        self.queue: Queue[bytes] = queue if queue is not None else Queue()
+
+    def on_packet_received(self, packet: bytes):
+        self.queue.put(packet)
+
+    def on_state_changed(self, state: ConnectionState):
+        pass
+
+
 class PacketLoopbackTest(unittest.TestCase):
     @staticmethod
     def setUpClass(**kwargs) -> None:
@@ -162,6 +180,222 @@ class PacketLoopbackTest(unittest.TestCase):
         del transport
 
 
+class HoldingTransport(MockTransport):
+    """Transport that delivers packets only when asked to"""
+
+    def __init__(self, client):
+        super().__init__(LoopbackTransport.Endpoint(), client)
+        self.held: Queue[MockTransport.PendingPacket] = Queue()
+
+    def pump_pending_messages(self):
+        if self.state == ConnectionState.DISCONNECTED:
+            self.reconnect()
+
+        while self.message_queue:
+            self.held.put(self.message_queue.pop(0))
+
+    class Builder(ITransportBuilder):
+        def __init__(self):
+            super().__init__()
+            self.transport: Optional[HoldingTransport] = None
+
+        def construct(self, client: ITransportClient,
+                      runner: Optional[Runner] = None):
+            self.transport = HoldingTransport(client)
+            return self.transport
+
+
+class WindowTransportTest(unittest.TestCase):
+    def test_window(self):
+        builder = HoldingTransport.Builder()
+        transport = Transport.Builder(builder, window_size=3).build(
+            QueueClient())
+        transport.reconnect()
+        impl = builder.transport
+        assert impl is not None
+
+        outgoing = [transport.send(f"Packet {i}".encode()) for i in range(5)]
+        held = [impl.held.get(timeout=5.0) for _ in range(3)]
+        self.assertRaises(Empty, impl.held.get, timeout=0.5)
+
+        # Completing out of order must not complete the first packet
+        held[1].future.set_result(held[1])
+        self.assertRaises(Empty, impl.held.get, timeout=0.5)
+        self.assertFalse(outgoing[1].future.done())
+
+        held[0].future.set_result(held[0])
+        outgoing[1].future.result(timeout=1.0)
+        self.assertTrue(outgoing[0].future.done())
+
+        held.append(impl.held.get(timeout=1.0))
+        held.append(impl.held.get(timeout=1.0))
+        for packet in held[2:]:
+            packet.future.set_result(packet)
+
+        for packet in outgoing:
+            packet.future.result(timeout=1.0)
+
+        self.assertListEqual([p.packet for p in outgoing],
+                             [p.packet for p in held])
+        transport.disconnect()
+
+
+    def test_retry_ordered(self):
+        builder = HoldingTransport.Builder()
+        transport = Transport.Builder(builder, window_size=3).build(
+            QueueClient())
+        transport.reconnect()
+        impl = builder.transport
+        assert impl is not None
+
+        outgoing = [transport.send(f"Packet {i}".encode()) for i in range(2)]
+        held = [impl.held.get(timeout=5.0) for _ in range(2)]
+        held[1].future.set_result(held[1])
+        held[0].future.set_exception(IOError("test_retry_ordered"))
+
+        retried = impl.held.get(timeout=5.0)
+        self.assertEqual(b"Packet 0", retried.packet)
+
+        # Held back until the retried packet gets through
+        outgoing.append(transport.send(b"Packet 2"))
+        self.assertRaises(Empty, impl.held.get, timeout=0.5)
+
+        retried.future.set_result(retried)
+        last = impl.held.get(timeout=5.0)
+        self.assertEqual(b"Packet 2", last.packet)
+        last.future.set_result(last)
+
+        for packet in outgoing:
+            packet.future.result(timeout=1.0)
+        transport.disconnect()
+
+    def test_given_up(self):
+        builder = HoldingTransport.Builder()
+        transport = Transport.Builder(builder, window_size=3).build(
+            QueueClient())
+        transport.reconnect()
+        impl = builder.transport
+        assert impl is not None
+
+        outgoing = [transport.send(f"Packet {i}".encode()) for i in range(2)]
+        failed, delivered = [impl.held.get(timeout=5.0) for _ in range(2)]
+        delivered.future.set_result(delivered)
+
+        for _ in range(MAX_ERROR_COUNT):
+            failed.future.set_exception(IOError("test_given_up"))
+            failed = impl.held.get(timeout=5.0)
+        failed.future.set_exception(IOError("test_given_up"))
+
+        with self.assertRaises(IOError):
+            outgoing[0].future.result(timeout=1.0)
+        # No longer waits for the packet given up on
+        self.assertIs(delivered, outgoing[1].future.result(timeout=1.0))
+        transport.disconnect()
+
+
+class BluetoothError(IOError):
+    """Stand-in for `bluetooth.BluetoothError` of PyBluez"""
+
+
+class BluetoothSocketStub(object):
+    """Non-blocking PyBluez socket, has neither `recv_into()` nor `sendmsg()`
+    and reports would-block with `BluetoothError`"""
+
+    def __init__(self, received: List[bytes]):
+        self.received = received
+        self.sent: List[bytes] = []
+        self.writable = True
+
+    def recv(self, num: int) -> bytes:
+        if not self.received:
+            raise BluetoothError(errno.EAGAIN,
+                                 "Resource temporarily unavailable")
+        return self.received.pop(0)
+
+    def send(self, data: bytes) -> int:
+        if not self.writable:
+            raise BluetoothError("(11, 'Resource temporarily unavailable')")
+        self.sent.append(bytes(data))
+        return len(data)
+
+    def setblocking(self, flag: bool):
+        pass
+
+    def close(self):
+        pass
+
+
+class BluetoothSocketTest(unittest.TestCase):
+    def test_would_block(self):
+        packet = b"Test packet"
+        sock = BluetoothSocketStub([FrameEncoder.encode(packet)])
+        client = QueueClient()
+        transport = SocketTransport(sock, None, client)
+
+        self.assertTrue(transport._read())
+        self.assertEqual(packet, client.queue.get(timeout=1.0))
+        # Drained stream ends the read instead of failing it
+        self.assertTrue(transport._read())
+        with self.assertRaises(BlockingIOError):
+            transport.input_into(memoryview(bytearray(16)))
+
+        sock.writable = False
+        with self.assertRaises(BlockingIOError):
+            transport.output_vector([memoryview(b"data")])
+
+
+class ReactorTest(unittest.TestCase):
+    def test_hang_up(self):
+        events: Queue = Queue()
+
+        class Handler(IReactorHandler):
+            def on_ready(self, read: bool, write: bool, hup: bool):
+                events.put((read, write, hup))
+                if hup:
+                    reactor.unregister(sock_a)
+
+        reactor = Reactor(name="Hang-up reactor")
+        sock_a, sock_b = socket.socketpair()
+        reactor.register(sock_a, Handler())
+        sock_b.close()
+
+        _, _, hup = events.get(timeout=5.0)
+        self.assertTrue(hup)
+        self.assertRaises(Empty, events.get, timeout=0.5)
+        sock_a.close()
+
+    def test_not_responding(self):
+        reactor = Reactor(name="Busy reactor")
+        busy = threading.Event()
+        reactor.call_soon(busy.wait)
+
+        called = []
+        with self.assertRaises(TimeoutError):
+            reactor.call_and_wait(lambda: called.append(True), timeout=0.2)
+
+        # Given up on, not run late
+        busy.set()
+        reactor.call_and_wait(lambda: None)
+        self.assertListEqual([], called)
+
+    def test_hang_up_disconnects(self):
+        states: Queue[ConnectionState] = Queue()
+
+        class Client(QueueClient):
+            def on_state_changed(self, state: ConnectionState):
+                states.put(state)
+
+        sock_a, sock_b = socket.socketpair()
+        transport = SocketTransport.Builder(socket=sock_a, addr=None) \
+            .set_reactor(Reactor(name="Hang-up reactor")).build(Client())
+        transport.reconnect()
+        sock_b.close()
+
+        while states.get(timeout=5.0) != ConnectionState.DISCONNECTED:
+            pass
+        self.assertFalse(transport.is_connected)
+
+
 class SocketPairTransportTest(unittest.TestCase):
     @staticmethod
     def setUpClass(**kwargs) -> None:
@@ -172,14 +406,20 @@ class SocketPairTransportTest(unittest.TestCase):
                             "[%(filename)s:%(lineno)d] %(message)s")
 
     @staticmethod
-    def pair_transport(client_a: ITransportClient, client_b: ITransportClient):
+    def pair_transport(client_a: ITransportClient, client_b: ITransportClient,
+                       recv_buffer_size: Optional[int] = None,
+                       reactor: Optional[Reactor] = None):
         sock_a, sock_b = socket.socketpair()
 
         transport_a = Transport.Builder(
             transport=SocketTransport.Builder(socket=sock_a, addr=None)
+            .set_recv_buffer(recv_buffer_size)
+            .set_reactor(reactor)
         ).build(client_a)
         transport_b = Transport.Builder(
             transport=SocketTransport.Builder(socket=sock_b, addr=None)
+            .set_recv_buffer(recv_buffer_size)
+            .set_reactor(reactor)
         ).build(client_b)
 
         return transport_a, transport_b
@@ -218,6 +458,79 @@ class SocketPairTransportTest(unittest.TestCase):
         del transport_a
         del transport_b
 
+    def test_burst_small_buffer(self):
+        queue_a: Queue[bytes] = Queue()
+        queue_b: Queue[bytes] = Queue()
+        transport_a, transport_b = self.pair_transport(
+            QueueClient(queue_a), QueueClient(queue_b), recv_buffer_size=64)
+        transport_a.reconnect()
+        transport_b.reconnect()
+
+        random = Random(2137)
+        packets = [random.randbytes(random.randint(1, 1024))
+                   for _ in range(50)]
+        for packet in packets:
+            transport_a.send(packet)
+
+        for packet in packets:
+            self.assertEqual(packet, queue_b.get(timeout=5.0))
+
+        transport_a.disconnect()
+        transport_b.disconnect()
+
+        del transport_a
+        del transport_b
+
+    def test_partial_writes(self):
+        queue_a: Queue[bytes] = Queue()
+        queue_b: Queue[bytes] = Queue()
+        transport_a, transport_b = self.pair_transport(
+            QueueClient(queue_a), QueueClient(queue_b))
+        transport_a.reconnect()
+        transport_b.reconnect()
+
+        random = Random(2137)
+        packets = [random.randbytes(256 * 1024) for _ in range(8)]
+        outgoing = [transport_a.send(packet) for packet in packets]
+
+        for packet in packets:
+            self.assertEqual(packet, queue_b.get(timeout=10.0))
+
+        for packet in outgoing:
+            delivered = packet.future.result(timeout=5.0)
+            self.assertEqual(packet.packet, delivered.packet)
+
+        transport_a.disconnect()
+        transport_b.disconnect()
+
+        del transport_a
+        del transport_b
+
+    def test_shared_reactor(self):
+        reactor = Reactor(name="Test reactor")
+        queue: Queue[bytes] = Queue()
+        pairs = [self.pair_transport(QueueClient(queue), QueueClient(queue),
+                                     reactor=reactor) for _ in range(10)]
+
+        for transport_a, transport_b in pairs:
+            transport_a.reconnect()
+            transport_b.reconnect()
+
+        for i, (transport_a, transport_b) in enumerate(pairs):
+            transport_a.send(f"Test {i}".encode())
+
+        received = {queue.get(timeout=5.0) for _ in pairs}
+        self.assertSetEqual({f"Test {i}".encode() for i in range(10)},
+                            received)
+
+        names = [thread.name for thread in threading.enumerate()]
+        self.assertEqual(1, names.count("Test reactor"))
+        self.assertNotIn("Streaming IO thread", names)
+
+        for transport_a, transport_b in pairs:
+            transport_a.disconnect()
+            transport_b.disconnect()
+
     def test_ping_pong(self):
         class ClientA(ITransportClient):
             def __init__(self, event: threading.Event):
@@ -1,13 +1,16 @@
-import functools
+import errno
+import itertools
 import logging
-import os
-import select
+import re
 import socket
-import threading
 from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import contextmanager
 from concurrent.futures import Future
-from typing import List, Optional, Tuple
+from typing import Deque, List, Optional, Tuple
 
+from ... import tracing
+from ...completion import Completion
 from ...tasker import Tasker, Runner
 from ..connection import (
     IConnection,
@@ -17,12 +20,21 @@ from ..connection import (
     IConnectionBuilder,
 )
 from .frame_coding import FrameDecoder, FrameEncoder
+from .reactor import IReactorHandler, Reactor
 
 RECONNECT_TIMEOUT = 2.0  # seconds
 MAX_ERROR_COUNT = 4
+# Number of packets handed down to the underlying transport at once
+WINDOW_SIZE = 8
+# Maximal number of frames gathered into a single vectored write, well below
+# IOV_MAX
+MAX_WRITE_BUFFERS = 256
 
 
 class IOutgoingPacket(ABC):
+    # Created for every packet, keep implementations slotted
+    __slots__ = ()
+
     @property
     @abstractmethod
     def packet(self) -> bytes:
@@ -35,9 +47,12 @@ class IOutgoingPacket(ABC):
 
 
 class AbstractOutgoingPacket(IOutgoingPacket, ABC):
+    __slots__ = ("_packet", "_future", "flow_id")
+
     def __init__(self, packet, future=None):
         self._packet: bytes = packet
-        self._future: Future[IOutgoingPacket] = future or Future()
+        self._future: Future[IOutgoingPacket] = future or Completion()
+        self.flow_id: int = tracing.current_flow()
 
     @property
     def packet(self) -> bytes:
@@ -92,7 +107,8 @@ class ITransportBuilder(IConnectionBuilder, ABC):
 class Transport(ITransport, AbstractConnection, Tasker):
     def __init__(self, transport_builder: ITransportBuilder,
                  client: ITransportClient,
-                 runner: Optional[Runner] = None):
+                 runner: Optional[Runner] = None,
+                 window_size: Optional[int] = None):
         Tasker.__init__(self, runner=runner)
         client = Transport.Client(self, client)
         AbstractConnection.__init__(self, client)
@@ -101,6 +117,7 @@ class Transport(ITransport, AbstractConnection, Tasker):
             self._client, runner=runner)
         self._been_connected = False
         self.pending_packets: List[Transport.OutgoingPacket] = []
+        self.window_size: int = window_size or WINDOW_SIZE
         self.error_count = 0
 
     @property
@@ -114,11 +131,20 @@ class Transport(ITransport, AbstractConnection, Tasker):
     def send(self, packet: bytes) -> IOutgoingPacket:
         count = len(self.pending_packets)
         logging.debug(f"send(): Enqueueing packet for sending pending={count}")
-        outgoing = Transport.OutgoingPacket(self, packet)
-        self.pending_packets.append(outgoing)
-
-        if not self.is_guarded_pending(self.reconnect):
-            self.transport_task()
+        with tracing.span("Transport.send", "transport",
+                          size=len(packet), pending=count):
+            outgoing = Transport.OutgoingPacket(self, packet)
+            tracing.flow("packet", "transport", outgoing.flow_id, "t")
+            self.pending_packets.append(outgoing)
+
+            if (
+                self.is_tasker_thread()
+                and self.state == ConnectionState.CONNECTED
+            ):
+                # Already on our runner (e.g. fused with the layers above)
+                self.pump_pending_packets()
+            elif not self.is_guarded_pending(self.reconnect):
+                self.transport_task()
 
         return outgoing
 
@@ -144,7 +170,7 @@ class Transport(ITransport, AbstractConnection, Tasker):
 
         self._impl.disconnect()
 
-    @Tasker.handler(guarded=True, force_schedule=True)
+    @Tasker.handler(coalesce=0.0)
     def transport_task(self):
         state = self.state
         logging.debug(f"transport_task(): state={state}")
@@ -175,70 +201,93 @@ class Transport(ITransport, AbstractConnection, Tasker):
 
     @Tasker.assert_executor()
     def pump_pending_packets(self):
+        with tracing.span("Transport.pump_pending_packets", "transport",
+                          pending=len(self.pending_packets)):
+            self._pump_pending_packets()
+
+    def _pump_pending_packets(self):
         logging.debug("pump_pending_packets(): "
                       f"pending_count={len(self.pending_packets)}")
-        if not self.pending_packets:
-            return
+        # Packets are removed from the head only once delivered, so the
+        # window always starts at the oldest undelivered packet
+        for outgoing in self.pending_packets[:self.window_size]:
+            if outgoing.delivered:
+                continue
+
+            if not outgoing.pending:
+                if self.state != ConnectionState.CONNECTED:
+                    break
+
+                logging.debug("pump_pending_packets(): "
+                              "Sending packet and marking as pending")
+                outgoing.pending = True
+                tracing.flow("packet", "transport", outgoing.flow_id, "t")
+                with tracing.in_flow(outgoing.flow_id):
+                    impl_outgoing = self._impl.send(outgoing.packet)
+                outgoing.set_outgoing_packet(impl_outgoing)
+
+            if outgoing.error_count:
+                # Later packets wait until the retried one gets through
+                break
 
-        outgoing = self.pending_packets[0]
-        if outgoing.pending:
-            return
+    @Tasker.handler()
+    def on_packet_done(self, outgoing: "Transport.OutgoingPacket",
+                       exception: Optional[BaseException]):
+        outgoing.pending = False
+
+        if not exception:
+            logging.debug("on_packet_done(): Packet delivered")
+            outgoing.delivered = True
+            self.error_count = 0
+
+        else:
+            logging.error("on_packet_done(): Packet failed to deliver",
+                          exc_info=exception)
+            self.error_count += 1
+            outgoing.error_count += 1
+            if outgoing.error_count > MAX_ERROR_COUNT:
+                logging.error("on_packet_done() giving up on sending packet")
+                self.pending_packets.remove(outgoing)
+                outgoing.future.set_exception(exception)
 
-        logging.debug(
-            "pump_pending_packets(): Sending packet and marking as pending")
-        outgoing.pending = True
-        impl_outgoing = self._impl.send(outgoing.packet)
-        outgoing.set_outgoing_packet(impl_outgoing)
+        # Complete packets in order they were sent, a packet given up on may
+        # have been the one holding back the delivered ones behind it
+        while self.pending_packets and self.pending_packets[0].delivered:
+            head = self.pending_packets.pop(0)
+            assert head.impl is not None
+            head.future.set_result(head.impl.future.result())
+
+        self.transport_task()
 
     class OutgoingPacket(AbstractOutgoingPacket):
+        __slots__ = ("_transport", "pending", "delivered", "error_count",
+                     "_impl")
+
         def __init__(self, transport, packet):
-            super().__init__(packet, Future())
+            super().__init__(packet, Completion())
             self._transport: Transport = transport
             self.pending = False
+            self.delivered = False
+            self.error_count = 0
             self._impl: Optional[IOutgoingPacket] = None
-            # TODO(bgrzesik): Replace this with `self._.impl.future is future`
-            self._last_marker: Optional[object] = None
 
         def set_outgoing_packet(self, impl: IOutgoingPacket):
             logging.debug("set_outgoing_packet()")
 
-            self._last_marker = object()
-            logging.debug(f"set_outgoing_packet(): marker={self._last_marker}")
             self._impl = impl
-            done_cb = functools.partial(
-                self.on_impl_future_done, self._last_marker)
-            self._impl.future.add_done_callback(done_cb)
-
-        def on_impl_future_done(self, marker: object, future: Future):
-            logging.debug(f"on_impl_future_done(): marker={marker}")
+            self._impl.future.add_done_callback(self.on_impl_future_done)
 
-            if self._last_marker is not marker:
+        def on_impl_future_done(self, future: Future):
+            if self._impl is None or self._impl.future is not future:
                 # Skip this done notification to avoid zombie execution
-                logging.debug("on_impl_future_done(): Stale marker")
+                logging.debug("on_impl_future_done(): Stale future")
                 return
 
-            assert self._impl is not None
-
-            exception = self._impl.future.exception()
-            if not exception:
-                logging.debug("on_impl_future_done(): Packet delivered")
-                self._transport.pending_packets.pop(0)
-                self._transport.error_count = 0
-                self.future.set_result(self._impl.future.result())
-                self._transport.transport_task()
-            else:
-                logging.error(
-                    "on_impl_future_done(): Packet failed to deliver",
-                    exc_info=exception,
-                )
-                self._transport.error_count += 1
-                self.pending = False
-                self._transport.transport_task()
-                if self._transport.error_count > MAX_ERROR_COUNT:
-                    logging.error(
-                        "on_impl_future_done() giving up on sending packet")
-                    self._transport.pending_packets.pop(0)
-                    self.future.set_exception(exception)
+            self._transport.on_packet_done(self, self._impl.future.exception())
+
+        @property
+        def impl(self) -> Optional[IOutgoingPacket]:
+            return self._impl
 
     class Client(ITransportClient, Tasker):
         def __init__(self, transport, client):
@@ -247,9 +296,14 @@ class Transport(ITransport, AbstractConnection, Tasker):
             self.last_state: Optional[ConnectionState] = None
             self.client = client
 
-        @Tasker.handler()
         def on_packet_received(self, packet: bytes):
-            self.client.on_packet_received(packet)
+            # Called on the reading thread, carry its flow to the runner
+            self._deliver_packet(packet, tracing.current_flow())
+
+        @Tasker.handler()
+        def _deliver_packet(self, packet: bytes, flow_id: int):
+            with tracing.in_flow(flow_id):
+                self.client.on_packet_received(packet)
 
         @Tasker.handler()
         def on_state_changed(self, state: ConnectionState):
@@ -271,27 +325,51 @@ class Transport(ITransport, AbstractConnection, Tasker):
             self.client.on_error()
 
     class Builder(ITransportBuilder):
-        def __init__(self, transport=None, runner=None):
+        def __init__(self, transport=None, runner=None, window_size=None):
             super().__init__(runner=runner)
             self._transport: ITransportBuilder = transport
+            self._window_size: Optional[int] = window_size
 
         def set_transport(self, transport):
             self._transport = transport
 
+        def set_window_size(self, window_size: int):
+            self._window_size = window_size
+            return self
+
         def construct(self, client: ITransportClient,
                       runner: Optional[Runner] = None):
-            return Transport(self._transport, client, runner)
+            return Transport(self._transport, client, runner,
+                             window_size=self._window_size)
 
 
 class StreamingTransport(ITransport, AbstractConnection, ABC):
-
-    def __init__(self, client, parent=None, executor=None):
+    RECV_BUFFER_SIZE = 16 * 1024
+    # Maximal amount of bytes read in a single wakeup before IO thread goes
+    # back to polling, so writes are not starved by a busy peer
+    RECV_HIGH_WATER = 256 * 1024
+
+    def __init__(self, client, parent=None, executor=None,
+                 recv_buffer_size: Optional[int] = None,
+                 recv_high_water: Optional[int] = None):
         super().__init__(client)
 
-        self._thread: Optional[threading.Thread] = None
         self._client: ITransportClient = client
         self._running = False
         self._output_queue: List[StreamingTransport.OutgoingPacket] = []
+        # Encoded frames that have not been fully accepted by the stream yet
+        # and packets with the stream offset of their last byte
+        self._write_buffers: Deque[memoryview] = deque()
+        self._write_packets: Deque[
+            Tuple[int, StreamingTransport.OutgoingPacket]] = deque()
+        self._write_offset = 0
+        self._write_queued = 0
+        self._decoder = FrameDecoder()
+        self._recv_buffer = bytearray(
+            recv_buffer_size or StreamingTransport.RECV_BUFFER_SIZE)
+        self._recv_view = memoryview(self._recv_buffer)
+        self._recv_high_water: int = \
+            recv_high_water or StreamingTransport.RECV_HIGH_WATER
         self._running = False
 
         if self.is_connected:
@@ -304,84 +382,154 @@ class StreamingTransport(ITransport, AbstractConnection, ABC):
 
     @abstractmethod
     def input(self, num: int) -> bytes:
+        """Reads up to `num` bytes without blocking. Returns no data at the
+        end of stream and raises `BlockingIOError` once the stream is
+        drained, whatever error the underlying stream uses for it."""
         raise NotImplementedError
 
+    def input_into(self, buffer: memoryview) -> int:
+        """Same contract as `input()`, `_read()` keeps reading until
+        `BlockingIOError`"""
+        data = self.input(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
     @abstractmethod
     def output(self, data: bytes) -> int:
+        """Writes without blocking, returns the number of bytes accepted.
+        Raises `BlockingIOError` when nothing can be written."""
         raise NotImplementedError
 
-    @abstractmethod
-    def do_disconnect(self) -> bool:
-        raise NotImplementedError
+    def output_vector(self, buffers: List[memoryview]) -> int:
+        """Same contract as `output()`"""
+        return self.output(buffers[0])
 
     @abstractmethod
-    def wait(self, write: bool) -> Tuple[bool, bool, bool]:
+    def do_disconnect(self) -> bool:
         raise NotImplementedError
 
     @abstractmethod
     def notify(self):
         raise NotImplementedError
 
-    def _read(self):
-        def wrapped_input():
-            nonlocal self
-            read = self.input(1)
-            return read[0]
+    def _read(self) -> bool:
+        with tracing.span("StreamingTransport._read", "transport") as span:
+            return self._read_frames(span)
 
+    def _read_frames(self, span) -> bool:
         logging.debug("_read()")
-        decoder = FrameDecoder(wrapped_input)
-        frame = decoder.read_frame()
-        if frame is not None:
-            logging.debug(f"_read(): Decoded frame size={len(frame)}")
-            self._client.on_packet_received(bytes(frame))
-        else:
-            logging.debug("_read(): Failed to decode")
+        received = 0
+
+        while received < self._recv_high_water:
+            try:
+                size = self.input_into(self._recv_view)
+            except BlockingIOError:
+                # Drained, every stream reports it this way
+                break
+
+            if size == 0:
+                logging.debug("_read(): End of stream")
+                return False
+
+            for frame in self._decoder.feed(self._recv_buffer, size):
+                logging.debug(f"_read(): Decoded frame size={len(frame)}")
+                flow_id = tracing.new_flow()
+                tracing.flow("packet", "transport", flow_id, "s")
+                with tracing.in_flow(flow_id):
+                    self._client.on_packet_received(frame)
+
+            received += size
+            if size < len(self._recv_buffer):
+                # Stream has been drained
+                break
+
+        logging.debug(f"_read(): received={received}")
+        span.annotate(received=received)
+        return True
 
     def _write(self):
-        def wrapped_output(arr):
-            self.output(bytes(arr))
+        with tracing.span("StreamingTransport._write", "transport") as span:
+            self._write_queued_packets(span)
 
+    def _write_queued_packets(self, span):
         logging.debug("_write():")
-        encoder = FrameEncoder(wrapped_output)
-        encoder.start_frame()
-        for byte in self._output_queue[0].packet:
-            encoder.write_byte(byte)
-        encoder.finish_frame()
-
-        packet = self._output_queue.pop(0)
-        packet.future.set_result(packet)
-
-        logging.debug("_write(): Wrote packet")
-
-    def _io_thread(self):
-        logging.debug(
-            f"_io_thread(): thread={threading.current_thread()} self={self}")
-        while self._running:
-            poll_write = len(self._output_queue) != 0
-            logging.debug(f"_io_thread(): poll_write = {poll_write}")
-            read, write, hup = self.wait(poll_write)
-            logging.debug(f"_io_thread(): read = {read}, write = {write}, "
-                          f"hup={hup}, running = {self._running}")
-
-            if not self._running or hup:
-                if hup:
-                    self._running = False
-                self.disconnect()
+        while self._output_queue:
+            packet = self._output_queue.pop(0)
+            frame = memoryview(FrameEncoder.encode(packet.packet))
+            self._write_queued += len(frame)
+            self._write_buffers.append(frame)
+            self._write_packets.append((self._write_queued, packet))
+
+        if not self._write_buffers:
+            return
+
+        buffers = list(itertools.islice(self._write_buffers,
+                                        MAX_WRITE_BUFFERS))
+        sent = self.output_vector(buffers)
+        self._write_offset += sent
+        logging.debug(f"_write(): buffers={len(buffers)} sent={sent}")
+        span.annotate(buffers=len(buffers), sent=sent)
+
+        while sent > 0:
+            head = self._write_buffers[0]
+            if len(head) > sent:
+                # Keep unsent tail for the next write
+                self._write_buffers[0] = head[sent:]
                 break
 
-            try:
-                if read:
-                    self._read()
-                if write:
-                    self._write()
-            except BlockingIOError:
-                # Ignore this, we don't want any blocking
-                pass
-            except Exception as exc:
-                logging.error("_io_thread(): ", exc_info=exc)
-                self._client.on_error()
+            self._write_buffers.popleft()
+            sent -= len(head)
+
+        while (self._write_packets
+               and self._write_packets[0][0] <= self._write_offset):
+            _, packet = self._write_packets.popleft()
+            tracing.flow("packet", "transport", packet.flow_id, "f")
+            packet.future.set_result(packet)
+            logging.debug("_write(): Wrote packet")
+
+    def _reset_write(self):
+        # Frames that were not fully written are sent again from the start
+        unsent = [packet for _, packet in self._write_packets]
+        self._output_queue[:0] = unsent
+        self._write_buffers.clear()
+        self._write_packets.clear()
+        self._write_offset = 0
+        self._write_queued = 0
+
+    @property
+    def wants_write(self) -> bool:
+        return bool(self._output_queue or self._write_buffers)
+
+    def _handle_io(self, read: bool, write: bool, hup: bool) -> bool:
+        logging.debug(f"_handle_io(): read = {read}, write = {write}, "
+                      f"hup={hup}, running = {self._running}")
+
+        if not self._running:
+            self.disconnect()
+            return False
+
+        try:
+            if read and not self._read():
+                self._running = False
+                self.disconnect()
+                return False
+            if write and not hup:
+                self._write()
+        except BlockingIOError:
+            # Ignore this, we don't want any blocking
+            pass
+        except Exception as exc:
+            logging.error("_handle_io(): ", exc_info=exc)
+            self._client.on_error()
+
+        if hup:
+            # Data received before the hang-up has been read above
+            logging.debug("_handle_io(): Hang-up")
+            self._running = False
+            self.disconnect()
+            return False
 
-        logging.debug("_io_thread(): Exited")
+        return True
 
     @property
     @abstractmethod
@@ -418,148 +566,165 @@ class StreamingTransport(ITransport, AbstractConnection, ABC):
                 self.state = ConnectionState.DISCONNECTED
                 return
 
+        self._decoder = FrameDecoder()
+        self._reset_write()
         self._running = True
-        self._thread = threading.Thread(
-            target=self._io_thread, name="Streaming IO thread"
-        )
-        self._thread.daemon = True
-        self._thread.start()
+        try:
+            self.start_io()
+        except TimeoutError as exc:
+            logging.error("connect(): Could not start IO", exc_info=exc)
+            self._running = False
+            self.state = ConnectionState.DISCONNECTING
+            self.do_disconnect()
+            self.state = ConnectionState.DISCONNECTED
+            return
 
         self.state = ConnectionState.CONNECTED
 
     def disconnect(self):
         logging.debug("disconnect():")
         self.state = ConnectionState.DISCONNECTING
-        self._kill_thread()
+        self.stop_io()
         self.do_disconnect()
         self.state = ConnectionState.DISCONNECTED
 
     def __del__(self):
-        self._kill_thread()
+        self.stop_io()
 
-    def _kill_thread(self):
-        logging.debug("_kill_thread():")
+    @abstractmethod
+    def start_io(self):
+        """Starts calling `_handle_io()` on readiness of the stream"""
+        raise NotImplementedError
 
-        self._running = False
+    @abstractmethod
+    def stop_io(self):
+        raise NotImplementedError
 
-        if threading.current_thread() == self._thread:
-            logging.debug("_kill_thread(): Same thread, avoiding dead lock")
-            return
+    class OutgoingPacket(AbstractOutgoingPacket):
+        __slots__ = ()
 
-        while self._thread and self._thread.is_alive():
-            logging.debug("_kill_thread(): Trying to kill thread")
-            self.notify()
-            try:
-                self._thread.join(0.3)
-            except RuntimeError:
-                pass
 
-        logging.debug("_kill_thread(): Thread is dead")
+_WOULD_BLOCK = (errno.EAGAIN, errno.EWOULDBLOCK)
 
-    class OutgoingPacket(AbstractOutgoingPacket):
-        pass
 
+def _error_code(error: OSError) -> Optional[int]:
+    if error.errno is not None:
+        return error.errno
 
-class SocketTransport(StreamingTransport):
-    def __init__(self, sock, addr, client):
+    # PyBluez passes (errno, message) or its string form as the only argument
+    if error.args and isinstance(error.args[0], int):
+        return error.args[0]
+    if error.args and isinstance(error.args[0], str):
+        match = re.match(r"\((\d+),", error.args[0])
+        if match is not None:
+            return int(match.group(1))
+    return None
+
+
+@contextmanager
+def _would_block():
+    """Raises `BlockingIOError` for would-block errors of sockets that do not
+    use it, e.g. `bluetooth.BluetoothError` of PyBluez sockets"""
+    try:
+        yield
+    except BlockingIOError:
+        raise
+    except OSError as error:
+        if _error_code(error) in _WOULD_BLOCK:
+            raise BlockingIOError(*error.args) from error
+        raise
+
+
+class SocketTransport(StreamingTransport, IReactorHandler):
+    def __init__(self, sock, addr, client,
+                 recv_buffer_size: Optional[int] = None,
+                 recv_high_water: Optional[int] = None,
+                 reactor: Optional[Reactor] = None):
         self._sock: socket.socket = sock
         self._addr = addr
+        self._reactor: Reactor = reactor or Reactor.default()
+        self._registered = False
 
-        self._poll: Optional[select.poll] = None
-        self._notify: Optional[int] = None
-        self._event: Optional[int] = None
-
-        super().__init__(client)
+        super().__init__(client,
+                         recv_buffer_size=recv_buffer_size,
+                         recv_high_water=recv_high_water)
 
     def do_connect(self) -> bool:
         logging.debug("do_connect():")
-
-        self._event, self._notify = os.pipe()
-        os.set_blocking(self._event, False)
-        self._poll = select.poll()
-        self._poll.register(self._event, select.POLLIN)
-        self._poll.register(self._sock, select.POLLIN)
-
+        self._sock.setblocking(False)
         return True
 
     def input(self, num: int) -> bytes:
-        return self._sock.recv(num)
+        with _would_block():
+            if not isinstance(self._sock, socket.socket):
+                # e.g. PyBluez sockets, no flags, non-blocking already
+                return self._sock.recv(num)
 
-    def output(self, data: bytes) -> int:
-        return self._sock.send(data)
-
-    def do_disconnect(self) -> bool:
-        logging.debug("do_disconnect():")
-        if self._poll is not None:
-            self._poll.unregister(self._sock)
-            if self._event is not None:
-                self._poll.unregister(self._event)
-            self._poll = None
-
-        if self._notify is not None:
-            os.close(self._notify)
-            self._notify = None
-
-        if self._event is not None:
-            os.close(self._event)
-            self._event = None
-
-        return True
+            return self._sock.recv(num, socket.MSG_DONTWAIT)
 
-    def wait(self, write: bool) -> Tuple[bool, bool, bool]:
-        logging.debug(f"wait(): write = {write} event={self._event}")
+    def input_into(self, buffer: memoryview) -> int:
+        if not hasattr(self._sock, "recv_into"):
+            # e.g. PyBluez sockets
+            return super().input_into(buffer)
 
-        mask = select.POLLIN | select.POLLHUP
-        if write:
-            mask = mask | select.POLLOUT
+        with _would_block():
+            return self._sock.recv_into(buffer, len(buffer),
+                                        socket.MSG_DONTWAIT)
 
-        assert self._poll
+    def output(self, data: bytes) -> int:
+        with _would_block():
+            return self._sock.send(data)
 
-        self._poll.modify(self._sock.fileno(), mask)
-        fds = self._poll.poll()
+    def output_vector(self, buffers: List[memoryview]) -> int:
+        if not hasattr(self._sock, "sendmsg"):
+            # e.g. PyBluez sockets, coalesce frames into a single write
+            return self.output(b"".join(buffers))
 
-        logging.debug(f"wait(): polled fds={fds}")
-        has_read, has_write, has_hup = False, False, False
+        with _would_block():
+            return self._sock.sendmsg(buffers, [], socket.MSG_DONTWAIT)
 
-        for fd, event in fds:
-            if fd == self._event:
-                try:
-                    while len(os.read(self._event, 1)) > 0:
-                        pass
-                except BlockingIOError:
-                    pass
+    def do_disconnect(self) -> bool:
+        logging.debug("do_disconnect():")
+        return True
 
-            elif fd == self._sock.fileno():
-                if (event & select.POLLIN) == select.POLLIN:
-                    has_read = True
+    def start_io(self):
+        self._registered = True
+        try:
+            self._reactor.register(self._sock, self, write=self.wants_write)
+        except TimeoutError:
+            self._registered = False
+            raise
 
-                if (event & select.POLLOUT) == select.POLLOUT:
-                    has_write = True
+    def stop_io(self):
+        self._running = False
+        if not self._registered:
+            return
 
-                if (event & select.POLLHUP) == select.POLLHUP:
-                    has_hup = True
+        try:
+            self._reactor.unregister(self._sock)
+        except TimeoutError as exc:
+            # Still registered, unregistered by `on_ready()` on the reactor
+            # thread once the socket becomes ready as not running
+            logging.error("stop_io(): Could not unregister", exc_info=exc)
+            return
 
-                if (event & select.POLLERR) == select.POLLERR:
-                    has_hup = True
+        self._registered = False
 
-        logging.debug(
-            f"wait(): read={has_read} write={has_write} hup={has_hup}")
-        return has_read, has_write, has_hup
+    def on_ready(self, read: bool, write: bool, hup: bool):
+        # On hang-up or error `_handle_io()` disconnects, which unregisters
+        if self._handle_io(read, write, hup) and self._registered:
+            self._reactor.set_writing(self._sock, self.wants_write)
 
     def notify(self):
-        if self._notify is not None:
-            os.write(self._notify, b"\0")
+        if self._registered:
+            self._reactor.set_writing(self._sock, self.wants_write)
 
     @property
     def is_connected(self) -> bool:
-        return self._event is not None
+        return self._registered
 
     def __del__(self):
         super().__del__()
-        if self._notify is not None:
-            os.close(self._notify)
-        if self._event is not None:
-            os.close(self._event)
         self._sock.close()
 
     class Builder(ITransportBuilder):
@@ -567,6 +732,9 @@ class SocketTransport(StreamingTransport):
             super().__init__(runner=runner)
             self._socket = socket
             self._addr = addr
+            self._recv_buffer_size: Optional[int] = None
+            self._recv_high_water: Optional[int] = None
+            self._reactor: Optional[Reactor] = None
 
         def set_socket(self, socket):
             self._socket = socket
@@ -576,6 +744,19 @@ class SocketTransport(StreamingTransport):
             self._addr = addr
             return self
 
+        def set_recv_buffer(self, size: int,
+                            high_water: Optional[int] = None):
+            self._recv_buffer_size = size
+            self._recv_high_water = high_water
+            return self
+
+        def set_reactor(self, reactor: Reactor):
+            self._reactor = reactor
+            return self
+
         def construct(self, client: ITransportClient,
                       runner: Optional[Runner] = None):
-            return SocketTransport(self._socket, self._addr, client)
+            return SocketTransport(self._socket, self._addr, client,
+                                   recv_buffer_size=self._recv_buffer_size,
+                                   recv_high_water=self._recv_high_water,
+                                   reactor=self._reactor)
@@ -0,0 +1,101 @@
+import logging
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Callable, List, Optional
+
+_PENDING = 0
+_RESULT = 1
+_EXCEPTION = 2
+
+
+class Completion(object):
+    """Lock-free stand-in for `concurrent.futures.Future` used between layers.
+
+    Exposes the non-blocking part of the `Future` surface. Callbacks are kept
+    in a list drained with `pop(0)`, each of them is popped exactly once,
+    either by the thread completing or by the one adding it late, so no lock
+    is needed under the GIL (`list.append()` and `list.pop()` are atomic).
+    Blocking calls (`result()`/`exception()` on a pending completion) go
+    through a real `Future` created on demand by `to_future()`.
+    """
+
+    __slots__ = ("_state", "_value", "_callbacks", "_future")
+
+    def __init__(self):
+        self._state = _PENDING
+        self._value: Any = None
+        # A list is a fraction of deque's size and holds one or two items
+        self._callbacks: List[Callable[["Completion"], None]] = []
+        self._future: Optional[Future] = None
+
+    def done(self) -> bool:
+        return self._state != _PENDING
+
+    def cancelled(self) -> bool:
+        return False
+
+    def running(self) -> bool:
+        return False
+
+    def cancel(self) -> bool:
+        return False
+
+    def result(self, timeout: Optional[float] = None):
+        if self._state == _RESULT:
+            return self._value
+        elif self._state == _EXCEPTION:
+            raise self._value
+        return self.to_future().result(timeout)
+
+    def exception(self, timeout: Optional[float] = None):
+        if self._state == _RESULT:
+            return None
+        elif self._state == _EXCEPTION:
+            return self._value
+        return self.to_future().exception(timeout)
+
+    def set_result(self, result):
+        self._complete(_RESULT, result)
+
+    def set_exception(self, exception: BaseException):
+        self._complete(_EXCEPTION, exception)
+
+    def add_done_callback(self, fn: Callable[["Completion"], None]):
+        self._callbacks.append(fn)
+        if self._state != _PENDING:
+            self._run_callbacks()
+
+    def to_future(self) -> Future:
+        """Real `Future` completed together with this completion"""
+        future = self._future
+        if future is None:
+            future = Future()
+            # Losing this race only costs an extra Future, both complete
+            self._future = future
+            self.add_done_callback(
+                lambda completion: completion._settle(future))
+        return future
+
+    def _settle(self, future: Future):
+        if self._state == _RESULT:
+            future.set_result(self._value)
+        else:
+            future.set_exception(self._value)
+
+    def _complete(self, state: int, value):
+        if self._state != _PENDING:
+            raise InvalidStateError(f"{self!r} is already done")
+        self._value = value
+        self._state = state
+        self._run_callbacks()
+
+    def _run_callbacks(self):
+        while True:
+            try:
+                fn = self._callbacks.pop(0)
+            except IndexError:
+                return
+
+            try:
+                fn(self)
+            except Exception as exception:
+                logging.error(f"_run_callbacks(): {fn}", exc_info=exception)
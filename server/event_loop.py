@@ -0,0 +1,45 @@
+import asyncio
+import logging
+import threading
+from typing import Optional
+
+
+class EventLoopThread(object):
+    """asyncio event loop running forever on its own daemon thread"""
+
+    _default: Optional["EventLoopThread"] = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, name="Event loop"):
+        self.name: str = name
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name)
+        self._thread.daemon = True
+        self._thread.start()
+
+    @staticmethod
+    def default() -> "EventLoopThread":
+        with EventLoopThread._default_lock:
+            if EventLoopThread._default is None:
+                EventLoopThread._default = EventLoopThread()
+            return EventLoopThread._default
+
+    def is_loop_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def call_soon(self, func, *args):
+        if self.is_loop_thread():
+            func(*args)
+        else:
+            self.loop.call_soon_threadsafe(func, *args)
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        if not self.is_loop_thread():
+            self._thread.join()
+
+    def _run(self):
+        logging.debug(f"_run(): thread={threading.current_thread()}")
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+        logging.debug("_run(): Exited")
@@ -0,0 +1,113 @@
+import json
+import os
+import threading
+from typing import Any, Dict, List, Tuple
+
+# Checked by Runner before taking any timestamps, keep it a plain global so
+# disabled instrumentation costs a single attribute lookup
+enabled = os.environ.get("PROGRAMATORUS_INSTRUMENTATION", "") == "1"
+
+# Bucket `i` holds durations shorter than 2**i microseconds
+BUCKET_COUNT = 28
+
+_lock = threading.Lock()
+_handlers: Dict[Tuple[str, str], "HandlerStats"] = {}
+
+
+class Histogram(object):
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.buckets: List[int] = [0] * BUCKET_COUNT
+
+    def record(self, value: float):
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        bucket = int(value * 1e6).bit_length()
+        self.buckets[min(bucket, BUCKET_COUNT - 1)] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket containing given percentile"""
+        if self.count == 0:
+            return 0.0
+
+        rank = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return min((1 << bucket) / 1e6, self.max)
+
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_s": self.total,
+            "min_s": self.min if self.count else 0.0,
+            "max_s": self.max,
+            "mean_s": self.total / self.count if self.count else 0.0,
+            "p50_s": self.percentile(0.5),
+            "p90_s": self.percentile(0.9),
+            "p99_s": self.percentile(0.99),
+            "buckets_us": {
+                str(1 << bucket): count
+                for bucket, count in enumerate(self.buckets) if count
+            },
+        }
+
+
+class HandlerStats(object):
+    def __init__(self):
+        self.queued = Histogram()
+        self.run = Histogram()
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def reset():
+    with _lock:
+        _handlers.clear()
+
+
+def record(runner: str, handler: str,
+           enqueued: float, started: float, finished: float):
+    with _lock:
+        stats = _handlers.get((runner, handler))
+        if stats is None:
+            stats = _handlers[(runner, handler)] = HandlerStats()
+
+        stats.queued.record(started - enqueued)
+        stats.run.record(finished - started)
+
+
+def snapshot() -> Dict[str, Any]:
+    with _lock:
+        return {
+            "handlers": [
+                {
+                    "runner": runner,
+                    "handler": handler,
+                    "queued": stats.queued.snapshot(),
+                    "run": stats.run.snapshot(),
+                }
+                for (runner, handler), stats in sorted(_handlers.items())
+            ]
+        }
+
+
+def export(path: str):
+    with open(path, "w") as file:
+        json.dump(snapshot(), file, indent=2)
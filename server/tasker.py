@@ -1,86 +1,346 @@
 import functools
+import heapq
+import itertools
 import logging
 import threading
+import time
+from collections import deque
 from concurrent.futures import Future, ThreadPoolExecutor
-from typing import Optional, Set
+from enum import IntEnum
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from . import instrumentation
+from .event_loop import EventLoopThread
 
 CORRECT_THREAD_ATTR = "correct_thread"
+WORKER_POOL_SIZE = 8
+# Number of mailbox items executed before a worker is handed back to the pool
+MAILBOX_BATCH = 32
 
+# Runner currently executing on this thread
+_current = threading.local()
 
-class Runner(object):
-    def __init__(self, name=None):
-        def init_thread():
-            nonlocal self
-            setattr(self._thread_local, CORRECT_THREAD_ATTR, True)
-            logging.debug(f"init_thread(): Starting thread {self.name}")
 
+class Priority(IntEnum):
+    """Runner services lower values first, FIFO within the same priority"""
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+def chain_future(source: Future, target: Future):
+    def done_cb(fut: Future):
+        assert fut is source
+        if target.done():
+            # Cancelled by its owner, the result is not wanted
+            return
+
+        if fut.cancelled():
+            target.cancel()
+        elif fut.exception() is not None:
+            target.set_exception(fut.exception())
+        else:
+            target.set_result(fut.result())
+
+    source.add_done_callback(done_cb)
+
+
+def current_runner() -> Optional["Runner"]:
+    """Runner whose mailbox is being drained on this thread"""
+    return getattr(_current, CORRECT_THREAD_ATTR, None)
+
+
+class ScheduledCall(object):
+    def __init__(self, delay: float, func: Callable[[], None]):
+        self.deadline = time.monotonic() + delay
+        self.func = func
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class CoalescedCall(object):
+    """Calls of a coalescing handler waiting for their single execution"""
+
+    def __init__(self, args: tuple, kwargs: dict, now: float, deadline: float):
+        self.args = args
+        self.kwargs = kwargs
+        self.first = now
+        self.deadline = deadline
+        self.count = 1
+        self.submitted = False
+        self.timer: Optional[ScheduledCall] = None
+        self.future: Future = Future()
+
+
+class Scheduler(object):
+    """Single thread firing delayed calls of every Runner in the process.
+    Calls are kept in a heap ordered by deadline, cancelled calls are
+    dropped lazily once they reach the top."""
+
+    _default: Optional["Scheduler"] = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, name="Scheduler"):
         self.name: str = name
+        self._heap: List[Tuple[float, int, ScheduledCall]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def default() -> "Scheduler":
+        with Scheduler._default_lock:
+            if Scheduler._default is None:
+                Scheduler._default = Scheduler()
+            return Scheduler._default
+
+    def call_later(self, delay: float,
+                   func: Callable[[], None]) -> ScheduledCall:
+        call = ScheduledCall(delay, func)
+        self.schedule(call)
+        return call
+
+    def schedule(self, call: ScheduledCall):
+        with self._condition:
+            entry = (call.deadline, next(self._sequence), call)
+            heapq.heappush(self._heap, entry)
+            if self._heap[0] is entry:
+                self._condition.notify()
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run,
+                                                name=self.name)
+                self._thread.daemon = True
+                self._thread.start()
+
+    def _next_call(self) -> ScheduledCall:
+        with self._condition:
+            while True:
+                while self._heap and self._heap[0][2].cancelled:
+                    heapq.heappop(self._heap)
+
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+
+                remaining = self._heap[0][0] - time.monotonic()
+                if remaining <= 0:
+                    return heapq.heappop(self._heap)[2]
+
+                self._condition.wait(remaining)
+
+    def _run(self):
+        while True:
+            call = self._next_call()
+            if call.cancelled:
+                continue
+
+            try:
+                call.func()
+            except Exception as exception:
+                logging.error("_run(): ", exc_info=exception)
+
+
+class WorkerPool(object):
+    """Bounded set of threads shared by every non-dedicated Runner"""
+
+    _default: Optional["WorkerPool"] = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, size: int = WORKER_POOL_SIZE, name="Worker"):
+        self._executor = ThreadPoolExecutor(size, thread_name_prefix=name)
+
+    @staticmethod
+    def default() -> "WorkerPool":
+        with WorkerPool._default_lock:
+            if WorkerPool._default is None:
+                WorkerPool._default = WorkerPool()
+            return WorkerPool._default
+
+    def submit(self, func: Callable[[], None]):
+        self._executor.submit(func)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+class Runner(object):
+    """Actor mailbox. Work submitted to a runner is executed one item at a
+    time, higher `Priority` first and in FIFO order within a priority, but
+    threads of the worker pool are shared with other runners. Runners that
+    block for a long time (e.g. in `accept()`) should be created as
+    `dedicated` to get a thread of their own.
+
+    On a `fused` runner handlers called from its own thread run as plain
+    synchronous calls. Sharing one fused runner between all layers of a
+    connection turns the hops between them into direct calls."""
+
+    def __init__(self, name=None, pool: Optional[WorkerPool] = None,
+                 dedicated: bool = False, fused: bool = False):
+        self.name: str = name
+        self.fused: bool = fused
         self._guards: Set[object] = set()
-        self._timers: Set[threading.Timer] = set()
+        self._coalesced: Dict[Hashable, CoalescedCall] = {}
+        self._coalesced_delayed: Dict[Hashable, CoalescedCall] = {}
+        self._coalesce_lock = threading.Lock()
+        self._timers: Set[ScheduledCall] = set()
         self._cancel_timers = False
-        self._thread_local = threading.local()
-        self._executor = ThreadPoolExecutor(1,
-                                            thread_name_prefix=name,
-                                            initializer=init_thread)
+
+        self._mailboxes: List[Deque[
+            Tuple[Future, Callable, tuple, dict, Optional[float]]]] = [
+            deque() for _ in Priority
+        ]
+        self._mailbox_lock = threading.Lock()
+        self._draining = False
+        self._dedicated = dedicated
+        if dedicated:
+            self._pool = WorkerPool(1, name=name or "Runner")
+        else:
+            self._pool = pool or WorkerPool.default()
 
     def is_valid_thread(self):
-        return getattr(self._thread_local, CORRECT_THREAD_ATTR, False)
+        return getattr(_current, CORRECT_THREAD_ATTR, None) is self
+
+    def _submit(self, func, *args,
+                priority: Priority = Priority.NORMAL, **kwargs) -> Future:
+        future: Future = Future()
+        enqueued = time.perf_counter() if instrumentation.enabled else None
+        with self._mailbox_lock:
+            self._mailboxes[priority].append(
+                (future, func, args, kwargs, enqueued))
+            if self._draining:
+                return future
+            self._draining = True
+
+        self._schedule_drain()
+        return future
+
+    def _drain(self):
+        previous = getattr(_current, CORRECT_THREAD_ATTR, None)
+        setattr(_current, CORRECT_THREAD_ATTR, self)
+        try:
+            for _ in range(MAILBOX_BATCH):
+                with self._mailbox_lock:
+                    mailbox = self._next_mailbox()
+                    if mailbox is None:
+                        self._draining = False
+                        return
+                    future, func, args, kwargs, enqueued = mailbox.popleft()
+
+                if not future.set_running_or_notify_cancel():
+                    continue
+
+                self._run(future, func, args, kwargs, enqueued)
+        finally:
+            setattr(_current, CORRECT_THREAD_ATTR, previous)
+
+        # Let other mailboxes use this worker before continuing
+        self._schedule_drain()
+
+    def _schedule_drain(self):
+        self._pool.submit(self._drain)
+
+    def _schedule_timer(self, timer: ScheduledCall):
+        Scheduler.default().schedule(timer)
+
+    def _add_timer(self, timer: ScheduledCall, future: Future):
+        """Schedules `timer`, it is cancelled together with `future`"""
+        self._timers.add(timer)
+
+        def on_done(fut: Future):
+            nonlocal self, timer
+            if fut.cancelled():
+                timer.cancel()
+                self._timers.discard(timer)
+
+        future.add_done_callback(on_done)
+        self._schedule_timer(timer)
+
+    def _next_mailbox(self) -> Optional[Deque]:
+        for mailbox in self._mailboxes:
+            if mailbox:
+                return mailbox
+        return None
+
+    def _run(self, future: Future, func, args, kwargs,
+             enqueued: Optional[float]):
+        started = time.perf_counter() if enqueued is not None else 0.0
+        try:
+            future.set_result(func(*args, **kwargs))
+        except BaseException as exception:
+            future.set_exception(exception)
+
+        if enqueued is not None:
+            instrumentation.record(
+                self.name, getattr(func, "__qualname__", repr(func)),
+                enqueued, started, time.perf_counter())
 
     def run_on_executor(self, func, *args,
                         timeout: Optional[float] = None,
-                        force_schedule: bool = False, **kwargs):
+                        force_schedule: bool = False,
+                        priority: Priority = Priority.NORMAL, **kwargs):
         if timeout is not None and timeout > 0:
             # We need to wrap future that is going
             # to be created after specified time passes
             future: Future = Future()
-            timer = threading.Timer(timeout, lambda: ())
 
             @functools.wraps(func)
             def wrapper():
-                nonlocal self, timer, future, func, args, kwargs
+                nonlocal self, timer, future, func, args, kwargs, priority
 
-                self._timers.remove(timer)
+                self._timers.discard(timer)
                 if self._cancel_timers:
                     return
 
                 try:
-                    executor_future = self._executor.submit(
-                        func, *args, *kwargs)
+                    executor_future = self._submit(
+                        func, *args, priority=priority, **kwargs)
                 except Exception as exception:
                     future.set_exception(exception)
                     return
 
-                def done_cb(fut: Future):
-                    nonlocal future, executor_future
-                    assert not fut.running() and fut == executor_future
-
-                    future.set_result(executor_future.result())
-                    exc = executor_future.exception()
-                    if exc:
-                        future.set_exception(exc)
+                chain_future(executor_future, future)
 
-                executor_future.add_done_callback(done_cb)
-
-            self._timers.add(timer)
-            timer.function = wrapper
-            timer.daemon = True
-            timer.start()
+            timer = ScheduledCall(timeout, wrapper)
+            self._add_timer(timer, future)
             return future
 
         if not self.is_valid_thread() or timeout is not None or force_schedule:
-            return self._executor.submit(func, *args, *kwargs)
+            return self._submit(func, *args, priority=priority, **kwargs)
 
         # Run on this thread
         future = Future()
+        enqueued = time.perf_counter() if instrumentation.enabled else None
+        self._run(future, func, args, kwargs, enqueued)
+        return future
+
+    def run_fused(self, func, *args, **kwargs) -> Future:
+        """Runs `func` right away, must be called on this runner's thread.
+        Like scheduled calls it gets a future of its own, callers tell stale
+        completions apart by future identity."""
+        future: Future = Future()
         try:
-            future.set_result(func(*args, *kwargs))
+            future.set_result(func(*args, **kwargs))
         except BaseException as exception:
+            logging.error(f"run_fused(): {func}", exc_info=exception)
             future.set_exception(exception)
-
         return future
 
     def run_guarded(self, func, *args,
-                    timeout=None, force_schedule=True, **kwargs):
+                    timeout=None, force_schedule=True,
+                    priority: Priority = Priority.NORMAL, **kwargs):
         if self.is_guarded_pending(func):
             return
 
@@ -91,23 +351,184 @@ class Runner(object):
             nonlocal self, func, args, kwargs
 
             self._guards.remove(func)
-            func(*args, *kwargs)
+            func(*args, **kwargs)
 
         return self.run_on_executor(wrapper,
                                     timeout=timeout,
-                                    force_schedule=force_schedule)
+                                    force_schedule=force_schedule,
+                                    priority=priority)
 
     def is_guarded_pending(self, func):
         return func in self._guards
 
-    def __del__(self):
-        logging.debug("__del__():")
+    def run_coalesced(self, func, *args,
+                      window: float = 0.0,
+                      max_delay: Optional[float] = None,
+                      merge: Optional[Callable[[tuple, tuple], tuple]] = None,
+                      key: Optional[Hashable] = None,
+                      timeout: Optional[float] = None,
+                      priority: Priority = Priority.NORMAL, **kwargs):
+        """Collapses calls made before the pending execution starts into one.
+
+        Every call postpones the execution to `window` seconds after it, but
+        no further than `max_delay` (defaults to `window`) after the first
+        collapsed call. The execution gets arguments of the latest call or,
+        when `merge` is given, `merge(previous_args, args)` folded over all
+        of them. Every collapsed call returns the same future.
+
+        Calls with `timeout` join the coalescing only once their timeout
+        passes. Only one such delayed call per `key` is kept pending, later
+        ones are folded into it the same way and return its future.
+        """
+        key = func if key is None else key
+
+        if timeout is not None and timeout > 0:
+            now = time.monotonic()
+            with self._coalesce_lock:
+                delayed = self._coalesced_delayed.get(key)
+                if delayed is not None:
+                    delayed.args = args if merge is None \
+                        else merge(delayed.args, args)
+                    delayed.kwargs = kwargs
+                    delayed.count += 1
+                    return delayed.future
+
+                delayed = CoalescedCall(args, kwargs, now, now + timeout)
+                self._coalesced_delayed[key] = delayed
+                future = delayed.future
+
+            def delayed_call():
+                nonlocal self, key, delayed
+                with self._coalesce_lock:
+                    if self._coalesced_delayed.get(key) is delayed:
+                        del self._coalesced_delayed[key]
+                    args, kwargs = delayed.args, delayed.kwargs
+
+                chain_future(self.run_coalesced(func, *args,
+                                                window=window,
+                                                max_delay=max_delay,
+                                                merge=merge,
+                                                key=key,
+                                                priority=priority,
+                                                **kwargs), delayed.future)
+
+            def on_done(fut: Future):
+                nonlocal self, key, delayed
+                if fut.cancelled():
+                    with self._coalesce_lock:
+                        if self._coalesced_delayed.get(key) is delayed:
+                            del self._coalesced_delayed[key]
+
+            future.add_done_callback(on_done)
+            timer = ScheduledCall(timeout, delayed_call)
+            self._add_timer(timer, future)
+            return future
+
+        if max_delay is None:
+            max_delay = window
+
+        now = time.monotonic()
+        with self._coalesce_lock:
+            call = self._coalesced.get(key)
+            if call is None:
+                call = CoalescedCall(args, kwargs, now, now + window)
+                self._coalesced[key] = call
+            else:
+                call.args = args if merge is None else merge(call.args, args)
+                call.kwargs = kwargs
+                call.count += 1
+
+                deadline = min(now + window, call.first + max_delay)
+                if call.submitted or deadline <= call.deadline:
+                    return call.future
+
+                # Debounce, move the pending execution further away
+                call.deadline = deadline
+                if call.timer is not None:
+                    call.timer.cancel()
+                    self._timers.discard(call.timer)
+
+            future = call.future
+
+            @functools.wraps(func)
+            def execute():
+                nonlocal self, key, call
+                with self._coalesce_lock:
+                    if self._coalesced.get(key) is call:
+                        del self._coalesced[key]
+                    args, kwargs = call.args, call.kwargs
+
+                logging.debug(f"execute(): Coalesced {call.count} calls")
+                return func(*args, **kwargs)
+
+            def submit():
+                nonlocal self, call, timer
+                self._timers.discard(timer)
+                if self._cancel_timers:
+                    return
+
+                with self._coalesce_lock:
+                    if call.timer is not timer or call.submitted:
+                        return
+                    call.submitted = True
+
+                chain_future(self._submit(execute, priority=priority),
+                             call.future)
+
+            timer: Optional[ScheduledCall] = None
+            if call.deadline > now:
+                timer = ScheduledCall(call.deadline - now, submit)
+                call.timer = timer
+                self._timers.add(timer)
+            else:
+                call.submitted = True
+
+        if timer is not None:
+            self._schedule_timer(timer)
+        else:
+            chain_future(self._submit(execute, priority=priority), future)
+        return future
+
+    def close(self):
+        """Cancels pending delayed calls and stops a dedicated thread.
+
+        Delayed calls hold their handler and its arguments, which usually
+        reference this runner, so it is not collected before they fire.
+        Owners with calls still pending have to close it explicitly."""
+        logging.debug("close():")
         self._cancel_timers = True
-        for timer in self._timers:
+        for timer in list(self._timers):
             timer.cancel()
-            timer.join()
+        self._timers.clear()
+
+        if self._dedicated:
+            self._pool.shutdown()
+
+
+class AsyncioRunner(Runner):
+    """Runner draining its mailbox on an asyncio event loop instead of the
+    worker pool. Runners sharing a loop never run concurrently, so calls
+    between them need no cross-thread handoff, and their handlers may use
+    the loop directly."""
+
+    def __init__(self, name=None, loop: Optional[EventLoopThread] = None):
+        super().__init__(name=name)
+        self.loop: EventLoopThread = loop or EventLoopThread.default()
 
-        self._executor.shutdown()
+    def _schedule_drain(self):
+        # Even on the loop thread, never drain recursively
+        self.loop.loop.call_soon_threadsafe(self._drain)
+
+    def _schedule_timer(self, timer: ScheduledCall):
+        def fire():
+            if not timer.cancelled:
+                timer.func()
+
+        def schedule():
+            delay = max(0.0, timer.deadline - time.monotonic())
+            self.loop.loop.call_later(delay, fire)
+
+        self.loop.call_soon(schedule)
 
 
 class Tasker(object):
@@ -121,7 +542,7 @@ class Tasker(object):
             assert parent.runner is not None
             self._runner = parent.runner
         else:
-            self._runner = Runner(name=str(self))
+            self._runner = Runner(name=type(self).__qualname__)
 
     def is_tasker_thread(self):
         return self._runner.is_valid_thread()
@@ -134,21 +555,64 @@ class Tasker(object):
         return self._runner.is_guarded_pending(func)
 
     @staticmethod
-    def handler(guarded=False, force_schedule=False):
+    def handler(guarded=False, force_schedule=False,
+                priority: Union[Priority, Callable[..., Priority]] =
+                Priority.NORMAL,
+                coalesce: Optional[float] = None,
+                max_delay: Optional[float] = None,
+                merge: Optional[Callable[[tuple, tuple], tuple]] = None):
+        """`priority` may also be a function of handler's arguments (including
+        `self`) to choose the priority of each call separately.
+
+        Handlers with `coalesce` window collapse calls of the same object,
+        see `Runner.run_coalesced()`. Such handlers always run scheduled."""
+        assert coalesce is None or not guarded
         force_schedule_parent = force_schedule
+        priority_parent = priority
 
         def decorator(func):
             @functools.wraps(func)
-            def wrapper(*args, timeout=None, force_schedule=False, **kwargs):
+            def wrapper(*args, timeout=None, force_schedule=False,
+                        priority=None, **kwargs):
                 self: Tasker = args[0]
                 force_schedule = force_schedule or force_schedule_parent
-
-                if guarded:
+                runner = self._runner
+
+                if (
+                    runner.fused
+                    and timeout is None
+                    and not force_schedule
+                    and not guarded
+                    and coalesce is None
+                    and not instrumentation.enabled
+                    and runner.is_valid_thread()
+                ):
+                    return runner.run_fused(func, *args, **kwargs)
+                if priority is None:
+                    if callable(priority_parent):
+                        priority = priority_parent(*args, **kwargs)
+                    else:
+                        priority = priority_parent
+
+                if coalesce is not None:
+                    return self._runner.run_coalesced(
+                        func,
+                        *args,
+                        window=coalesce,
+                        max_delay=max_delay,
+                        merge=merge,
+                        key=(func, self),
+                        timeout=timeout,
+                        priority=priority,
+                        **kwargs,
+                    )
+                elif guarded:
                     return self._runner.run_guarded(
                         func,
                         *args,
                         timeout=timeout,
                         force_schedule=force_schedule,
+                        priority=priority,
                         **kwargs,
                     )
                 else:
@@ -157,6 +621,7 @@ class Tasker(object):
                         *args,
                         timeout=timeout,
                         force_schedule=force_schedule,
+                        priority=priority,
                         **kwargs,
                     )
 
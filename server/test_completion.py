@@ -0,0 +1,92 @@
+import threading
+import unittest
+from concurrent.futures import Future, InvalidStateError
+
+from .completion import Completion
+from .tasker import chain_future
+
+
+class CompletionTests(unittest.TestCase):
+    def test_result(self):
+        completion = Completion()
+        done = []
+        completion.add_done_callback(done.append)
+        self.assertFalse(completion.done())
+
+        completion.set_result("value")
+        self.assertTrue(completion.done())
+        self.assertEqual("value", completion.result())
+        self.assertIsNone(completion.exception())
+        self.assertListEqual([completion], done)
+
+    def test_exception(self):
+        completion = Completion()
+        error = ValueError("test_exception")
+        completion.set_exception(error)
+
+        self.assertIs(error, completion.exception())
+        with self.assertRaises(ValueError):
+            completion.result()
+
+    def test_late_callback(self):
+        completion = Completion()
+        completion.set_result(None)
+
+        done = []
+        completion.add_done_callback(done.append)
+        self.assertListEqual([completion], done)
+
+    def test_complete_twice(self):
+        completion = Completion()
+        completion.set_result(None)
+        with self.assertRaises(InvalidStateError):
+            completion.set_result(None)
+
+    def test_blocking_result(self):
+        completion = Completion()
+        timer = threading.Timer(0.1, completion.set_result, ["value"])
+        timer.start()
+
+        self.assertEqual("value", completion.result(timeout=3.0))
+        self.assertIs(completion.to_future(), completion.to_future())
+
+    def test_chain_future(self):
+        source = Completion()
+        target = Completion()
+        chain_future(source, target)
+
+        source.set_result("value")
+        self.assertEqual("value", target.result())
+
+    def test_chain_cancelled(self):
+        source = Completion()
+        target: Future = Future()
+        chain_future(source, target)
+
+        target.cancel()
+        source.set_result("value")
+        self.assertTrue(target.cancelled())
+
+    def test_concurrent_callbacks(self):
+        for _ in range(100):
+            completion = Completion()
+            called = []
+            barrier = threading.Barrier(2)
+
+            def add_callbacks():
+                barrier.wait()
+                for i in range(100):
+                    completion.add_done_callback(
+                        lambda _, i=i: called.append(i))
+
+            thread = threading.Thread(target=add_callbacks)
+            thread.start()
+            barrier.wait()
+            completion.set_result(None)
+            thread.join()
+
+            self.assertListEqual(list(range(100)), sorted(called))
+
+
+if __name__ == "__main__":
+    unittest.main()
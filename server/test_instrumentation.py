@@ -0,0 +1,97 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from . import instrumentation
+from .instrumentation import Histogram
+from .tasker import Tasker
+
+
+class HistogramTests(unittest.TestCase):
+    def test_record(self):
+        histogram = Histogram()
+        for value in [0.001, 0.002, 0.004, 0.1]:
+            histogram.record(value)
+
+        snapshot = histogram.snapshot()
+        self.assertEqual(4, snapshot["count"])
+        self.assertAlmostEqual(0.107, snapshot["total_s"])
+        self.assertAlmostEqual(0.001, snapshot["min_s"])
+        self.assertAlmostEqual(0.1, snapshot["max_s"])
+        self.assertLessEqual(0.002, snapshot["p50_s"])
+        self.assertLess(snapshot["p50_s"], 0.004)
+        self.assertAlmostEqual(0.1, snapshot["p99_s"])
+
+    def test_empty(self):
+        snapshot = Histogram().snapshot()
+        self.assertEqual(0, snapshot["count"])
+        self.assertEqual(0.0, snapshot["p99_s"])
+
+
+class InstrumentationTests(unittest.TestCase):
+    def setUp(self) -> None:
+        instrumentation.reset()
+        instrumentation.enable()
+
+    def tearDown(self) -> None:
+        instrumentation.disable()
+        instrumentation.reset()
+
+    def test_handler_stats(self):
+        tester = InstrumentationTests.Tester()
+        tester.busy_task()
+        for _ in range(5):
+            tester.task()
+        time.sleep(0.1)
+        tester.event.set()
+        tester.task().result(timeout=3.0)
+
+        handlers = {
+            entry["handler"]: entry
+            for entry in instrumentation.snapshot()["handlers"]
+        }
+
+        task = handlers["InstrumentationTests.Tester.task"]
+        self.assertEqual("InstrumentationTests.Tester", task["runner"])
+        self.assertEqual(6, task["run"]["count"])
+        self.assertLess(0.05, task["queued"]["max_s"])
+
+        busy = handlers["InstrumentationTests.Tester.busy_task"]
+        self.assertEqual(1, busy["run"]["count"])
+        self.assertLess(0.05, busy["run"]["max_s"])
+
+    def test_disabled(self):
+        instrumentation.disable()
+        InstrumentationTests.Tester().task().result(timeout=3.0)
+        self.assertListEqual([], instrumentation.snapshot()["handlers"])
+
+    def test_export(self):
+        InstrumentationTests.Tester().task().result(timeout=3.0)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "stats.json")
+            instrumentation.export(path)
+            with open(path) as file:
+                exported = json.load(file)
+
+        self.assertEqual(1, len(exported["handlers"]))
+
+    class Tester(Tasker):
+        def __init__(self):
+            super().__init__()
+            self.event = threading.Event()
+
+        @Tasker.handler()
+        def busy_task(self):
+            self.event.wait(3.0)
+
+        @Tasker.handler()
+        def task(self):
+            pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,10 +5,23 @@ import time
 import unittest
 from queue import Queue, Empty
 
-from .tasker import Tasker
+from .event_loop import EventLoopThread
+from .tasker import (
+    AsyncioRunner,
+    Priority,
+    Runner,
+    Tasker,
+    WORKER_POOL_SIZE,
+)
 
 
-class TaskerTests(unittest.TestCase):
+class TaskerCases(object):
+    """Behavioural cases shared by every runner implementation, mixed into
+    a `unittest.TestCase`"""
+
+    # How long tearDown() waits for calls that must never run
+    SETTLE = 0.1
+
     @staticmethod
     def setUpClass() -> None:
         import sys
@@ -16,7 +29,7 @@ class TaskerTests(unittest.TestCase):
         logging.basicConfig(stream=sys.stdout, level=logging.DEBUG)
 
     def setUp(self) -> None:
-        self.tester = TaskerTests.Tester()
+        self.tester = TaskerCases.Tester()
 
     def tearDown(self) -> None:
         queue = self.tester.queue
@@ -25,7 +38,7 @@ class TaskerTests(unittest.TestCase):
         self.assertTrue(queue.empty())
 
         try:
-            queue.get(timeout=3)
+            queue.get(timeout=self.SETTLE)
             self.fail("Should raised Empty")
         except Empty:
             pass
@@ -48,19 +61,6 @@ class TaskerTests(unittest.TestCase):
         except (AssertionError, SystemError):
             pass
 
-    def test_single_timeout(self):
-        duration = 5.0
-
-        value = "test_single_timeout"
-        start = time.monotonic()
-        self.tester.not_guarded(value, timeout=duration)
-        returned = self.tester.queue.get()
-        end = time.monotonic()
-
-        measured = end - start
-        self.assertIs(value, returned)
-        self.assertLess(math.fabs(duration - measured), 0.5)
-
     def test_not_guarded_count(self):
         value = "test_not_guarded_count"
 
@@ -86,6 +86,38 @@ class TaskerTests(unittest.TestCase):
 
         self.assertIs(value, self.tester.queue.get(timeout=3.0))
 
+    def test_priority(self):
+        self.tester.busy_task()
+
+        for i in range(5):
+            self.tester.not_guarded(f"normal {i}")
+            self.tester.urgent(f"high {i}")
+        self.tester.not_guarded("low", priority=Priority.LOW)
+        self.tester.not_guarded("high 5", priority=Priority.HIGH)
+
+        self.tester.event.set()
+
+        expected = [f"high {i}" for i in range(6)]
+        expected += [f"normal {i}" for i in range(5)]
+        expected += ["low"]
+        for value in expected:
+            self.assertEqual(value, self.tester.queue.get(timeout=3.0))
+
+    def test_coalesced_latest(self):
+        futures = [self.tester.coalesced(str(i)) for i in range(10)]
+
+        self.assertEqual("9", self.tester.queue.get(timeout=3.0))
+        self.assertTrue(all(future is futures[0] for future in futures))
+
+        self.tester.coalesced("again")
+        self.assertEqual("again", self.tester.queue.get(timeout=3.0))
+
+    def test_coalesced_merged(self):
+        for i in range(10):
+            self.tester.merged([i])
+
+        self.assertEqual(list(range(10)), self.tester.queue.get(timeout=3.0))
+
     def test_using_asserted(self):
         value = "test_using_asserted"
 
@@ -109,8 +141,8 @@ class TaskerTests(unittest.TestCase):
             self.assertIs(value, self.tester.queue.get(timeout=1.0))
 
     class Tester(Tasker):
-        def __init__(self):
-            super().__init__()
+        def __init__(self, runner=None):
+            super().__init__(runner=runner)
             self.queue: Queue[str] = Queue()
             self.event = threading.Event()
 
@@ -125,6 +157,23 @@ class TaskerTests(unittest.TestCase):
             logging.debug(f"not_guarded(): value={value}")
             self.queue.put(value)
 
+        @Tasker.handler(priority=Priority.HIGH)
+        def urgent(self, value):
+            logging.debug(f"urgent(): value={value}")
+            self.queue.put(value)
+
+        @Tasker.handler(coalesce=0.02, max_delay=0.05)
+        def coalesced(self, value):
+            logging.debug(f"coalesced(): value={value}")
+            self.queue.put(value)
+
+        @Tasker.handler(coalesce=0.02,
+                        merge=lambda previous, args: (args[0],
+                                                      previous[1] + args[1]))
+        def merged(self, values):
+            logging.debug(f"merged(): values={values}")
+            self.queue.put(values)
+
         @Tasker.handler(guarded=True)
         def guarded(self, value):
             logging.debug(f"guarded(): value={value}")
@@ -141,19 +190,161 @@ class TaskerTests(unittest.TestCase):
             self.asserted(value)
 
         @Tasker.handler(guarded=False)
-        def use_other_not_guarded(self, tasker_tests: "TaskerTests", amount,
-                                  value):
+        def use_other_not_guarded(self, tasker_tests: unittest.TestCase,
+                                  amount, value):
             logging.debug(f"use_other_not_guarded(): value={value}")
             for _ in range(amount):
                 tasker_tests.assertTrue(self.not_guarded(value).done())
 
         @Tasker.handler(guarded=True)
-        def use_other_guarded(self, tasker_tests: "TaskerTests", amount, value):
+        def use_other_guarded(self, tasker_tests: unittest.TestCase, amount,
+                              value):
             logging.debug(f"use_other_guarded(): value={value}")
             for _ in range(amount):
                 tasker_tests.assertTrue(self.guarded(value).done())
 
 
+class TaskerTests(TaskerCases, unittest.TestCase):
+    def test_single_timeout(self):
+        duration = 0.2
+
+        value = "test_single_timeout"
+        start = time.monotonic()
+        self.tester.not_guarded(value, timeout=duration)
+        returned = self.tester.queue.get()
+        end = time.monotonic()
+
+        measured = end - start
+        self.assertIs(value, returned)
+        self.assertLess(math.fabs(duration - measured), 0.1)
+
+    def test_many_timeouts(self):
+        value = "test_many_timeouts"
+        threads = threading.active_count()
+
+        for i in range(50):
+            self.tester.not_guarded(value, timeout=0.05 + i * 0.001)
+
+        self.assertLessEqual(threading.active_count(), threads + 2)
+
+        for i in range(50):
+            self.assertIs(value, self.tester.queue.get(timeout=3.0))
+
+    def test_shared_pool(self):
+        threads = threading.active_count()
+        testers = [TaskerCases.Tester() for _ in range(100)]
+
+        for tester in testers:
+            for i in range(10):
+                tester.not_guarded(str(i))
+
+        for tester in testers:
+            for i in range(10):
+                self.assertEqual(str(i), tester.queue.get(timeout=3.0))
+
+        self.assertLessEqual(threading.active_count(),
+                             threads + WORKER_POOL_SIZE)
+
+    def test_coalesced_max_delay(self):
+        start = time.monotonic()
+        while time.monotonic() - start < 0.2:
+            self.tester.coalesced("value")
+            time.sleep(0.005)
+
+        executions = 0
+        while True:
+            try:
+                self.assertEqual("value", self.tester.queue.get(timeout=0.1))
+                executions += 1
+            except Empty:
+                break
+
+        # Debounced calls still run at least every max_delay
+        self.assertLessEqual(2, executions)
+        self.assertLessEqual(executions, 6)
+
+    def test_coalesced_timeout(self):
+        value = "test_coalesced_timeout"
+        start = time.monotonic()
+        first = self.tester.coalesced(value, timeout=0.1)
+        second = self.tester.coalesced(value, timeout=0.1)
+
+        self.assertIs(first, second)
+        self.assertEqual(value, self.tester.queue.get(timeout=3.0))
+        self.assertLessEqual(0.1, time.monotonic() - start)
+
+    def test_coalesced_timeout_merged(self):
+        for i in range(5):
+            self.tester.merged([i], timeout=0.05)
+
+        # Arguments of every delayed call are merged, none is dropped
+        self.assertEqual(list(range(5)), self.tester.queue.get(timeout=3.0))
+
+    def test_cancelled_timeout(self):
+        future = self.tester.not_guarded("test_cancelled_timeout",
+                                         timeout=0.05)
+        self.assertTrue(future.cancel())
+        # Timer is dropped, the call never runs (checked in tearDown())
+        self.assertSetEqual(set(), self.tester.runner._timers)
+
+    def test_closed(self):
+        runner = Runner(name="Closed")
+        tester = TaskerCases.Tester(runner=runner)
+        tester.not_guarded("test_closed", timeout=0.05)
+
+        runner.close()
+        self.assertRaises(Empty, tester.queue.get, timeout=self.SETTLE)
+
+    def test_fused(self):
+        tester = TaskerCases.Tester(runner=Runner(fused=True))
+        value = "test_fused"
+
+        tester.use_other_not_guarded(self, 10, value).result(timeout=3.0)
+        for _ in range(10):
+            self.assertIs(value, tester.queue.get(timeout=1.0))
+
+        # Called from outside of its thread, fused runner still schedules
+        future = tester.not_guarded(value)
+        self.assertIs(value, tester.queue.get(timeout=1.0))
+        self.assertIsNone(future.result(timeout=1.0))
+
+    def test_fused_futures(self):
+        runner = Runner(fused=True)
+
+        def fused_calls():
+            interrupted = runner.run_fused(self.interrupt)
+            return (interrupted, runner.run_fused(lambda: None),
+                    runner.run_fused(lambda: None))
+
+        interrupted, first, second = runner.run_on_executor(
+            fused_calls).result(timeout=1.0)
+        # Lands in the future like on a scheduled call
+        self.assertIsInstance(interrupted.exception(), KeyboardInterrupt)
+        self.assertIsNot(first, second)
+
+    @staticmethod
+    def interrupt():
+        raise KeyboardInterrupt()
+
+
+class AsyncioRunnerTests(TaskerCases, unittest.TestCase):
+    def setUp(self) -> None:
+        self.tester = TaskerCases.Tester(runner=AsyncioRunner(name="Tester"))
+
+    def test_shared_loop(self):
+        loop = EventLoopThread.default()
+        testers = [TaskerCases.Tester(runner=AsyncioRunner(loop=loop))
+                   for _ in range(10)]
+
+        on_loop: Queue[bool] = Queue()
+        for tester in testers:
+            tester.runner.run_on_executor(
+                lambda: on_loop.put(loop.is_loop_thread()))
+
+        for _ in testers:
+            self.assertTrue(on_loop.get(timeout=3.0))
+
+
 if __name__ == "__main__":
     import sys
 
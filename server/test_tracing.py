@@ -0,0 +1,198 @@
+import json
+import os
+import socket
+import tempfile
+import unittest
+from queue import Queue
+
+from . import tracing
+from .comm.connection import ConnectionState
+from .comm.presentation.messenger import IMessageClient
+from .comm.presentation.protocol_messenger import ProtocolMessenger
+from .comm.presentation.protocol_pb2 import GenericMessage
+from .comm.transport.transport import (
+    ITransportClient,
+    SocketTransport,
+    Transport,
+)
+from .tasker import Tasker
+
+
+class TracingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tracing.reset()
+        tracing.enable()
+
+    def tearDown(self) -> None:
+        tracing.enable(buffer_size=tracing.BUFFER_SIZE)
+        tracing.disable()
+        tracing.reset()
+
+    @staticmethod
+    def events(name=None):
+        return [
+            event for event in tracing.snapshot()["traceEvents"]
+            if event["ph"] != "M" and (name is None or event["name"] == name)
+        ]
+
+    def test_span(self):
+        with tracing.span("test", "unit", value=1) as span:
+            span.annotate(other=2)
+
+        [event] = self.events()
+        self.assertEqual("test", event["name"])
+        self.assertEqual("unit", event["cat"])
+        self.assertEqual("X", event["ph"])
+        self.assertLessEqual(0, event["dur"])
+        self.assertDictEqual({"value": 1, "other": 2}, event["args"])
+
+    def test_span_runner(self):
+        TracingTests.Tester().task().result(timeout=3.0)
+
+        [event] = self.events()
+        self.assertEqual("TracingTests.Tester", event["args"]["runner"])
+
+    def test_disabled(self):
+        tracing.disable()
+        with tracing.span("test", "unit") as span:
+            span.annotate(value=1)
+        tracing.flow("test", "unit", 1, "s")
+
+        self.assertListEqual([], self.events())
+
+    def test_ring_buffer(self):
+        tracing.enable(buffer_size=4)
+        for index in range(10):
+            with tracing.span("test", "unit", index=index):
+                pass
+
+        events = self.events()
+        self.assertListEqual([6, 7, 8, 9],
+                             [event["args"]["index"] for event in events])
+
+    def test_export(self):
+        with tracing.span("test", "unit"):
+            pass
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.json")
+            tracing.export(path)
+            with open(path) as file:
+                exported = json.load(file)
+
+        phases = [event["ph"] for event in exported["traceEvents"]]
+        self.assertListEqual(["M", "X"], phases)
+
+    def test_transport(self):
+        class Client(ITransportClient):
+            def __init__(self, queue: Queue):
+                self._queue = queue
+
+            def on_packet_received(self, packet: bytes):
+                self._queue.put((packet, tracing.current_flow()))
+
+            def on_state_changed(self, state: ConnectionState):
+                pass
+
+        sock_a, sock_b = socket.socketpair()
+        queue: Queue = Queue()
+        transport_a = Transport.Builder(
+            transport=SocketTransport.Builder(socket=sock_a, addr=None)
+        ).build(Client(Queue()))
+        transport_b = Transport.Builder(
+            transport=SocketTransport.Builder(socket=sock_b, addr=None)
+        ).build(Client(queue))
+        transport_a.reconnect()
+        transport_b.reconnect()
+
+        packet = b"traced"
+        sent_flow = tracing.new_flow()
+        with tracing.in_flow(sent_flow):
+            outgoing = transport_a.send(packet)
+        outgoing.future.result(timeout=5.0)
+        received, received_flow = queue.get(timeout=5.0)
+        self.assertEqual(packet, received)
+
+        transport_a.disconnect()
+        transport_b.disconnect()
+
+        self.assertEqual(1, len(self.events("Transport.send")))
+        self.assertLessEqual(1, len(self.events("StreamingTransport._write")))
+        self.assertLessEqual(1, len(self.events("StreamingTransport._read")))
+
+        def phases(flow_id):
+            return [event["ph"] for event in self.events("packet")
+                    if event["id"] == flow_id]
+
+        self.assertEqual(sent_flow, outgoing.flow_id)
+        self.assertEqual("f", phases(sent_flow)[-1])
+        self.assertNotIn(received_flow, (0, sent_flow))
+        self.assertListEqual(["s"], phases(received_flow))
+
+    def test_messenger(self):
+        class Client(IMessageClient):
+            def __init__(self, queue: Queue):
+                self._queue = queue
+
+            def on_message_received(self, message: GenericMessage):
+                self._queue.put(message)
+
+            def on_state_changed(self, state: ConnectionState):
+                pass
+
+        def build(sock, queue):
+            return ProtocolMessenger.Builder(
+                transport=Transport.Builder(
+                    transport=SocketTransport.Builder(socket=sock, addr=None))
+            ).build(Client(queue))
+
+        sock_a, sock_b = socket.socketpair()
+        queue: Queue = Queue()
+        messenger_a = build(sock_a, Queue())
+        messenger_b = build(sock_b, queue)
+        messenger_a.reconnect()
+        messenger_b.reconnect()
+
+        message = GenericMessage()
+        message.heartbeat.SetInParent()
+        messenger_a.send(message).future.result(timeout=5.0)
+        self.assertEqual("heartbeat",
+                         queue.get(timeout=5.0).WhichOneof("payload"))
+
+        messenger_a.disconnect()
+        messenger_b.disconnect()
+
+        flows = {}
+        for event in self.events("packet"):
+            flows.setdefault(event["id"], []).append(event["ph"])
+
+        # One flow from the sending messenger down to the socket write and
+        # one from the socket read up to the receiving messenger
+        self.assertEqual(2, len(flows))
+        for phases in flows.values():
+            self.assertEqual("s", phases[0])
+            self.assertEqual("f", phases[-1])
+
+    def test_flow_ids(self):
+        first, second = tracing.new_flow(), tracing.new_flow()
+        self.assertLess(first, second)
+
+        self.assertEqual(0, tracing.current_flow())
+        with tracing.in_flow(first):
+            with tracing.in_flow(second):
+                self.assertEqual(second, tracing.current_flow())
+            self.assertEqual(first, tracing.current_flow())
+        self.assertEqual(0, tracing.current_flow())
+
+        tracing.disable()
+        self.assertEqual(0, tracing.new_flow())
+
+    class Tester(Tasker):
+        @Tasker.handler()
+        def task(self):
+            with tracing.span("task", "unit"):
+                pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,209 @@
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from .tasker import current_runner
+
+# Checked before building any span, keep it a plain global so disabled
+# tracing costs a single attribute lookup
+enabled = os.environ.get("PROGRAMATORUS_TRACING", "") == "1"
+
+# Events above this count push the oldest ones out of the ring buffer
+BUFFER_SIZE = 64 * 1024
+
+_pid = os.getpid()
+_lock = threading.Lock()
+_events: Deque[Dict[str, Any]] = deque(maxlen=BUFFER_SIZE)
+_threads: Dict[int, str] = {}
+
+# Flow ids are never reused, 0 stands for "no flow"
+_flow_ids = itertools.count(1)
+_flow = threading.local()
+
+
+def _now_us() -> float:
+    return time.perf_counter() * 1e6
+
+
+def _append(event: Dict[str, Any]):
+    thread = threading.current_thread()
+    event["pid"] = _pid
+    event["tid"] = thread.ident
+    with _lock:
+        _threads[thread.ident] = thread.name
+        _events.append(event)
+
+
+def message_args(message) -> Dict[str, Any]:
+    """Identifies a `GenericMessage` in span arguments"""
+    args: Dict[str, Any] = {
+        "payload": message.WhichOneof("payload"),
+        "session_id": message.sessionId,
+    }
+
+    kind = message.WhichOneof("id")
+    if kind is not None:
+        args[kind] = getattr(message, kind)
+    return args
+
+
+class Span(object):
+    """Complete ("X") trace event measured around a `with` block"""
+
+    def __init__(self, name: str, category: str, args: Dict[str, Any]):
+        self.name = name
+        self.category = category
+        self.args = args
+        self._start = 0.0
+
+        runner = current_runner()
+        if runner is not None:
+            self.args["runner"] = runner.name
+
+    def annotate(self, **args):
+        self.args.update(args)
+
+    def __enter__(self) -> "Span":
+        self._start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        end = _now_us()
+        if exc_type is not None:
+            self.args["exception"] = exc_type.__name__
+
+        _append({
+            "name": self.name,
+            "cat": self.category,
+            "ph": "X",
+            "ts": self._start,
+            "dur": end - self._start,
+            "args": self.args,
+        })
+
+
+class _NullSpan(object):
+    def annotate(self, **args):
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, category: str, message=None, **args):
+    if not enabled:
+        return _NULL_SPAN
+
+    if message is not None:
+        args.update(message_args(message))
+    return Span(name, category, args)
+
+
+def flow(name: str, category: str, flow_id: int, phase: str):
+    """Links spans of different threads with an arrow. `phase` is one of
+    "s" (start), "t" (step) and "f" (finish) and binds to the span
+    enclosing this call. Calls without a flow (`flow_id` 0) are ignored."""
+    if not enabled or not flow_id:
+        return
+
+    event = {
+        "name": name,
+        "cat": category,
+        "ph": phase,
+        "id": flow_id,
+        "ts": _now_us(),
+    }
+    if phase == "f":
+        event["bp"] = "e"
+    _append(event)
+
+
+def new_flow() -> int:
+    """Allocates an id for `flow()` events, 0 while tracing is disabled"""
+    if not enabled:
+        return 0
+    return next(_flow_ids)
+
+
+def current_flow() -> int:
+    """Id of the flow entered with `in_flow()` on this thread, 0 if none"""
+    if not enabled:
+        return 0
+    return getattr(_flow, "id", 0)
+
+
+class _FlowScope(object):
+    def __init__(self, flow_id: int):
+        self.flow_id = flow_id
+        self._outer = 0
+
+    def __enter__(self) -> "_FlowScope":
+        self._outer = getattr(_flow, "id", 0)
+        _flow.id = self.flow_id
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        _flow.id = self._outer
+
+
+def in_flow(flow_id: int):
+    """Makes `flow_id` the `current_flow()` of calls made inside the `with`
+    block, lower layers pick it up without threading it through their
+    signatures"""
+    if not enabled or not flow_id:
+        return _NULL_SPAN
+    return _FlowScope(flow_id)
+
+
+def enable(buffer_size: Optional[int] = None):
+    global enabled, _events
+    if buffer_size is not None:
+        with _lock:
+            _events = deque(_events, maxlen=buffer_size)
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def reset():
+    with _lock:
+        _events.clear()
+        _threads.clear()
+
+
+def snapshot() -> Dict[str, Any]:
+    with _lock:
+        events = list(_events)
+        threads = dict(_threads)
+
+    metadata = [
+        {
+            "name": "thread_name",
+            "ph": "M",
+            "pid": _pid,
+            "tid": tid,
+            "args": {"name": name},
+        }
+        for tid, name in sorted(threads.items())
+    ]
+    return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+
+def export(path: str):
+    """Writes events in Chrome trace-event format, open them with
+    chrome://tracing or https://ui.perfetto.dev"""
+    with open(path, "w") as file:
+        json.dump(snapshot(), file)